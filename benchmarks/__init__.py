@@ -0,0 +1,4 @@
+"""
+Benchmarks reproducibles del scraper sin consumir cuota de Google
+Incluye un stub local de Custom Search API (benchmarks.customsearch_stub)
+"""
@@ -0,0 +1,234 @@
+"""
+Servidor HTTP local que imita Google Custom Search JSON API (customsearch/v1)
+Permite medir el scraper sin consumir cuota: latencia configurable,
+respuestas 429 (rate limit) y 403 (cuota diaria agotada) a demanda, respuesta
+parcial con `fields=items(...),queries(...)` y compresión gzip si el cliente la acepta
+
+Uso independiente (apuntando GOOGLE_API_ENDPOINT al stub):
+    python -m benchmarks.customsearch_stub --port 8765 --latency 0.2
+"""
+
+import gzip
+import json
+import time
+import zlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+
+class CustomSearchStub:
+    """
+    Stub de customsearch/v1 en un hilo de fondo
+
+    Args:
+        latency: segundos de espera por petición
+        max_results: resultados totales por keyword (Custom Search nunca pasa de 100)
+        target_domain: dominio que aparece en target_position para cada keyword
+        target_position: posición (1-based) del dominio objetivo; 0 = nunca aparece
+        domains: número de dominios distintos en el resto de resultados
+        rate_limit_every: cada N peticiones responde 429 (0 = nunca)
+        quota_after: tras N peticiones correctas responde siempre 403 de cuota (0 = nunca)
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 max_results: int = 100, target_domain: str = 'target.com', target_position: int = 15,
+                 domains: int = 50, rate_limit_every: int = 0, quota_after: int = 0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.max_results = max_results
+        self.target_domain = target_domain
+        self.target_position = target_position
+        self.domains = max(1, domains)
+        self.rate_limit_every = rate_limit_every
+        self.quota_after = quota_after
+
+        self.counters = {'requests': 0, 'ok': 0, 'rate_limited': 0, 'quota_exceeded': 0}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://{self.host}:{self.port}/customsearch/v1"
+
+    def start(self) -> 'CustomSearchStub':
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive como la API real (el cliente reutiliza conexiones del pool)
+            protocol_version = 'HTTP/1.1'
+            # Cabeceras y cuerpo van en dos send(): sin esto Nagle retrasa cada respuesta
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                status, body = stub.handle(parse_qs(urlparse(self.path).query))
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=UTF-8')
+                if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    payload = gzip.compress(payload)
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_port
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def reset_counters(self):
+        with self._lock:
+            for name in self.counters:
+                self.counters[name] = 0
+
+    def _classify(self) -> str:
+        with self._lock:
+            self.counters['requests'] += 1
+            if self.quota_after and self.counters['ok'] >= self.quota_after:
+                outcome = 'quota_exceeded'
+            elif self.rate_limit_every and self.counters['requests'] % self.rate_limit_every == 0:
+                outcome = 'rate_limited'
+            else:
+                outcome = 'ok'
+            self.counters[outcome] += 1
+            return outcome
+
+    def handle(self, query: dict):
+        """Devuelve (status, body) para los parámetros de una petición"""
+        if self.latency:
+            time.sleep(self.latency)
+
+        outcome = self._classify()
+        if outcome == 'quota_exceeded':
+            return 403, _error(403, "Quota exceeded for quota metric 'Queries' and limit 'Queries per day'",
+                               'dailyLimitExceeded')
+        if outcome == 'rate_limited':
+            return 429, _error(429, 'Rate Limit Exceeded', 'rateLimitExceeded')
+
+        keyword = query.get('q', [''])[0]
+        start = int(query.get('start', ['1'])[0])
+        num = int(query.get('num', ['10'])[0])
+        slug = keyword.replace(' ', '-')
+
+        items = []
+        for position in range(start, min(start + num, self.max_results + 1)):
+            if position == self.target_position:
+                domain = self.target_domain
+            else:
+                domain = f"www.site{(zlib.crc32(keyword.encode('utf-8')) + position) % self.domains}.com"
+            items.append({
+                'kind': 'customsearch#result',
+                'title': f"{keyword} - resultado {position}",
+                'link': f"https://{domain}/{slug}/{position}",
+                'displayLink': domain,
+                'snippet': f"Snippet de ejemplo para {keyword} en la posición {position}.",
+                'pagemap': {
+                    'metatags': [{'og:title': f"{keyword} {position}", 'og:site_name': domain,
+                                  'og:description': f"Descripción de ejemplo de {keyword} en {domain}."}],
+                    'cse_thumbnail': [{'src': f"https://{domain}/thumb/{position}.jpg",
+                                       'width': '225', 'height': '225'}],
+                },
+            })
+
+        body = {
+            'kind': 'customsearch#search',
+            'queries': {'request': [{'searchTerms': keyword, 'startIndex': start, 'count': num}]},
+            'searchInformation': {'totalResults': str(self.max_results)},
+        }
+        # Como la API real: nextPage solo mientras quedan resultados (máximo 100)
+        if start + num <= min(self.max_results, 100):
+            body['queries']['nextPage'] = [{'searchTerms': keyword, 'startIndex': start + num, 'count': num}]
+        if items:
+            body['items'] = items
+        return 200, _partial_response(body, query.get('fields', [''])[0])
+
+
+def _parse_fields(fields: str) -> dict:
+    """'items(link,title),queries(nextPage)' -> {'items': {'link': None, 'title': None}, 'queries': {...}}"""
+    def parse(index):
+        tree, name = {}, ''
+        while index < len(fields):
+            char = fields[index]
+            if char == '(':
+                tree[name], index = parse(index + 1)
+                name = ''
+            elif char == ')':
+                break
+            elif char == ',':
+                if name:
+                    tree[name] = None
+                name = ''
+            else:
+                name += char.strip()
+            index += 1
+        if name:
+            tree[name] = None
+        return tree, index
+
+    return parse(0)[0]
+
+
+def _select(value, tree):
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [_select(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {name: _select(value[name], sub) for name, sub in tree.items() if name in value}
+    return value
+
+
+def _partial_response(body: dict, fields: str) -> dict:
+    """Aplica `fields` (p. ej. items(link,title),queries(nextPage)) como la API real"""
+    if not fields:
+        return body
+    return _select(body, _parse_fields(fields))
+
+
+def _error(code: int, message: str, reason: str) -> dict:
+    return {'error': {'code': code, 'message': message,
+                      'errors': [{'message': message, 'domain': 'usageLimits', 'reason': reason}]}}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Stub local de Google Custom Search API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='Segundos por petición')
+    parser.add_argument('--rate-limit-every', type=int, default=0, help='Responder 429 cada N peticiones')
+    parser.add_argument('--quota-after', type=int, default=0, help='Responder 403 de cuota tras N peticiones')
+    args = parser.parse_args(argv)
+
+    stub = CustomSearchStub(args.host, args.port, latency=args.latency,
+                            rate_limit_every=args.rate_limit_every, quota_after=args.quota_after).start()
+    print(f"Stub de Custom Search escuchando en {stub.endpoint} (Ctrl+C para salir)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == '__main__':
+    main()
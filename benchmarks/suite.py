@@ -0,0 +1,306 @@
+"""
+Benchmarks del scraper contra el stub local de Custom Search
+Mide batch_position_check, save_results, ReportManager y HybridAnalyzer a
+varios tamaños y emite los resultados en JSON para comparar versiones
+
+Uso:
+    python -m benchmarks                              # 100, 1000 y 10000 keywords
+    python -m benchmarks --sizes 100,1000 --output bench.json
+    python -m benchmarks --baseline bench_anterior.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import platform
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.customsearch_stub import CustomSearchStub
+
+BENCHMARKS = ['batch_position_check', 'save_results', 'save_scraping_session',
+              'generate_detailed_report', 'hybrid_analyzer']
+TARGET_DOMAIN = 'target.com'
+
+
+def make_keywords(count: int):
+    return [f"keyword benchmark {i}" for i in range(count)]
+
+
+def make_results(keywords, per_keyword: int = 10):
+    """Resultados sintéticos con el mismo formato que serp_scraper_api"""
+    results = []
+    for i, keyword in enumerate(keywords):
+        for position in range(1, per_keyword + 1):
+            domain = TARGET_DOMAIN if position == 5 and i % 3 == 0 else f"www.site{(i + position) % 50}.com"
+            results.append({
+                'keyword': keyword,
+                'position': position,
+                'title': f"{keyword} - resultado {position}",
+                'url': f"https://{domain}/{i}/{position}",
+                'domain': domain,
+                'snippet': f"Snippet de ejemplo para {keyword} en la posición {position}.",
+                'page': ((position - 1) // 10) + 1,
+            })
+    return results
+
+
+def make_sc_data(keywords):
+    """Filas de Search Console (queries) para las mismas keywords"""
+    return [{
+        'keys': [keyword],
+        'impressions': 50 + (i * 37) % 5000,
+        'clicks': (i * 7) % 200,
+        'ctr': ((i * 7) % 200) / (50 + (i * 37) % 5000),
+        'position': 1 + (i * 13) % 40,
+    } for i, keyword in enumerate(keywords)]
+
+
+class BenchmarkRunner:
+    """Ejecuta los benchmarks en un directorio temporal aislado"""
+
+    def __init__(self, args):
+        self.args = args
+        self.workdir = tempfile.mkdtemp(prefix='scraper_bench_')
+        self.entries = []
+
+    def measure(self, name: str, keywords: int, func, **extra):
+        """Ejecuta func() y registra tiempo (y pico de memoria con --memory)"""
+        if self.args.memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        details = func() or {}
+        seconds = time.perf_counter() - started
+        entry = {'name': name, 'keywords': keywords, 'seconds': round(seconds, 4),
+                 'keywords_per_second': round(keywords / seconds, 1) if seconds else None}
+        if self.args.memory:
+            entry['peak_memory_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+            tracemalloc.stop()
+        entry.update(extra)
+        entry.update(details)
+        self.entries.append(entry)
+        print(f"  {name:<26} {keywords:>6} keywords  {seconds:8.3f}s", file=sys.stderr)
+        return entry
+
+    def make_scraper(self, endpoint: str):
+        from config.settings import config
+        from rate_limiter import get_rate_limiter, QuotaLedger
+        from reports import ReportManager
+        from stealth_scraper import StealthSerpScraper
+
+        bench_config = config.copy()
+        bench_config.update({
+            'GOOGLE_API_KEY': 'benchmark-key',
+            'GOOGLE_SEARCH_ENGINE_ID': 'benchmark-cx',
+            'GOOGLE_API_ENDPOINT': endpoint,
+            'MIN_KEYWORD_DELAY': 0,
+            'MAX_KEYWORD_DELAY': 0,
+            'MAX_CONCURRENT_REQUESTS': self.args.concurrency,
+            'MAX_REQUESTS_PER_SECOND': 0,
+            'CUSTOM_SEARCH_PER_MINUTE': 10 ** 9,
+            'CUSTOM_SEARCH_PER_DAY': 0,
+            'SERP_CACHE_ENABLED': False,
+            'SUGGEST_CACHE_ENABLED': False,
+            'LEAN_RESPONSES': not self.args.full_responses,
+        })
+
+        # El ledger real de cuota no debe contar las peticiones al stub
+        limiter = get_rate_limiter()
+        limiter.ledger = QuotaLedger(os.path.join(self.workdir, 'quota_ledger.json'))
+
+        scraper = StealthSerpScraper(bench_config)
+        scraper.report_manager = ReportManager(data_dir=os.path.join(self.workdir, 'data'),
+                                               reports_dir=os.path.join(self.workdir, 'reports'))
+        logging.getLogger().setLevel(logging.WARNING)
+        return scraper
+
+    def bench_batch_position_check(self, size: int, stub: CustomSearchStub):
+        scraper = self.make_scraper(stub.endpoint)
+        keywords = make_keywords(size)
+        stub.reset_counters()
+
+        def run():
+            results = scraper.batch_position_check(keywords, TARGET_DOMAIN, self.args.pages,
+                                                   concurrency=self.args.concurrency)
+            return {'results': len(results), 'stub_requests': dict(stub.counters),
+                    'stats': scraper.get_session_stats(),
+                    'quota_exhausted': scraper.quota_exhausted}
+
+        self.measure('batch_position_check', size, run, pages=self.args.pages,
+                     concurrency=self.args.concurrency, latency=self.args.latency)
+
+    def bench_save_results(self, size: int, results):
+        scraper = self.make_scraper('http://127.0.0.1:9/unused')
+        # Ruta absoluta: os.path.join la respeta y los ficheros quedan en el directorio temporal
+        base_path = os.path.join(self.workdir, 'data', f"save_results_{size}")
+
+        def run():
+            scraper.save_results(results, filename=base_path)
+            return {'results': len(results),
+                    'output_bytes': sum(os.path.getsize(f"{base_path}.{ext}") for ext in ('csv', 'json'))}
+
+        self.measure('save_results', size, run)
+
+    def bench_reports(self, size: int, results):
+        from reports import ReportManager
+
+        report_manager = ReportManager(data_dir=os.path.join(self.workdir, 'data'),
+                                       reports_dir=os.path.join(self.workdir, 'reports'))
+        session = {}
+
+        def save():
+            session['id'] = report_manager.save_scraping_session(
+                results, {'target_domain': TARGET_DOMAIN, 'benchmark': True})
+            return {'results': len(results)}
+
+        def detailed():
+            report = report_manager.generate_detailed_report(session['id'])
+            return {'charts': len(report.get('charts', {}))}
+
+        if 'save_scraping_session' in self.selected or 'generate_detailed_report' in self.selected:
+            self.measure('save_scraping_session', size, save)
+        if 'generate_detailed_report' in self.selected:
+            self.measure('generate_detailed_report', size, detailed)
+
+    def bench_hybrid_analyzer(self, size: int, keywords, results):
+        from hybrid_analyzer import HybridAnalyzer
+
+        analyzer = HybridAnalyzer()
+        sc_data = make_sc_data(keywords)
+
+        def run():
+            timings = {}
+
+            def timed(label, func, *func_args):
+                started = time.perf_counter()
+                value = func(*func_args)
+                timings[label] = round(time.perf_counter() - started, 4)
+                return value
+
+            opportunities = timed('find_keyword_opportunities', analyzer.find_keyword_opportunities, sc_data)
+            comparisons = timed('compare_positions', analyzer.compare_positions, sc_data, results)
+            timed('enrich_scraper_results_with_sc_data', analyzer.enrich_scraper_results_with_sc_data,
+                  results, sc_data)
+            timed('find_missing_content_gaps', analyzer.find_missing_content_gaps,
+                  sc_data, results, TARGET_DOMAIN)
+            timed('calculate_visibility_score', analyzer.calculate_visibility_score,
+                  results, sc_data, TARGET_DOMAIN)
+            timed('generate_combined_report', analyzer.generate_combined_report,
+                  sc_data, results, opportunities, comparisons)
+            return {'results': len(results), 'methods': timings}
+
+        self.measure('hybrid_analyzer', size, run)
+
+    def run(self):
+        self.selected = set(self.args.only or BENCHMARKS)
+        stub = CustomSearchStub(latency=self.args.latency, rate_limit_every=self.args.rate_limit_every,
+                                quota_after=self.args.quota_after).start()
+        try:
+            for size in self.args.sizes:
+                print(f"▶ {size} keywords", file=sys.stderr)
+                keywords = make_keywords(size)
+                results = make_results(keywords)
+
+                if 'batch_position_check' in self.selected:
+                    self.bench_batch_position_check(size, stub)
+                if 'save_results' in self.selected:
+                    self.bench_save_results(size, results)
+                if self.selected & {'save_scraping_session', 'generate_detailed_report'}:
+                    self.bench_reports(size, results)
+                if 'hybrid_analyzer' in self.selected:
+                    self.bench_hybrid_analyzer(size, keywords, results)
+        finally:
+            stub.stop()
+            if not self.args.keep_files:
+                shutil.rmtree(self.workdir, ignore_errors=True)
+        return self.entries
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def apply_baseline(entries, baseline_path: str):
+    """Añade a cada medición el tiempo de la versión de referencia y el ratio"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {(b['name'], b['keywords']): b['seconds'] for b in baseline.get('benchmarks', [])}
+    for entry in entries:
+        seconds = previous.get((entry['name'], entry['keywords']))
+        if seconds:
+            entry['baseline_seconds'] = seconds
+            entry['ratio'] = round(entry['seconds'] / seconds, 3)
+
+
+def parse_sizes(value: str):
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Benchmarks del scraper con un stub local de Custom Search')
+    parser.add_argument('--sizes', type=parse_sizes, default=[100, 1000, 10000],
+                        help='Número de keywords separados por comas (por defecto 100,1000,10000)')
+    parser.add_argument('--only', action='append', choices=BENCHMARKS, help='Ejecutar solo este benchmark')
+    parser.add_argument('--pages', type=int, default=1, help='Páginas por keyword en batch_position_check')
+    parser.add_argument('--concurrency', type=int, default=1, help='Keywords en paralelo')
+    parser.add_argument('--latency', type=float, default=0.0, help='Latencia del stub por petición (s)')
+    parser.add_argument('--rate-limit-every', type=int, default=0, help='El stub responde 429 cada N peticiones')
+    parser.add_argument('--full-responses', action='store_true',
+                        help='Pedir la respuesta completa de Custom Search (sin fields)')
+    parser.add_argument('--quota-after', type=int, default=0, help='El stub responde 403 de cuota tras N peticiones')
+    parser.add_argument('--memory', action='store_true', help='Medir pico de memoria con tracemalloc (más lento)')
+    parser.add_argument('--baseline', help='JSON de una ejecución anterior para calcular ratios')
+    parser.add_argument('--output', help='Fichero JSON de salida (por defecto stdout)')
+    parser.add_argument('--keep-files', action='store_true', help='No borrar el directorio temporal')
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    runner = BenchmarkRunner(args)
+    entries = runner.run()
+    if args.baseline:
+        apply_baseline(entries, args.baseline)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': args.sizes,
+            'pages': args.pages,
+            'concurrency': args.concurrency,
+            'latency': args.latency,
+            'workdir': runner.workdir if args.keep_files else None,
+        },
+        'benchmarks': entries,
+    }
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+        print(f"✅ Resultados guardados en {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -21,16 +21,97 @@ class Config:
     MAX_KEYWORD_DELAY = int(os.getenv('MAX_KEYWORD_DELAY', 15))
     MIN_PAGE_DELAY = int(os.getenv('MIN_PAGE_DELAY', 3))
     MAX_PAGE_DELAY = int(os.getenv('MAX_PAGE_DELAY', 8))
+
+    # Ritmo adaptativo (AIMD) entre keywords; con false se usa MIN/MAX_KEYWORD_DELAY
+    ADAPTIVE_PACING = os.getenv('ADAPTIVE_PACING', 'true').lower() == 'true'
+    PACING_MIN_DELAY = float(os.getenv('PACING_MIN_DELAY', 0))
+    PACING_MAX_DELAY = float(os.getenv('PACING_MAX_DELAY', 30))
     
     # Configuración de Google
     DEFAULT_COUNTRY = os.getenv('DEFAULT_COUNTRY', 'US')
     DEFAULT_LANGUAGE = os.getenv('DEFAULT_LANGUAGE', 'en')
     PAGES_TO_SCRAPE = int(os.getenv('PAGES_TO_SCRAPE', 1))
+    FIND_FIRST_MODE = os.getenv('FIND_FIRST_MODE', 'false').lower() == 'true'
+
+    # Normalización de keywords: las grafías equivalentes se consultan una sola vez
+    NORMALIZE_KEYWORDS = os.getenv('NORMALIZE_KEYWORDS', 'true').lower() == 'true'
+    KEYWORD_FOLD_ACCENTS = os.getenv('KEYWORD_FOLD_ACCENTS', 'false').lower() == 'true'
+
+    # Intervalos de refresco por keyword (run --due): volátiles a diario, estables semanalmente
+    REFRESH_MIN_INTERVAL_HOURS = float(os.getenv('REFRESH_MIN_INTERVAL_HOURS', 24))
+    REFRESH_MAX_INTERVAL_HOURS = float(os.getenv('REFRESH_MAX_INTERVAL_HOURS', 168))
+    REFRESH_GRACE_HOURS = float(os.getenv('REFRESH_GRACE_HOURS', 1))
 
     # Configuración de Google API
     GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY', '')
     GOOGLE_SEARCH_ENGINE_ID = os.getenv('GOOGLE_SEARCH_ENGINE_ID', '')
     USE_GOOGLE_API = os.getenv('USE_GOOGLE_API', 'false').lower() == 'true'
+    GOOGLE_API_ENDPOINT = os.getenv('GOOGLE_API_ENDPOINT', 'https://www.googleapis.com/customsearch/v1')
+    # Respuesta parcial (fields) con solo link/title/snippet y gzip
+    LEAN_RESPONSES = os.getenv('LEAN_RESPONSES', 'true').lower() == 'true'
+
+    # Credenciales adicionales (varios proyectos de facturación): GOOGLE_API_KEY_1..N
+    # con GOOGLE_SEARCH_ENGINE_ID_n opcional (si falta se usa GOOGLE_SEARCH_ENGINE_ID)
+    GOOGLE_API_CREDENTIALS = []
+    credential_count = 1
+    while True:
+        extra_key = os.getenv(f'GOOGLE_API_KEY_{credential_count}')
+        if extra_key:
+            GOOGLE_API_CREDENTIALS.append({
+                'api_key': extra_key.strip(),
+                'search_engine_id': os.getenv(f'GOOGLE_SEARCH_ENGINE_ID_{credential_count}',
+                                              GOOGLE_SEARCH_ENGINE_ID).strip()
+            })
+            credential_count += 1
+        else:
+            break
+    CREDENTIAL_SELECTION = os.getenv('CREDENTIAL_SELECTION', 'round_robin').lower()
+
+    # Configuración de concurrencia (1 = modo secuencial clásico)
+    MAX_CONCURRENT_REQUESTS = int(os.getenv('MAX_CONCURRENT_REQUESTS', 1))
+    MAX_REQUESTS_PER_SECOND = float(os.getenv('MAX_REQUESTS_PER_SECOND', 5))
+    MAX_PAGE_CONCURRENCY = int(os.getenv('MAX_PAGE_CONCURRENCY', 3))
+    # Keywords comprobadas en paralelo en el análisis "Mi Ranking"
+    MY_RANKING_CONCURRENCY = int(os.getenv('MY_RANKING_CONCURRENCY', 4))
+
+    # Pool HTTP compartido: hosts con conexiones abiertas y conexiones máximas por host
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 10))
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 20))
+
+    # Presupuestos del rate limiter (token bucket por API key)
+    CUSTOM_SEARCH_PER_MINUTE = int(os.getenv('CUSTOM_SEARCH_PER_MINUTE', 100))
+    CUSTOM_SEARCH_PER_DAY = int(os.getenv('CUSTOM_SEARCH_PER_DAY', 10000))
+    # Proyectos de Google Cloud de las keys: cada uno tiene 100 consultas gratis/día
+    CUSTOM_SEARCH_FREE_PROJECTS = int(os.getenv('CUSTOM_SEARCH_FREE_PROJECTS', 1))
+    SUGGEST_PER_MINUTE = int(os.getenv('SUGGEST_PER_MINUTE', 120))
+    SEARCH_CONSOLE_PER_MINUTE = int(os.getenv('SEARCH_CONSOLE_PER_MINUTE', 1200))
+
+    # Google Suggest: endpoints consultados, variaciones en paralelo y ráfaga permitida
+    SUGGEST_ENDPOINTS = os.getenv('SUGGEST_ENDPOINTS', 'suggestqueries')
+    SUGGEST_CONCURRENCY = int(os.getenv('SUGGEST_CONCURRENCY', 8))
+    SUGGEST_BURST = int(os.getenv('SUGGEST_BURST', 10))
+
+    # Expansión long-tail (BFS sobre Suggest): niveles, tope de peticiones y de keywords (0 = sin límite)
+    EXPANSION_MAX_DEPTH = int(os.getenv('EXPANSION_MAX_DEPTH', 2))
+    EXPANSION_MAX_REQUESTS = int(os.getenv('EXPANSION_MAX_REQUESTS', 500))
+    EXPANSION_MAX_KEYWORDS = int(os.getenv('EXPANSION_MAX_KEYWORDS', 0))
+
+    # Reintentos de errores transitorios (429, 5xx, timeouts) con backoff exponencial
+    RETRY_MAX_ATTEMPTS = int(os.getenv('RETRY_MAX_ATTEMPTS', 5))
+    RETRY_BASE_DELAY = float(os.getenv('RETRY_BASE_DELAY', 1))
+    RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', 60))
+    RETRY_BUDGET = int(os.getenv('RETRY_BUDGET', 200))
+
+    # Caché persistente de respuestas SERP
+    SERP_CACHE_ENABLED = os.getenv('SERP_CACHE_ENABLED', 'true').lower() == 'true'
+    SERP_CACHE_TTL_HOURS = float(os.getenv('SERP_CACHE_TTL_HOURS', 24))
+    SERP_CACHE_MAX_MB = float(os.getenv('SERP_CACHE_MAX_MB', 50))
+    SERP_CACHE_FORCE_REFRESH = os.getenv('SERP_CACHE_FORCE_REFRESH', 'false').lower() == 'true'
+
+    # Caché persistente de Google Suggest (por endpoint, consulta, idioma y país)
+    SUGGEST_CACHE_ENABLED = os.getenv('SUGGEST_CACHE_ENABLED', 'true').lower() == 'true'
+    SUGGEST_CACHE_TTL_HOURS = float(os.getenv('SUGGEST_CACHE_TTL_HOURS', 72))
+    SUGGEST_CACHE_MAX_MB = float(os.getenv('SUGGEST_CACHE_MAX_MB', 20))
 
     # Configuración de logs
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -54,12 +135,53 @@ class Config:
             'MAX_KEYWORD_DELAY': cls.MAX_KEYWORD_DELAY,
             'MIN_PAGE_DELAY': cls.MIN_PAGE_DELAY,
             'MAX_PAGE_DELAY': cls.MAX_PAGE_DELAY,
+            'ADAPTIVE_PACING': cls.ADAPTIVE_PACING,
+            'PACING_MIN_DELAY': cls.PACING_MIN_DELAY,
+            'PACING_MAX_DELAY': cls.PACING_MAX_DELAY,
             'DEFAULT_COUNTRY': cls.DEFAULT_COUNTRY,
             'DEFAULT_LANGUAGE': cls.DEFAULT_LANGUAGE,
             'PAGES_TO_SCRAPE': cls.PAGES_TO_SCRAPE,
+            'FIND_FIRST_MODE': cls.FIND_FIRST_MODE,
+            'NORMALIZE_KEYWORDS': cls.NORMALIZE_KEYWORDS,
+            'KEYWORD_FOLD_ACCENTS': cls.KEYWORD_FOLD_ACCENTS,
+            'REFRESH_MIN_INTERVAL_HOURS': cls.REFRESH_MIN_INTERVAL_HOURS,
+            'REFRESH_MAX_INTERVAL_HOURS': cls.REFRESH_MAX_INTERVAL_HOURS,
+            'REFRESH_GRACE_HOURS': cls.REFRESH_GRACE_HOURS,
             'GOOGLE_API_KEY': cls.GOOGLE_API_KEY,
             'GOOGLE_SEARCH_ENGINE_ID': cls.GOOGLE_SEARCH_ENGINE_ID,
             'USE_GOOGLE_API': cls.USE_GOOGLE_API,
+            'GOOGLE_API_ENDPOINT': cls.GOOGLE_API_ENDPOINT,
+            'LEAN_RESPONSES': cls.LEAN_RESPONSES,
+            'GOOGLE_API_CREDENTIALS': cls.GOOGLE_API_CREDENTIALS,
+            'CREDENTIAL_SELECTION': cls.CREDENTIAL_SELECTION,
+            'MAX_CONCURRENT_REQUESTS': cls.MAX_CONCURRENT_REQUESTS,
+            'MAX_REQUESTS_PER_SECOND': cls.MAX_REQUESTS_PER_SECOND,
+            'MAX_PAGE_CONCURRENCY': cls.MAX_PAGE_CONCURRENCY,
+            'MY_RANKING_CONCURRENCY': cls.MY_RANKING_CONCURRENCY,
+            'HTTP_POOL_CONNECTIONS': cls.HTTP_POOL_CONNECTIONS,
+            'HTTP_POOL_MAXSIZE': cls.HTTP_POOL_MAXSIZE,
+            'CUSTOM_SEARCH_PER_MINUTE': cls.CUSTOM_SEARCH_PER_MINUTE,
+            'CUSTOM_SEARCH_PER_DAY': cls.CUSTOM_SEARCH_PER_DAY,
+            'CUSTOM_SEARCH_FREE_PROJECTS': cls.CUSTOM_SEARCH_FREE_PROJECTS,
+            'SUGGEST_PER_MINUTE': cls.SUGGEST_PER_MINUTE,
+            'SEARCH_CONSOLE_PER_MINUTE': cls.SEARCH_CONSOLE_PER_MINUTE,
+            'SUGGEST_ENDPOINTS': cls.SUGGEST_ENDPOINTS,
+            'SUGGEST_CONCURRENCY': cls.SUGGEST_CONCURRENCY,
+            'SUGGEST_BURST': cls.SUGGEST_BURST,
+            'EXPANSION_MAX_DEPTH': cls.EXPANSION_MAX_DEPTH,
+            'EXPANSION_MAX_REQUESTS': cls.EXPANSION_MAX_REQUESTS,
+            'EXPANSION_MAX_KEYWORDS': cls.EXPANSION_MAX_KEYWORDS,
+            'RETRY_MAX_ATTEMPTS': cls.RETRY_MAX_ATTEMPTS,
+            'RETRY_BASE_DELAY': cls.RETRY_BASE_DELAY,
+            'RETRY_MAX_DELAY': cls.RETRY_MAX_DELAY,
+            'RETRY_BUDGET': cls.RETRY_BUDGET,
+            'SERP_CACHE_ENABLED': cls.SERP_CACHE_ENABLED,
+            'SERP_CACHE_TTL_HOURS': cls.SERP_CACHE_TTL_HOURS,
+            'SERP_CACHE_MAX_MB': cls.SERP_CACHE_MAX_MB,
+            'SERP_CACHE_FORCE_REFRESH': cls.SERP_CACHE_FORCE_REFRESH,
+            'SUGGEST_CACHE_ENABLED': cls.SUGGEST_CACHE_ENABLED,
+            'SUGGEST_CACHE_TTL_HOURS': cls.SUGGEST_CACHE_TTL_HOURS,
+            'SUGGEST_CACHE_MAX_MB': cls.SUGGEST_CACHE_MAX_MB,
             'LOG_LEVEL': cls.LOG_LEVEL,
             'SAVE_JSON': cls.SAVE_JSON,
             'SAVE_CSV': cls.SAVE_CSV,
@@ -71,8 +193,13 @@ class Config:
         """Imprime la configuración actual"""
         print("🔧 Configuración actual:")
         print(f"   Proxies configurados: {len(cls.PROXIES)}")
-        print(f"   Delay entre keywords: {cls.MIN_KEYWORD_DELAY}-{cls.MAX_KEYWORD_DELAY}s")
+        if cls.ADAPTIVE_PACING:
+            print(f"   Delay entre keywords: adaptativo {cls.PACING_MIN_DELAY}-{cls.PACING_MAX_DELAY}s")
+        else:
+            print(f"   Delay entre keywords: {cls.MIN_KEYWORD_DELAY}-{cls.MAX_KEYWORD_DELAY}s")
         print(f"   Páginas a scrapear: {cls.PAGES_TO_SCRAPE}")
+        print(f"   Concurrencia: {cls.MAX_CONCURRENT_REQUESTS} ({cls.MAX_REQUESTS_PER_SECOND} req/s)")
+        print(f"   API keys adicionales: {len(cls.GOOGLE_API_CREDENTIALS)} ({cls.CREDENTIAL_SELECTION})")
         print(f"   País/Idioma: {cls.DEFAULT_COUNTRY}/{cls.DEFAULT_LANGUAGE}")
         print(f"   User agents custom: {len(cls.CUSTOM_USER_AGENTS)}")
         print(f"   Guardar CSV: {cls.SAVE_CSV}")
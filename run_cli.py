@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Scraper de Keywords y Posiciones - Línea de comandos (sin GUI)
+Seguimiento de posiciones por lotes con progreso en JSON lines
+
+Uso: python run_cli.py run --project ID --keywords archivo.txt
+     python run_cli.py --help
+"""
+
+import sys
+import os
+from sys import exit
+
+def main():
+    """Función principal - lanza la interfaz de línea de comandos"""
+    # Añadir src al path
+    src_dir = os.path.join(os.path.dirname(__file__), 'src')
+    sys.path.insert(0, src_dir)
+
+    from cli import main as cli_main
+    return cli_main()
+
+if __name__ == "__main__":
+    exit(main())
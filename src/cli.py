@@ -0,0 +1,458 @@
+"""
+Interfaz de línea de comandos (sin GUI) para el seguimiento de posiciones por lotes
+El progreso se emite como JSON lines por stdout; los logs van a stderr
+
+Uso:
+    python run_cli.py run --project ID [--keywords archivo.txt] [--domain dominio.com]
+    python run_cli.py run --keywords archivo.txt --domain dominio.com [--pages 3]
+    python run_cli.py run --project ID --due
+    python run_cli.py due --project ID
+    python run_cli.py expand "seed" ["otra seed"] [--depth 2] [--max-requests 500]
+    python run_cli.py variants --keywords semillas.txt --output variantes.txt
+    python run_cli.py resume RUN_ID
+    python run_cli.py runs
+    python run_cli.py projects
+    python run_cli.py quota
+    python run_cli.py reindex
+
+Códigos de salida:
+    0  ejecución completada
+    1  error (configuración, proyecto o journal inexistente, excepción)
+    2  argumentos inválidos
+    3  ejecución incompleta (detenida, cuota agotada o keywords con páginas
+       fallidas) - reanudable con `resume`
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import logging
+import argparse
+import threading
+from contextlib import redirect_stdout
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+# Solo dependencias ligeras: nada de GUI, matplotlib ni pandas en el arranque
+from config.settings import config
+from project_manager import ProjectManager
+from run_journal import RunJournal
+from utils import KeywordManager, domain_matches
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_INCOMPLETE = 3
+
+# Argumentos con rutas de archivos del usuario (relativas al directorio desde el que se llama)
+PATH_ARGUMENTS = ('keywords', 'seeds_file', 'output')
+
+
+def emit(event: str, **fields):
+    """Escribe un evento JSON en una línea de stdout"""
+    record = {'event': event, 'ts': round(time.time(), 3)}
+    record.update(fields)
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + '\n')
+    sys.stdout.flush()
+
+
+def fail(message: str, code: int = EXIT_ERROR) -> int:
+    emit('error', message=message)
+    return code
+
+
+class StopSignal:
+    """Convierte SIGINT/SIGTERM en una parada ordenada (journal guardado)"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def install(self):
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                signal.signal(signum, self._handle)
+            except (ValueError, OSError):
+                pass
+
+    def _handle(self, signum, frame):
+        if self._event.is_set():
+            # Segunda señal: salir inmediatamente
+            raise KeyboardInterrupt
+        self._event.set()
+        emit('stopping', signal=signum)
+
+    def __call__(self) -> bool:
+        return self._event.is_set()
+
+
+def build_scraper_config(args, overrides=None) -> dict:
+    """Configuración del scraper a partir de config/.env y los argumentos"""
+    scraper_config = config.copy()
+    values = {
+        'PAGES_TO_SCRAPE': getattr(args, 'pages', None),
+        'DEFAULT_COUNTRY': getattr(args, 'country', None),
+        'DEFAULT_LANGUAGE': getattr(args, 'language', None),
+        'MAX_CONCURRENT_REQUESTS': getattr(args, 'concurrency', None),
+    }
+    values.update(overrides or {})
+    scraper_config.update({key: value for key, value in values.items() if value is not None})
+    return scraper_config
+
+
+def load_keyword_file(path: str) -> list:
+    """Carga keywords sin ensuciar stdout (reservado a los eventos JSON)"""
+    with redirect_stdout(sys.stderr):
+        return KeywordManager.load_keywords(path)
+
+
+def execute_run(args, journal: RunJournal, keywords: list, target_domain, pages: int,
+                project_id=None, scraper_config=None, scheduler=None) -> int:
+    """Ejecuta (o continúa) una ejecución con journal y emite el progreso"""
+    from stealth_scraper import StealthSerpScraper
+
+    scraper = StealthSerpScraper(scraper_config)
+    logging.getLogger().setLevel(args.log_level)
+
+    # Vale cualquier credencial completa: la principal o solo GOOGLE_API_KEY_n
+    if not len(scraper.credential_pool):
+        return fail("No hay credenciales de Custom Search: configura GOOGLE_API_KEY y GOOGLE_SEARCH_ENGINE_ID "
+                    "(o GOOGLE_API_KEY_n con su Search Engine ID) en config/.env")
+
+    stop = StopSignal()
+    stop.install()
+
+    total = len(keywords)
+    progress = {'completed': len(journal.completed_keywords())}
+    emit('start', run_id=journal.run_id, project_id=project_id, target_domain=target_domain,
+         pages=pages, total_keywords=total, completed_keywords=progress['completed'])
+
+    def on_keyword(keyword, results):
+        progress['completed'] += 1
+        positions = [r['position'] for r in results
+                     if target_domain and domain_matches(r.get('domain'), target_domain)]
+        emit('keyword', keyword=keyword, completed=progress['completed'], total=total,
+             results=len(results), target_position=min(positions) if positions else None)
+
+    # Resultados directos a CSV/JSONL: no se acumulan en memoria
+    sink = None if args.no_save else scraper.open_result_sink(project_id=project_id)
+
+    started = time.time()
+    results = scraper.batch_position_check(
+        keywords, target_domain, pages,
+        stop_callback=stop,
+        concurrency=args.concurrency,
+        force_refresh=getattr(args, 'refresh', None) or None,
+        journal=journal,
+        find_first=getattr(args, 'find_first', None) or None,
+        progress_callback=on_keyword,
+        sink=sink,
+        compact=True,
+        scheduler=scheduler,
+    )
+
+    if scraper.quota_exhausted:
+        status = 'quota_exhausted'
+    elif journal.is_finished():
+        status = 'completed'
+    elif stop():
+        status = 'stopped'
+    else:
+        # Keywords con páginas fallidas: quedan pendientes en el journal
+        status = 'incomplete'
+
+    session_id = None
+    files = []
+    if sink:
+        session_id = scraper.save_sink(sink, project_id=project_id)
+        summary = sink.summary
+        files = [path for path in sink.paths.values() if os.path.exists(path)]
+    else:
+        from result_sink import SessionSummary
+        summary = SessionSummary()
+        summary.update(results)
+
+    emit('done', run_id=journal.run_id, status=status, results=summary.total_results,
+         completed_keywords=progress['completed'], total_keywords=total,
+         average_position=round(summary.average_position, 2), top_10_count=summary.top_10_count,
+         top_3_count=summary.top_3_count, session_id=session_id, files=files,
+         elapsed=round(time.time() - started, 2), stats=scraper.get_session_stats())
+    return EXIT_OK if status == 'completed' else EXIT_INCOMPLETE
+
+
+def cmd_run(args) -> int:
+    project_id = args.project
+    project = None
+    if project_id:
+        project = ProjectManager().get_project(project_id)
+        if not project:
+            return fail(f"Proyecto {project_id} no encontrado")
+
+    if args.keywords:
+        keywords = load_keyword_file(args.keywords)
+    else:
+        keywords = list(project['keywords']) if project else []
+    keywords = KeywordManager.deduplicate_keywords(keywords)
+    if not keywords:
+        return fail("No hay keywords: usa --keywords o un proyecto con keywords")
+
+    target_domain = args.domain or (project.get('domain') if project else None) or None
+    scraper_config = build_scraper_config(args)
+    pages = int(scraper_config.get('PAGES_TO_SCRAPE', 1))
+
+    scheduler = None
+    if args.due:
+        if not project:
+            return fail("--due necesita --project")
+        from refresh_scheduler import RefreshScheduler
+        scheduler = RefreshScheduler.from_config(project_id, scraper_config)
+        keywords = scheduler.due_keywords(keywords)
+        if not keywords:
+            emit('done', status='nothing_due', total_keywords=0)
+            return EXIT_OK
+
+    journal = RunJournal(args.run_id)
+    if journal.exists and journal.is_finished():
+        return fail(f"La ejecución {journal.run_id} ya está terminada")
+    journal.start(keywords, target_domain, pages, project_id=project_id, extra={
+        'country': scraper_config.get('DEFAULT_COUNTRY'),
+        'language': scraper_config.get('DEFAULT_LANGUAGE'),
+        'scheduled': bool(scheduler),
+        'find_first': bool(args.find_first or scraper_config.get('FIND_FIRST_MODE', False)),
+    })
+
+    return execute_run(args, journal, keywords, target_domain, pages, project_id, scraper_config, scheduler)
+
+
+def cmd_resume(args) -> int:
+    journal = RunJournal.latest_unfinished() if args.run_id == 'latest' else RunJournal(args.run_id)
+    metadata = journal.read_metadata() if journal else None
+    if not metadata:
+        return fail(f"No existe el journal de la ejecución {args.run_id}")
+    if journal.is_finished():
+        return fail(f"La ejecución {journal.run_id} ya está terminada")
+
+    # País e idioma del run original salvo que se indiquen otros; mismo modo find-first
+    scraper_config = build_scraper_config(args, {
+        'PAGES_TO_SCRAPE': metadata.get('pages', 1),
+        'DEFAULT_COUNTRY': args.country or metadata.get('country'),
+        'DEFAULT_LANGUAGE': args.language or metadata.get('language'),
+        'FIND_FIRST_MODE': metadata.get('find_first'),
+    })
+    scheduler = None
+    if metadata.get('scheduled') and metadata.get('project_id'):
+        from refresh_scheduler import RefreshScheduler
+        scheduler = RefreshScheduler.from_config(metadata['project_id'], scraper_config)
+    return execute_run(args, journal, metadata.get('keywords', []), metadata.get('target_domain'),
+                       metadata.get('pages', 1), metadata.get('project_id'), scraper_config, scheduler)
+
+
+def cmd_runs(args) -> int:
+    for run in RunJournal.list_runs():
+        emit('run', **run)
+    return EXIT_OK
+
+
+def cmd_projects(args) -> int:
+    for project_id, project in ProjectManager().get_all_projects().items():
+        emit('project', id=project_id, name=project.get('name'), domain=project.get('domain'),
+             keywords=len(project.get('keywords', [])), reports=len(project.get('reports', [])))
+    return EXIT_OK
+
+
+def cmd_due(args) -> int:
+    from refresh_scheduler import RefreshScheduler
+
+    project = ProjectManager().get_project(args.project)
+    if not project:
+        return fail(f"Proyecto {args.project} no encontrado")
+
+    scheduler = RefreshScheduler.from_config(args.project, config)
+    keywords = project.get('keywords', [])
+    due = scheduler.due_keywords(keywords)
+    entries = scheduler.schedule(keywords if args.all else due)
+    for entry in entries:
+        emit('keyword_schedule', due=entry['keyword'] in due, **entry)
+    emit('due', project_id=args.project, due_keywords=len(due), total_keywords=len(keywords))
+    return EXIT_OK
+
+
+def cmd_expand(args) -> int:
+    from suggest_engine import SuggestEngine
+    from keyword_expander import KeywordExpander
+
+    seeds = list(args.seeds)
+    if args.seeds_file:
+        seeds.extend(load_keyword_file(args.seeds_file))
+    if not seeds:
+        return fail("No hay semillas: indica keywords o --seeds-file")
+
+    scraper_config = build_scraper_config(args)
+    logging.getLogger().setLevel(args.log_level)
+    engine = SuggestEngine.from_config(scraper_config)
+    expander = KeywordExpander.from_config(scraper_config, engine, max_depth=args.depth,
+                                           max_requests=args.max_requests, max_keywords=args.max_keywords)
+    stop = StopSignal()
+    stop.install()
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else None
+    try:
+        def on_keyword(record):
+            emit('suggestion', **record)
+            if output:
+                output.write(record['keyword'] + '\n')
+                output.flush()
+
+        discovered = expander.expand(
+            seeds,
+            country=scraper_config.get('DEFAULT_COUNTRY', 'US'),
+            language=scraper_config.get('DEFAULT_LANGUAGE', 'en'),
+            on_keyword=on_keyword,
+            stop_callback=stop,
+        )
+    finally:
+        if output:
+            output.close()
+
+    emit('done', status='stopped' if stop() else 'completed', keywords=len(discovered),
+         output=args.output, **expander.stats)
+    return EXIT_INCOMPLETE if stop() else EXIT_OK
+
+
+def cmd_variants(args) -> int:
+    from variant_generator import VariantGenerator
+
+    def word_list(value):
+        return None if value is None else [word.strip() for word in value.split(',') if word.strip()]
+
+    seeds = load_keyword_file(args.keywords)
+    if not seeds:
+        return fail("No hay keywords base en el archivo")
+
+    generator = VariantGenerator(word_list(args.prefixes), word_list(args.suffixes),
+                                 max_variants_per_keyword=args.max_per_keyword)
+    started = time.time()
+    total = generator.write(seeds, args.output)
+    emit('done', status='completed', base_keywords=len(seeds), variants=total, output=args.output,
+         elapsed=round(time.time() - started, 2))
+    return EXIT_OK
+
+
+def cmd_quota(args) -> int:
+    from rate_limiter import get_rate_limiter, API_CUSTOM_SEARCH
+    from credential_pool import CredentialPool
+
+    ledger = get_rate_limiter(config).ledger
+    emit('quota', api=API_CUSTOM_SEARCH,
+         today=ledger.get_count(API_CUSTOM_SEARCH),
+         per_day_limit=config.get('CUSTOM_SEARCH_PER_DAY'),
+         total=ledger.get_total(API_CUSTOM_SEARCH),
+         cost_today=round(ledger.estimate_cost(API_CUSTOM_SEARCH), 4),
+         cost_total=round(ledger.estimate_total_cost(API_CUSTOM_SEARCH), 4))
+    for key_status in CredentialPool.from_config(config, get_rate_limiter()).status():
+        emit('quota_key', api=API_CUSTOM_SEARCH, **key_status)
+    return EXIT_OK
+
+
+def cmd_reindex(args) -> int:
+    from reports import ReportManager
+
+    summary = ReportManager().rebuild_session_index()
+    emit('done', status='completed', **summary)
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='run_cli.py',
+        description='Seguimiento de posiciones por lotes sin interfaz gráfica (salida JSON lines)'
+    )
+    parser.add_argument('--log-level', default='INFO',
+                        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help='Nivel de los logs en stderr (por defecto INFO)')
+    subparsers = parser.add_subparsers(dest='command')
+
+    def add_scraper_options(sub):
+        sub.add_argument('--country', help='País de búsqueda (gl)')
+        sub.add_argument('--language', help='Idioma de búsqueda (hl)')
+        sub.add_argument('--concurrency', type=int, help='Keywords en paralelo (MAX_CONCURRENT_REQUESTS)')
+        sub.add_argument('--no-save', action='store_true', help='No guardar CSV/JSON ni sesión de reporte')
+
+    run = subparsers.add_parser('run', help='Verificar posiciones de una lista de keywords')
+    run.add_argument('--project', help='ID del proyecto (keywords, dominio y destino de los reportes)')
+    run.add_argument('--keywords', help='Archivo de keywords (una por línea)')
+    run.add_argument('--domain', help='Dominio objetivo (por defecto el del proyecto)')
+    run.add_argument('--pages', type=int, help='Páginas de resultados por keyword')
+    run.add_argument('--find-first', action='store_true', help='Dejar de paginar al encontrar el dominio')
+    run.add_argument('--refresh', action='store_true', help='Ignorar la caché SERP')
+    run.add_argument('--run-id', help='Identificador del journal (por defecto uno nuevo)')
+    run.add_argument('--due', action='store_true',
+                     help='Solo las keywords del proyecto cuyo intervalo de refresco ha vencido')
+    add_scraper_options(run)
+    run.set_defaults(func=cmd_run)
+
+    resume = subparsers.add_parser('resume', help='Reanudar una ejecución interrumpida')
+    resume.add_argument('run_id', help="run_id del journal o 'latest' para la última sin terminar")
+    add_scraper_options(resume)
+    resume.set_defaults(func=cmd_resume)
+
+    subparsers.add_parser('runs', help='Listar ejecuciones registradas').set_defaults(func=cmd_runs)
+    subparsers.add_parser('projects', help='Listar proyectos').set_defaults(func=cmd_projects)
+    due = subparsers.add_parser('due', help='Keywords de un proyecto pendientes de refresco')
+    due.add_argument('--project', required=True, help='ID del proyecto')
+    due.add_argument('--all', action='store_true', help='Listar también las que no están pendientes')
+    due.set_defaults(func=cmd_due)
+
+    expand = subparsers.add_parser('expand', help='Descubrir keywords long-tail con Google Suggest (BFS)')
+    expand.add_argument('seeds', nargs='*', help='Keywords semilla')
+    expand.add_argument('--seeds-file', help='Archivo de keywords semilla (una por línea)')
+    expand.add_argument('--depth', type=int, help='Niveles de expansión (EXPANSION_MAX_DEPTH)')
+    expand.add_argument('--max-requests', type=int, help='Tope de peticiones a Suggest (EXPANSION_MAX_REQUESTS)')
+    expand.add_argument('--max-keywords', type=int, help='Tope de keywords nuevas (EXPANSION_MAX_KEYWORDS)')
+    expand.add_argument('--output', help='Archivo donde ir escribiendo las keywords (una por línea)')
+    expand.add_argument('--country', help='País de las sugerencias (gl)')
+    expand.add_argument('--language', help='Idioma de las sugerencias (hl)')
+    expand.set_defaults(func=cmd_expand)
+
+    variants = subparsers.add_parser('variants', help='Generar variantes long-tail de una lista de keywords')
+    variants.add_argument('--keywords', required=True, help='Archivo de keywords base (una por línea)')
+    variants.add_argument('--output', required=True, help='Archivo de salida (una variante por línea)')
+    variants.add_argument('--prefixes', help='Palabras a anteponer, separadas por comas (por defecto las habituales)')
+    variants.add_argument('--suffixes', help='Palabras a añadir detrás, separadas por comas (por defecto las habituales)')
+    variants.add_argument('--max-per-keyword', type=int, default=20, help='Variantes por keyword base (20)')
+    variants.set_defaults(func=cmd_variants)
+
+    subparsers.add_parser('quota', help='Consultas y coste de hoy según el ledger').set_defaults(func=cmd_quota)
+    subparsers.add_parser('reindex', help='Reconstruir el índice de sesiones de reportes').set_defaults(
+        func=cmd_reindex)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not getattr(args, 'func', None):
+        parser.print_help(sys.stderr)
+        return EXIT_USAGE
+
+    # Proyectos y reportes usan rutas relativas (como la GUI, que se lanza desde la raíz):
+    # se trabaja desde la raíz del proyecto para no dejar data/ o reports/ sueltos en
+    # el directorio actual, con los archivos indicados por el usuario ya resueltos
+    for name in PATH_ARGUMENTS:
+        if getattr(args, name, None):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+    os.chdir(PROJECT_ROOT)
+
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return fail("Interrumpido", EXIT_INCOMPLETE)
+    except Exception as e:
+        logging.getLogger(__name__).exception("Error en la ejecución")
+        return fail(str(e))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Pool de credenciales de Google Custom Search (varias API keys / proyectos)
+Reparte las consultas entre keys (round-robin o la menos usada hoy) y retira
+del día las que agotan su cuota, para que un lote continúe con las demás
+"""
+
+import logging
+import threading
+from datetime import date
+from typing import Dict, List, Optional
+
+from rate_limiter import API_CUSTOM_SEARCH, key_fingerprint
+
+STRATEGY_ROUND_ROBIN = 'round_robin'
+STRATEGY_LEAST_USED = 'least_used'
+
+
+class Credential:
+    """Par API key + Search Engine ID"""
+
+    __slots__ = ('api_key', 'search_engine_id', 'key_id')
+
+    def __init__(self, api_key: str, search_engine_id: str):
+        self.api_key = api_key
+        self.search_engine_id = search_engine_id
+        self.key_id = key_fingerprint(api_key)
+
+    def __repr__(self):
+        return f"Credential(key_id={self.key_id!r})"
+
+
+class CredentialPool:
+    """Selección thread-safe de credenciales con cuota por key"""
+
+    def __init__(self, credentials: List[Credential], rate_limiter=None, strategy: str = STRATEGY_ROUND_ROBIN):
+        self.logger = logging.getLogger(__name__)
+        self.credentials = credentials
+        self.rate_limiter = rate_limiter
+        self.strategy = strategy if strategy in (STRATEGY_ROUND_ROBIN, STRATEGY_LEAST_USED) else STRATEGY_ROUND_ROBIN
+        self._exhausted = {}  # key_id -> día en que agotó la cuota
+        self._next_index = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict, rate_limiter=None) -> 'CredentialPool':
+        """Credencial principal (GOOGLE_API_KEY) más GOOGLE_API_KEY_1..N sin duplicados"""
+        default_cx = config.get('GOOGLE_SEARCH_ENGINE_ID', '')
+        pairs = [{'api_key': config.get('GOOGLE_API_KEY', ''), 'search_engine_id': default_cx}]
+        pairs.extend(config.get('GOOGLE_API_CREDENTIALS') or [])
+
+        credentials = []
+        seen = set()
+        for pair in pairs:
+            api_key = (pair.get('api_key') or '').strip()
+            search_engine_id = (pair.get('search_engine_id') or default_cx or '').strip()
+            if not api_key or not search_engine_id or api_key in seen:
+                continue
+            seen.add(api_key)
+            credentials.append(Credential(api_key, search_engine_id))
+
+        return cls(credentials, rate_limiter, config.get('CREDENTIAL_SELECTION', STRATEGY_ROUND_ROBIN))
+
+    def __len__(self):
+        return len(self.credentials)
+
+    def search_engine_ids(self) -> List[str]:
+        """Motores (cx) distintos del pool, en el orden de sus credenciales"""
+        return list(dict.fromkeys(c.search_engine_id for c in self.credentials))
+
+    def _used_today(self, credential: Credential) -> int:
+        if not self.rate_limiter:
+            return 0
+        return self.rate_limiter.ledger.get_count(API_CUSTOM_SEARCH, credential.key_id)
+
+    def _is_available(self, credential: Credential, today: str) -> bool:
+        if self._exhausted.get(credential.key_id) == today:
+            return False
+        if self.rate_limiter:
+            remaining = self.rate_limiter.remaining_today(API_CUSTOM_SEARCH, credential.api_key)
+            if remaining is not None and remaining <= 0:
+                return False
+        return True
+
+    def acquire(self) -> Optional[Credential]:
+        """Credencial para la siguiente consulta, o None si todas agotaron la cuota de hoy"""
+        today = date.today().isoformat()
+        with self._lock:
+            count = len(self.credentials)
+            if self.strategy == STRATEGY_LEAST_USED:
+                available = [c for c in self.credentials if self._is_available(c, today)]
+                return min(available, key=self._used_today) if available else None
+
+            for offset in range(count):
+                index = (self._next_index + offset) % count
+                credential = self.credentials[index]
+                if self._is_available(credential, today):
+                    self._next_index = (index + 1) % count
+                    return credential
+            return None
+
+    def mark_exhausted(self, credential: Credential):
+        """Retira una key hasta mañana (403 de cuota o presupuesto diario agotado)"""
+        with self._lock:
+            if self._exhausted.get(credential.key_id) == date.today().isoformat():
+                return
+            self._exhausted[credential.key_id] = date.today().isoformat()
+            remaining = sum(1 for c in self.credentials if self._exhausted.get(c.key_id) != date.today().isoformat())
+        self.logger.warning(f"🔑 API key {credential.key_id} sin cuota hoy - quedan {remaining} disponibles")
+
+    def status(self) -> List[Dict]:
+        """Uso de hoy y estado de cada key (sin exponer la key)"""
+        today = date.today().isoformat()
+        with self._lock:
+            return [{
+                'key_id': c.key_id,
+                'used_today': self._used_today(c),
+                'available': self._is_available(c, today),
+            } for c in self.credentials]
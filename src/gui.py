@@ -40,9 +40,17 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.settings import Config, config
 from stealth_scraper import StealthSerpScraper
+from run_journal import RunJournal
+from serp_result import SerpResult
 from project_manager import ProjectManager
 from gui_hybrid_extensions import HybridGUIExtensions
 from search_console_api import SearchConsoleAPI
+from rate_limiter import get_rate_limiter, API_CUSTOM_SEARCH
+from retry_policy import get_retry_policy
+from utils import normalize_keyword, domain_matches
+from http_client import get_http_session
+from suggest_engine import SuggestEngine
+from keyword_expander import KeywordExpander
 
 # Configurar tema ultra moderno
 ctk.set_appearance_mode("Dark")
@@ -722,6 +730,14 @@ No necesitas configurar URIs manualmente para apps de escritorio."""
         # Inicializar gestores
         self.project_manager = ProjectManager()
         self.search_console_api = SearchConsoleAPI()
+        self.rate_limiter = get_rate_limiter(config)
+        self.retry_policy = get_retry_policy(config)
+
+        # Contadores de consumo (se leen del ledger de cuota real)
+        self.today_consults = 0
+        self.total_consults = 0
+        self.total_cost = 0.0
+        self.refresh_quota_counters()
 
         # Variables de configuración
         self.api_key_var = ctk.StringVar()
@@ -745,6 +761,8 @@ No necesitas configurar URIs manualmente para apps de escritorio."""
         self.start_button = None
         self.stop_button = None
         self.restart_button = None
+        self.resume_button = None
+        self.resume_journal = None  # Journal a reanudar en el próximo scraping
         self.config_info_label = None
         self.keywords_count_label = None
         self.keywords_text = None
@@ -790,11 +808,13 @@ No necesitas configurar URIs manualmente para apps de escritorio."""
             if hasattr(self, 'search_engine_id_var') and Config.GOOGLE_SEARCH_ENGINE_ID:
                 self.search_engine_id_var.set(Config.GOOGLE_SEARCH_ENGINE_ID)
 
-            # Cargar delays básicos
+            # Cargar delays: con ritmo adaptativo los campos son los límites del pacer
             if hasattr(self, 'min_delay_var'):
-                self.min_delay_var.set(str(Config.MIN_KEYWORD_DELAY))
+                self.min_delay_var.set(str(Config.PACING_MIN_DELAY if Config.ADAPTIVE_PACING
+                                           else Config.MIN_KEYWORD_DELAY))
             if hasattr(self, 'max_delay_var'):
-                self.max_delay_var.set(str(Config.MAX_KEYWORD_DELAY))
+                self.max_delay_var.set(str(Config.PACING_MAX_DELAY if Config.ADAPTIVE_PACING
+                                           else Config.MAX_KEYWORD_DELAY))
 
             if hasattr(self, 'domain_entry') and hasattr(self, 'country_var') and hasattr(self, 'language_var'):
                 # Cargar otras opciones si ya fueron configuradas
@@ -877,8 +897,18 @@ No necesitas configurar URIs manualmente para apps de escritorio."""
         if hasattr(self, 'keywords_count_label'):
             self.keywords_count_label.configure(text=str(len(current_keywords)))
 
+    def refresh_quota_counters(self):
+        """Actualiza los contadores de consultas y coste desde el ledger de cuota"""
+        ledger = self.rate_limiter.ledger
+        self.today_consults = ledger.get_count(API_CUSTOM_SEARCH)
+        self.total_consults = ledger.get_total(API_CUSTOM_SEARCH)
+        self.total_cost = ledger.estimate_total_cost(API_CUSTOM_SEARCH)
+
     def update_cost_display(self):
         """Actualiza la visualización de costos"""
+        if not hasattr(self, 'free_consults_label'):
+            return
+
         # Calcular consultas gratuitas restantes
         free_remaining = max(0, 100 - self.today_consults)
         free_cost = " - GRATIS 💚"
@@ -1243,7 +1273,8 @@ No necesitas configurar URIs manualmente para apps de escritorio."""
         # Delays
         delays_frame = ctk.CTkFrame(controls_row, fg_color="transparent")
         delays_frame.pack(side="left", padx=(0, 15))
-        ctk.CTkLabel(delays_frame, text="Delays (seg):", font=ctk.CTkFont(size=10)).pack(anchor="w", pady=(0, 2))
+        delays_text = "Delay adaptativo (seg):" if Config.ADAPTIVE_PACING else "Delays (seg):"
+        ctk.CTkLabel(delays_frame, text=delays_text, font=ctk.CTkFont(size=10)).pack(anchor="w", pady=(0, 2))
         delays_inputs = ctk.CTkFrame(delays_frame, fg_color="transparent")
         delays_inputs.pack()
         min_delay_entry = ctk.CTkEntry(delays_inputs, placeholder_text="Min", width=45, height=28)
@@ -1279,6 +1310,9 @@ No necesitas configurar URIs manualmente para apps de escritorio."""
         self.scraping_related_keyword_entry.pack(side="left", fill="x", expand=True, padx=(0, 5))
         
         ctk.CTkButton(input_frame, text="🔍 Buscar", command=self.find_related_keywords_scraping, width=80).pack(side="right")
+        self.scraping_expand_button = ctk.CTkButton(input_frame, text="🌳 Expandir",
+                                                    command=self.expand_related_keywords_scraping, width=90)
+        self.scraping_expand_button.pack(side="right", padx=(0, 5))
 
         # Área de resultados de keywords relacionadas
         self.scraping_related_text = ctk.CTkTextbox(col1, height=120, wrap="word")
@@ -1396,6 +1430,9 @@ No necesitas configurar URIs manualmente para apps de escritorio."""
         self.restart_button = ctk.CTkButton(buttons_frame, text="🔄 Reiniciar", command=self.restart_scraping, fg_color=COLORS['secondary'], hover_color="#3a3a4c", height=40, font=ctk.CTkFont(size=12, weight="bold"), state="disabled")
         self.restart_button.pack(side="left", padx=(5, 0))
 
+        self.resume_button = ctk.CTkButton(buttons_frame, text="♻️ Reanudar", command=self.resume_scraping, fg_color=COLORS['secondary'], hover_color="#3a3a4c", height=40, font=ctk.CTkFont(size=12, weight="bold"))
+        self.resume_button.pack(side="left", padx=(5, 0))
+
         # Barra de progreso mejorada
         progress_frame = ctk.CTkFrame(control_section)
         progress_frame.pack(fill="x", padx=10, pady=(0, 10))
@@ -1947,7 +1984,11 @@ No necesitas configurar URIs manualmente para apps de escritorio."""
         try:
             import requests
             url = f"https://www.googleapis.com/customsearch/v1?key={api_key}&cx={search_engine_id}&q=test"
-            response = requests.get(url, timeout=10)
+            def validate_credentials():
+                self.rate_limiter.acquire(API_CUSTOM_SEARCH, api_key)
+                return get_http_session().get(url, timeout=10)
+
+            response = self.retry_policy.call(validate_credentials, 'Validación de Google API')
 
             if response.status_code == 200:
                 messagebox.showinfo("Éxito", "✅ Credenciales válidas - API de Google configurada correctamente")
@@ -2782,6 +2823,49 @@ No necesitas configurar URIs manualmente para apps de escritorio."""
             self.start_scraping()
         self.log_message("⏹️ Scraping detenido por el usuario")
 
+    def resume_scraping(self):
+        """Reanuda la última ejecución interrumpida desde su journal en disco"""
+        if self.is_running:
+            return
+
+        journal = RunJournal.latest_unfinished()
+        metadata = journal.read_metadata() if journal else None
+        if not metadata:
+            messagebox.showinfo("Reanudar", "No hay ejecuciones interrumpidas para reanudar")
+            return
+
+        completed = len(journal.completed_keywords())
+        total = len(metadata.get('keywords', []))
+        if not messagebox.askyesno("Reanudar", f"¿Reanudar la ejecución {journal.run_id}?\n\n"
+                                               f"✅ Completadas: {completed}/{total} keywords"):
+            return
+
+        # Restaurar los parámetros originales de la ejecución
+        self.set_current_keywords(metadata.get('keywords', []))
+        self.update_keywords_count()
+        self.domain_entry.delete(0, "end")
+        if metadata.get('target_domain'):
+            self.domain_entry.insert(0, metadata['target_domain'])
+        self.pages_var.set(float(metadata.get('pages', 1)))
+        self.update_pages_label(metadata.get('pages', 1))
+
+        self.resume_journal = journal
+        self.log_message(f"♻️ Reanudando ejecución {journal.run_id} ({completed}/{total} completadas)")
+        self.start_scraping()
+
+    def delay_config(self, adaptive):
+        """
+        Claves de configuración que controlan los campos Min/Max delay
+
+        Con ritmo adaptativo son los límites del AdaptivePacer (PACING_MIN/MAX_DELAY);
+        sin él, el rango del delay aleatorio clásico (MIN/MAX_KEYWORD_DELAY)
+        """
+        min_delay = float(self.min_delay_var.get())
+        max_delay = float(self.max_delay_var.get())
+        if adaptive:
+            return {'PACING_MIN_DELAY': min_delay, 'PACING_MAX_DELAY': max_delay}
+        return {'MIN_KEYWORD_DELAY': min_delay, 'MAX_KEYWORD_DELAY': max_delay}
+
     def scraping_thread(self):
         """Hilo principal de scraping con actualizaciones en tiempo real mejoradas"""
         try:
@@ -2792,9 +2876,8 @@ No necesitas configurar URIs manualmente para apps de escritorio."""
             # Crear scraper con configuración actual
             from config.settings import config
             custom_config = config.copy()
+            custom_config.update(self.delay_config(custom_config.get('ADAPTIVE_PACING', True)))
             custom_config.update({
-                'MIN_KEYWORD_DELAY': int(self.min_delay_var.get()),
-                'MAX_KEYWORD_DELAY': int(self.max_delay_var.get()),
                 'PAGES_TO_SCRAPE': int(self.pages_var.get()),
                 'DEFAULT_COUNTRY': self.country_var.get(),
                 'DEFAULT_LANGUAGE': self.language_var.get()
@@ -2827,19 +2910,59 @@ No necesitas configurar URIs manualmente para apps de escritorio."""
                 text=f"Keywords: {total_keywords} | Procesadas: 0 | Restantes: {total_keywords}"
             ))
 
-            # Ejecutar scraping con callback de progreso
+            # Journal en disco: cada keyword completada sobrevive a cierres y falta de cuota
+            journal = self.resume_journal or RunJournal()
+            self.resume_journal = None
+            project = self.project_manager.get_active_project()
+            journal.start(self.keywords_list, target_domain, int(self.pages_var.get()),
+                          project_id=project['id'] if project else None)
+            completed_keywords = journal.completed_keywords()
+            self.log_message(f"💾 Journal de la ejecución: {journal.run_id}")
+
+            # Los resultados se vuelcan a CSV/JSONL según llegan (sin reserializar al final)
+            sink = self.scraper.open_result_sink(project_id=project['id'] if project else None)
             results = []
+            for _, keyword_results in (journal.iter_keyword_results() if completed_keywords else []):
+                results.extend(SerpResult.from_dict(r) for r in keyword_results)
+                sink.write(keyword_results)
+
+            # Ejecutar scraping con callback de progreso
+            self.scraper.retry_policy.reset()
+            self.scraper.pacer.reset()
+            results_by_query = {}  # Grafías equivalentes de una keyword se consultan una vez
             for i, keyword in enumerate(self.keywords_list):
                 if not self.is_running:
                     break
+
+                if keyword in completed_keywords:
+                    processed_keywords += 1
+                    continue
                     
                 # Actualizar progreso antes de procesar cada keyword
                 self.root.after(0, lambda current=i+1, total=total_keywords: 
                               self.update_progress(current, total, f"Procesando: {keyword}"))
                 
                 # Procesar keyword individual
-                keyword_results = self.scraper.serp_scraper_api(keyword, target_domain, int(self.pages_var.get()))
+                requests_before = self.scraper.stats.get('api_requests', 0)
+                throttle_before = self.scraper._throttle_count()
+                query = normalize_keyword(keyword, custom_config.get('KEYWORD_FOLD_ACCENTS', False))
+                if custom_config.get('NORMALIZE_KEYWORDS', True) and query in results_by_query:
+                    keyword_results = self.scraper.relabel_results(results_by_query[query], keyword)
+                    complete = True
+                else:
+                    keyword_results, complete = self.scraper.fetch_keyword(keyword, target_domain,
+                                                                           int(self.pages_var.get()), compact=True)
+                if self.scraper.quota_exhausted:
+                    self.log_message(f"🚫 Cuota agotada - usa '♻️ Reanudar' para continuar la ejecución {journal.run_id}")
+                    break
                 results.extend(keyword_results)
+                sink.write(keyword_results)
+                # Solo las keywords completas cuentan como hechas: las demás se reintentan al reanudar
+                if complete:
+                    results_by_query.setdefault(query, keyword_results)
+                    journal.record_keyword(keyword, keyword_results)
+                else:
+                    self.log_message(f"⚠️ '{keyword}' incompleta - se reintentará al reanudar la ejecución {journal.run_id}")
                 
                 # Actualizar contador
                 processed_keywords += 1
@@ -2849,46 +2972,43 @@ No necesitas configurar URIs manualmente para apps de escritorio."""
                     text=f"Keywords: {total_keywords} | Procesadas: {processed_keywords} | Restantes: {total_keywords - processed_keywords}"
                 ))
                 
-                # Delay entre keywords
-                if i < len(self.keywords_list) - 1 and self.is_running:
-                    delay = random.uniform(
-                        int(self.min_delay_var.get()),
-                        int(self.max_delay_var.get())
-                    )
-                    self.log_message(f"⏳ Esperando {delay:.1f}s antes del siguiente keyword...")
-                    
-                    # Dividir el delay en pequeños intervalos para verificar stop más frecuentemente
-                    delay_intervals = int(delay * 10)  # 10 verificaciones por segundo
-                    for _ in range(delay_intervals):
-                        if not self.is_running:
-                            break
-                        time.sleep(0.1)
+                # Delay entre keywords: adaptativo según cómo responde la API (sin espera si vino de caché)
+                self.scraper.pacer.record(throttled=self.scraper._throttle_count() > throttle_before)
+                served_from_cache = self.scraper.stats.get('api_requests', 0) == requests_before
+                if i < len(self.keywords_list) - 1 and self.is_running and not served_from_cache:
+                    delay = self.scraper.pacer.next_delay()
+                    if delay > 0:
+                        self.log_message(f"⏳ Esperando {delay:.1f}s antes del siguiente keyword...")
+                        self.scraper.pacer.wait(lambda: not self.is_running, delay)
+
+            self.log_message(f"⏱️ Ritmo conseguido: {self.scraper.pacer.keywords_per_minute()} keywords/minuto")
+            journal.flush()
+            if set(self.keywords_list) <= journal.completed_keywords():
+                journal.finish()
+            else:
+                journal.close()
+                self.log_message(f"💾 Progreso guardado - usa '♻️ Reanudar' para completar la ejecución {journal.run_id}")
+            sink.close()
 
             if results:
                 self.current_results = results
                 self.scraping_status_label.configure(text="✅ Completado", text_color="green")
                 self.progress_label.configure(text="✅ Scraping completado exitosamente")
 
-                # Calcular costos de esta sesión
-                session_consults = len(self.keywords_list) * int(self.pages_var.get())
-                self.today_consults += session_consults
-                self.total_consults += session_consults
-                if session_consults > 100:
-                    paid_consults = session_consults - 100
-                    self.total_cost += (paid_consults / 1000) * 5.0
-
+                # Consultas y costes reales registrados por el rate limiter
+                self.refresh_quota_counters()
                 self.update_cost_display()
 
                 self.log_message(f"✅ Scraping completado: {len(results)} resultados encontrados")
                 
                 # Auto-save results when scraping completes
-                if hasattr(self.scraper, 'save_results'):
+                if hasattr(self.scraper, 'save_sink'):
                     try:
                         # Obtener proyecto activo
                         project = self.project_manager.get_active_project()
                         project_id = project['id'] if project else None
 
-                        session_id = self.scraper.save_results(results, project_id=project_id)
+                        session_id = self.scraper.save_sink(sink, project_id=project_id)
                         if session_id:
                             project_name = project['name'] if project else 'General'
                             self.log_message(f"💾 Resultados guardados en proyecto '{project_name}' - Sesión: {session_id}")
@@ -2946,38 +3066,19 @@ No necesitas configurar URIs manualmente para apps de escritorio."""
 
                 scraper = StealthSerpScraper(scraper_config)
 
-                # Buscar sugerencias usando múltiples variaciones del scraper
-                search_variations = [
-                    keyword, f"{keyword} ", f"{keyword} o", f"{keyword} c",
-                    f"{keyword} d", f"{keyword} p", f"{keyword} q"
-                ]
-
-                all_suggestions = []
-
-                # Los logs aparecerán automáticamente en la consola del scraper porque estamos usando sus métodos
-                for i, variation in enumerate(search_variations, 1):
-                    try:
-                        # Usar el método del scraper - esto hace que los logs aparezcan en scraper.log y consola
-                        suggests = scraper.google_suggest_scraper(
-                            variation,
-                            country=self.country_var.get(),
-                            language=self.language_var.get()
-                        )
-
-                        # Filtrar sugerencias relevantes
-                        relevant = [s for s in suggests if
-                                  s.lower().startswith(keyword.lower()) and
-                                  s.lower() != keyword.lower() and
-                                  len(s) > len(keyword) + 2]
-
-                        all_suggestions.extend(relevant[:10])  # Máximo 10 por variación
-
-                    except Exception as e:
-                        # Error interno - no mostrar en logs de scraper, solo en GUI si es necesario
-                        continue
+                # Todas las variaciones (keyword sola, con espacio y con letras) en paralelo y en un solo paso
+                suggests = scraper.google_suggest_scraper(
+                    keyword,
+                    country=self.country_var.get(),
+                    language=self.language_var.get(),
+                    max_suggestions=None,
+                    connectors=['', 'o', 'c', 'd', 'p', 'q']
+                )
 
-                # Filtrar duplicados y mostrar resultados
-                unique_suggestions = list(set(all_suggestions))[:25]  # Máximo 25 total
+                # Filtrar sugerencias relevantes (ya llegan sin duplicados y en orden)
+                unique_suggestions = [s for s in suggests if
+                                      s.lower().startswith(keyword.lower()) and
+                                      len(s) > len(keyword) + 2][:25]  # Máximo 25 total
 
                 self.related_text.configure(state="normal")
                 self.related_text.delete("1.0", "end")
@@ -3091,35 +3192,19 @@ No necesitas configurar URIs manualmente para apps de escritorio."""
 
                 scraper = StealthSerpScraper(scraper_config)
 
-                # Buscar sugerencias usando múltiples variaciones
-                search_variations = [
-                    keyword, f"{keyword} ", f"{keyword} o", f"{keyword} c",
-                    f"{keyword} d", f"{keyword} p", f"{keyword} q"
-                ]
-
-                all_suggestions = []
-
-                for i, variation in enumerate(search_variations, 1):
-                    try:
-                        suggests = scraper.google_suggest_scraper(
-                            variation,
-                            country=self.country_var.get(),
-                            language=self.language_var.get()
-                        )
-
-                        # Filtrar sugerencias relevantes
-                        relevant = [s for s in suggests if
-                                  s.lower().startswith(keyword.lower()) and
-                                  s.lower() != keyword.lower() and
-                                  len(s) > len(keyword) + 2]
-
-                        all_suggestions.extend(relevant[:10])  # Máximo 10 por variación
-
-                    except Exception as e:
-                        continue
+                # Todas las variaciones (keyword sola, con espacio y con letras) en paralelo y en un solo paso
+                suggests = scraper.google_suggest_scraper(
+                    keyword,
+                    country=self.country_var.get(),
+                    language=self.language_var.get(),
+                    max_suggestions=None,
+                    connectors=['', 'o', 'c', 'd', 'p', 'q']
+                )
 
-                # Filtrar duplicados y mostrar resultados
-                unique_suggestions = list(set(all_suggestions))[:25]  # Máximo 25 total
+                # Filtrar sugerencias relevantes (ya llegan sin duplicados y en orden)
+                unique_suggestions = [s for s in suggests if
+                                      s.lower().startswith(keyword.lower()) and
+                                      len(s) > len(keyword) + 2][:25]  # Máximo 25 total
 
                 self.scraping_related_text.configure(state="normal")
                 self.scraping_related_text.delete("1.0", "end")
@@ -3158,6 +3243,59 @@ No necesitas configurar URIs manualmente para apps de escritorio."""
         # Ejecutar en hilo separado
         threading.Thread(target=search_thread, daemon=True).start()
 
+    def expand_related_keywords_scraping(self):
+        """Expansión long-tail (BFS sobre Google Suggest); mostrando cada keyword según aparece"""
+        # Segundo clic mientras se expande: detener
+        if getattr(self, 'expansion_stop_event', None) and not self.expansion_stop_event.is_set():
+            self.expansion_stop_event.set()
+            return
+
+        keyword = self.scraping_related_keyword_entry.get().strip()
+        if not keyword:
+            messagebox.showwarning("Advertencia", "Ingresa una keyword principal")
+            return
+
+        self.expansion_stop_event = threading.Event()
+        self.scraping_related_suggestions = []
+        self.scraping_expand_button.configure(text="⏹️ Detener")
+        self.scraping_related_text.configure(state="normal")
+        self.scraping_related_text.delete("1.0", "end")
+        self.scraping_related_text.insert("end", f"🌳 Expandiendo '{keyword}' con Google Suggest...\n\n")
+        self.scraping_related_text.configure(state="disabled")
+
+        def show_keyword(record):
+            self.scraping_related_suggestions.append(record['keyword'])
+            count = len(self.scraping_related_suggestions)
+            self.scraping_related_text.configure(state="normal")
+            self.scraping_related_text.insert("end", f"{count:3d}. {'  ' * (record['depth'] - 1)}{record['keyword']}\n")
+            self.scraping_related_text.see("end")
+            self.scraping_related_text.configure(state="disabled")
+            self.scraping_related_count_label.configure(text=f"({count} sugerencias)")
+            self.scraping_add_to_keywords_button.configure(state="normal")
+
+        def expand_thread():
+            try:
+                if getattr(self, 'keyword_expander', None) is None:
+                    self.keyword_expander = KeywordExpander.from_config(config, SuggestEngine.from_config(config))
+
+                discovered = self.keyword_expander.expand(
+                    [keyword],
+                    country=self.country_var.get(),
+                    language=self.language_var.get(),
+                    on_keyword=lambda record: self.root.after(0, lambda: show_keyword(record)),
+                    stop_callback=self.expansion_stop_event.is_set
+                )
+                stats = self.keyword_expander.stats
+                self.log_message(f"🌳 Expansión de '{keyword}': {len(discovered)} keywords, "
+                                 f"{stats['requests']} peticiones a Google Suggest")
+            except Exception as e:
+                self.log_message(f"❌ Error expandiendo keywords: {str(e)[:80]}")
+            finally:
+                self.expansion_stop_event.set()
+                self.root.after(0, lambda: self.scraping_expand_button.configure(text="🌳 Expandir"))
+
+        threading.Thread(target=expand_thread, daemon=True).start()
+
     def add_related_to_keywords_scraping(self):
         """Añade las keywords relacionadas desde la pestaña de Scraping a la lista principal"""
         if not hasattr(self, 'scraping_related_suggestions') or not self.scraping_related_suggestions:
@@ -3565,87 +3703,87 @@ No necesitas configurar URIs manualmente para apps de escritorio."""
         # Cambiar estado del botón
         self.my_ranking_button.configure(state="disabled", text="🔄 Analizando...")
         self.my_ranking_status.configure(text=f"Analizando ranking de: {domain}")
+        for item in self.my_ranking_results_tree.get_children():
+            self.my_ranking_results_tree.delete(item)
+
+        country = self.country_var.get()
+        language = self.language_var.get()
 
         def analysis_thread():
             try:
                 results = []
 
-                # Crear scraper
+                # Crear scraper (país, idioma y ritmo de la configuración general)
                 from config.settings import config
                 scraper_config = config.copy()
                 scraper_config.update({
-                    'MIN_KEYWORD_DELAY': 3,
-                    'MAX_KEYWORD_DELAY': 7,
                     'PAGES_TO_SCRAPE': 3,
-                    'DEFAULT_COUNTRY': "US",
-                    'DEFAULT_LANGUAGE': "en"
+                    'DEFAULT_COUNTRY': country,
+                    'DEFAULT_LANGUAGE': language
                 })
 
                 scraper = StealthSerpScraper(scraper_config)
 
-                # Generar sugestões y buscar
-                total_processed = 0
+                # Etapa 1: sugerencias de todas las keywords base en paralelo
+                variations_per_base = 3
+                search_variations = []
                 for base_keyword in base_keywords:
-                    try:
-                        self.my_ranking_status.configure(text=f"Proceso: {base_keyword}")
-
-                        # Obtener sugerencias usando nuestro método de Google Suggest
-                        search_variations = [
-                            base_keyword, f"{base_keyword} ", f"{base_keyword} o"
-                        ]
-
-                        suggested_keywords = []
-                        for variation in search_variations:
-                            try:
-                                import requests
-                                url = "https://suggestqueries.google.com/complete/search"
-                                params = {
-                                    'client': 'firefox', 'q': variation,
-                                    'hl': 'en', 'gl': 'us'
-                                }
-                                response = requests.get(url, params=params, timeout=5)
-
-                                if response.status_code == 200:
-                                    data = response.json()
-                                    if len(data) >= 2 and isinstance(data[1], list):
-                                        suggests = data[1][:max(1, suggestion_count // len(search_variations))]
-                                        suggested_keywords.extend(suggests)
-                            except:
-                                continue
-
-                        # Eliminar duplicados y añadir keyword base
-                        all_keywords = list(set([base_keyword] + suggested_keywords))[:suggestion_count + 1]
-
-                        # Verificar cada keyword
-                        for keyword in all_keywords:
-                            if keyword.strip():
-                                try:
-                                    search_results = scraper.single_keyword_position_check(keyword, None, 3)
-
-                                    # Buscar si mi dominio aparece
-                                    for result in search_results:
-                                        if result['domain'] == domain:
-                                            results.append({
-                                                'keyword': keyword,
-                                                'position': result['position'],
-                                                'title': result['title'],
-                                                'url': result['url'],
-                                                'suggested_from': base_keyword
-                                            })
-                                            break  # Solo el primero encontrado
-
-                                    total_processed += 1
-
-                                except Exception as e:
-                                    self.log_message(f"⚠️ Error analizando '{keyword}': {str(e)[:50]}")
-                                    continue
-
-                    except Exception as e:
-                        self.log_message(f"❌ Error procesando '{base_keyword}': {str(e)[:50]}")
-                        continue
+                    search_variations.extend([base_keyword, f"{base_keyword} ", f"{base_keyword} o"])
+                self.root.after(0, lambda: self.my_ranking_status.configure(
+                    text=f"🔍 Obteniendo sugerencias de {len(base_keywords)} keywords base..."))
+                suggestions = scraper.suggest_engine.fetch_many(search_variations, country, language)
+
+                # Candidatas sin duplicados entre todas las bases; cada una conserva la primera base que la sugirió
+                per_variation = max(1, suggestion_count // variations_per_base)
+                suggested_from = {}
+                for index, base_keyword in enumerate(base_keywords):
+                    start = index * variations_per_base
+                    candidates = [base_keyword]
+                    for suggests in suggestions[start:start + variations_per_base]:
+                        candidates.extend(suggests[:per_variation])
+                    added = 0
+                    for candidate in candidates:
+                        key = normalize_keyword(candidate)
+                        if key and key not in suggested_from and added <= suggestion_count:
+                            suggested_from[key] = (candidate.strip(), base_keyword)
+                            added += 1
+
+                keywords = [candidate for candidate, _ in suggested_from.values()]
+                total = len(keywords)
+                progress = {'completed': 0}
+
+                def on_keyword(keyword, keyword_results):
+                    # Cada keyword comprobada se muestra en la tabla en cuanto termina
+                    progress['completed'] += 1
+                    completed = progress['completed']
+                    match = next((r for r in keyword_results if self._domain_matches(r['domain'], domain)), None)
+                    if match:
+                        row = {
+                            'keyword': keyword,
+                            'position': match['position'],
+                            'title': match['title'],
+                            'url': match['url'],
+                            'suggested_from': suggested_from.get(normalize_keyword(keyword), (keyword, keyword))[1]
+                        }
+                        results.append(row)
+                        self.root.after(0, lambda: self._insert_my_ranking_row(row))
+                    self.root.after(0, lambda: self.my_ranking_status.configure(
+                        text=f"Proceso: {completed}/{total} keywords - {len(results)} con {domain}"))
+
+                # Etapa 2: comprobación concurrente, dejando de paginar al encontrar el dominio
+                scraper.batch_position_check(
+                    keywords, domain, 3,
+                    concurrency=max(1, int(scraper_config.get('MY_RANKING_CONCURRENCY', 4))),
+                    find_first=True,
+                    progress_callback=on_keyword,
+                    compact=True
+                )
+                stats = scraper.get_session_stats()
+                if stats.get('find_first_pages_saved'):
+                    self.log_message(f"⚡ Mi Ranking: {stats['find_first_pages_saved']} consultas de API ahorradas")
 
-                # Actualizar tabla
-                self.root.after(0, lambda: self.update_my_rankings_results(results, domain, total_processed))
+                # Tabla final ordenada por posición
+                self.root.after(0, lambda: self.update_my_rankings_results(results, domain, progress['completed']))
 
             except Exception as e:
                 self.root.after(0, lambda: self.show_my_ranking_error(str(e)))
@@ -3654,6 +3792,21 @@ No necesitas configurar URIs manualmente para apps de escritorio."""
 
         threading.Thread(target=analysis_thread, daemon=True).start()
 
+    @staticmethod
+    def _domain_matches(result_domain, domain):
+        """El dominio de un resultado es el mío o un subdominio suyo (www incluido)"""
+        return domain_matches(result_domain, domain)
+
+    def _insert_my_ranking_row(self, result):
+        """Añade una fila a la tabla de mi ranking"""
+        self.my_ranking_results_tree.insert("", "end", values=(
+            result['keyword'],
+            result['position'],
+            result['title'][:50] + "..." if len(result['title']) > 50 else result['title'],
+            result['url'][:80] + "..." if len(result['url']) > 80 else result['url'],
+            result['suggested_from']
+        ))
+
     def update_my_rankings_results(self, results, domain, total_processed):
         """Actualiza la tabla de resultados de mi ranking"""
         # Limpiar tabla
@@ -3664,13 +3817,7 @@ No necesitas configurar URIs manualmente para apps de escritorio."""
         results_sorted = sorted(results, key=lambda x: x['position'])
 
         for result in results_sorted:
-            self.my_ranking_results_tree.insert("", "end", values=(
-                result['keyword'],
-                result['position'],
-                result['title'][:50] + "..." if len(result['title']) > 50 else result['title'],
-                result['url'][:80] + "..." if len(result['url']) > 80 else result['url'],
-                result['suggested_from']
-            ))
+            self._insert_my_ranking_row(result)
 
         # Actualizar estado
         if results:
@@ -0,0 +1,104 @@
+"""
+Cliente HTTP compartido por todo el proceso
+Una única requests.Session con pool de conexiones keep-alive por host, para
+no repetir el handshake TLS en cada llamada a Custom Search, Suggest o la GUI,
+y contadores para saber cuántas peticiones reutilizaron una conexión abierta
+"""
+
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+_counters = {'requests': 0, 'connections_opened': 0}
+_counters_lock = threading.Lock()
+
+
+def _count(name: str, amount: int = 1):
+    with _counters_lock:
+        _counters[name] += amount
+
+
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self):
+        _count('connections_opened')
+        super().connect()
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        _count('connections_opened')
+        super().connect()
+
+
+# Se cuenta cada connect() real: también las reconexiones de una conexión cerrada por el servidor
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter que cuenta las conexiones TCP/TLS que abre su pool"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool,
+        }
+
+
+def _count_request(response, *args, **kwargs):
+    _count('requests')
+
+
+def create_session(pool_connections: int = 10, pool_maxsize: int = 20, pool_block: bool = True) -> requests.Session:
+    """
+    Session con pool de conexiones
+
+    Args:
+        pool_connections: hosts distintos cuyo pool se mantiene abierto
+        pool_maxsize: conexiones abiertas como máximo por host
+        pool_block: con True un hilo espera a que quede libre una conexión
+            en lugar de abrir otra por encima de pool_maxsize (límite por host)
+    """
+    session = requests.Session()
+    # Los reintentos los gestiona RetryPolicy, no urllib3
+    adapter = PooledHTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                max_retries=0, pool_block=pool_block)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.hooks['response'].append(_count_request)
+    return session
+
+
+_shared_session = None
+_shared_lock = threading.Lock()
+
+
+def get_http_session(config: Optional[Dict] = None) -> requests.Session:
+    """Session compartida del proceso (el tamaño del pool se fija en la primera llamada con config)"""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            config = config or {}
+            _shared_session = create_session(
+                pool_connections=int(config.get('HTTP_POOL_CONNECTIONS', 10)),
+                pool_maxsize=int(config.get('HTTP_POOL_MAXSIZE', 20)),
+            )
+        return _shared_session
+
+
+def get_pool_stats() -> Dict:
+    """Peticiones, conexiones abiertas y peticiones que reutilizaron una conexión"""
+    with _counters_lock:
+        stats = dict(_counters)
+    stats['pool_hits'] = max(0, stats['requests'] - stats['connections_opened'])
+    stats['pool_hit_ratio'] = round(stats['pool_hits'] / stats['requests'], 3) if stats['requests'] else 0.0
+    return stats
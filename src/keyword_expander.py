@@ -0,0 +1,166 @@
+"""
+Expansión de keywords long-tail sobre Google Suggest
+Recorrido en anchura (BFS) acotado: cada keyword se consulta sola, con cada
+letra a-z y con los conectores habituales; las sugerencias nuevas pasan al
+siguiente nivel hasta la profundidad máxima o el tope de peticiones
+"""
+
+import string
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from suggest_engine import SuggestEngine, FailedSuggestions, DEFAULT_CONNECTORS
+from utils import normalize_keyword
+
+ALPHABET = list(string.ascii_lowercase)
+
+
+class KeywordExpander:
+    """
+    Crawler BFS de sugerencias con conjunto de visitados y tope de peticiones
+
+    Args:
+        engine: SuggestEngine con el que se lanzan las consultas en paralelo
+        max_depth: niveles de expansión a partir de las semillas (1 = solo
+            las sugerencias de las semillas)
+        max_requests: peticiones a Suggest como máximo en toda la expansión
+        max_keywords: keywords nuevas como máximo (0 = sin límite)
+        alphabet: sufijos de una letra (keyword + "a", "b"...)
+        connectors: sufijos de palabra (keyword + "para", "con"...)
+    """
+
+    def __init__(self, engine: SuggestEngine, max_depth: int = 2, max_requests: int = 500, max_keywords: int = 0,
+                 alphabet: Optional[Sequence[str]] = None, connectors: Optional[Sequence[str]] = None):
+        self.logger = logging.getLogger(__name__)
+        self.engine = engine
+        self.max_depth = max(1, int(max_depth))
+        self.max_requests = max(1, int(max_requests))
+        self.max_keywords = max(0, int(max_keywords))
+        self.alphabet = ALPHABET if alphabet is None else list(alphabet)
+        self.connectors = DEFAULT_CONNECTORS if connectors is None else list(connectors)
+        # Respuestas ya obtenidas por (consulta normalizada, país, idioma): volver
+        # a expandir una semilla no repite peticiones. Las consultas fallidas no
+        # se guardan para que una expansión posterior las reintente
+        self.responses = {}
+        self.stats = {'requests': 0, 'cached_queries': 0, 'keywords': 0}
+
+    @classmethod
+    def from_config(cls, config: Dict, engine: SuggestEngine, **overrides) -> 'KeywordExpander':
+        options = {
+            'max_depth': config.get('EXPANSION_MAX_DEPTH', 2),
+            'max_requests': config.get('EXPANSION_MAX_REQUESTS', 500),
+            'max_keywords': config.get('EXPANSION_MAX_KEYWORDS', 0),
+        }
+        options.update({name: value for name, value in overrides.items() if value is not None})
+        return cls(engine, **options)
+
+    def queries_for(self, keyword: str) -> List[str]:
+        """Consultas con las que se expande una keyword"""
+        suffixes = [''] + self.alphabet + self.connectors
+        return [f"{keyword} {suffix}" if suffix else keyword for suffix in suffixes]
+
+    def expand(self, seeds: Iterable[str], country: str = 'US', language: str = 'en',
+               on_keyword: Optional[Callable[[Dict], None]] = None, stop_callback=None) -> List[Dict]:
+        """
+        Expande las semillas nivel a nivel
+
+        Cada keyword nueva se entrega a on_keyword en cuanto aparece, como
+        {'keyword', 'depth', 'parent', 'seed'}; la misma lista se devuelve al final.
+        Las consultas usan el texto tal cual (acentos y mayúsculas incluidos); la
+        forma normalizada solo sirve para no repetir keywords ni consultas.
+        """
+        self.stats = {'requests': 0, 'cached_queries': 0, 'keywords': 0}
+        locale = (country.upper(), language.lower())
+        requests_per_query = len(self.engine.endpoints)
+        # Consultas en vuelo a la vez: suficientes para llenar el pool del motor
+        chunk_size = max(1, self.engine.max_workers // requests_per_query) * 4
+
+        # El tope se comprueba antes de cada petición real, reintentos incluidos
+        budget_lock = threading.Lock()
+
+        def take_request():
+            with budget_lock:
+                if self.stats['requests'] >= self.max_requests:
+                    return False
+                self.stats['requests'] += 1
+                return True
+
+        visited_keywords = set()
+        visited_queries = set()
+        frontier = []
+        for seed in seeds:
+            seed = seed.strip()
+            key = normalize_keyword(seed)
+            if key and key not in visited_keywords:
+                visited_keywords.add(key)
+                frontier.append((seed, seed))
+
+        discovered = []
+        self.logger.info(f"🌳 Expandiendo {len(frontier)} semillas (profundidad {self.max_depth}, "
+                         f"máximo {self.max_requests} peticiones)")
+
+        for depth in range(1, self.max_depth + 1):
+            pending = []
+            for keyword, seed in frontier:
+                for query in self.queries_for(keyword):
+                    query_key = normalize_keyword(query)
+                    if query_key not in visited_queries:
+                        visited_queries.add(query_key)
+                        pending.append((query, (query_key,) + locale, keyword, seed))
+
+            next_frontier = []
+            for start in range(0, len(pending), chunk_size):
+                if stop_callback and stop_callback():
+                    return self._finish(discovered, 'detenida')
+
+                chunk = pending[start:start + chunk_size]
+                missing = [(query, response_key) for query, response_key, _, _ in chunk
+                           if response_key not in self.responses]
+                self.stats['cached_queries'] += len(chunk) - len(missing)
+                # No lanzar consultas que el tope ya no puede cubrir; take_request lo
+                # garantiza igualmente y las de la caché de disco del motor no gastan
+                budget = max(0, self.max_requests - self.stats['requests']) // requests_per_query
+                to_fetch = missing[:budget]
+                limit_reached = len(to_fetch) < len(missing)
+                failed = {}  # Lo que llegó de consultas fallidas: se usa ahora pero no se memoriza
+                if to_fetch:
+                    fetched = self.engine.fetch_many([query for query, _ in to_fetch], country, language,
+                                                     request_budget=take_request)
+                    for (_, response_key), suggestions in zip(to_fetch, fetched):
+                        if suggestions is None:
+                            limit_reached = True
+                        elif isinstance(suggestions, FailedSuggestions):
+                            failed[response_key] = suggestions
+                        else:
+                            self.responses[response_key] = suggestions
+
+                for _, response_key, parent, seed in chunk:
+                    suggestions = self.responses.get(response_key) or failed.get(response_key, [])
+                    for suggestion in suggestions:
+                        key = normalize_keyword(suggestion)
+                        if not key or key in visited_keywords:
+                            continue
+                        visited_keywords.add(key)
+                        record = {'keyword': suggestion, 'depth': depth, 'parent': parent, 'seed': seed}
+                        discovered.append(record)
+                        self.stats['keywords'] += 1
+                        if on_keyword:
+                            on_keyword(record)
+                        if self.max_keywords and len(discovered) >= self.max_keywords:
+                            return self._finish(discovered, 'límite de keywords')
+                        next_frontier.append((suggestion, seed))
+
+                if limit_reached:
+                    return self._finish(discovered, 'límite de peticiones')
+
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        return self._finish(discovered, 'completada')
+
+    def _finish(self, discovered: List[Dict], reason: str) -> List[Dict]:
+        self.logger.info(f"✅ Expansión {reason}: {len(discovered)} keywords nuevas, "
+                         f"{self.stats['requests']} peticiones ({self.stats['cached_queries']} consultas sin petición)")
+        return discovered
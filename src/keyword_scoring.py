@@ -0,0 +1,79 @@
+"""
+Puntuación de competitividad de keywords por lotes
+Misma heurística que StealthSerpScraper.analyze_keyword_competitiveness,
+calculada sobre arrays de NumPy para puntuar cientos de miles de variantes
+de una vez
+"""
+
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+GEO_TERMS = ['españa', 'madrid', 'barcelona', 'español', 'castellano']
+COMMERCIAL_TERMS = ['comprar', 'precio', 'barato', 'venta', 'oferta', 'promocia']
+
+SCORE_COLUMNS = ['keyword', 'competition_score', 'estimated_volume', 'difficulty', 'opportunity_score']
+
+
+class TermMatcher:
+    """Detecta si cada keyword contiene alguno de los términos (como subcadena)"""
+
+    def __init__(self, terms: Sequence[str]):
+        self.terms = np.array([term.lower() for term in terms], dtype=str)
+
+    def matches(self, lowered: np.ndarray) -> np.ndarray:
+        found = np.zeros(lowered.shape, dtype=bool)
+        for term in self.terms:
+            found |= np.strings.find(lowered, term) >= 0
+        return found
+
+
+GEO_MATCHER = TermMatcher(GEO_TERMS)
+COMMERCIAL_MATCHER = TermMatcher(COMMERCIAL_TERMS)
+
+
+def score_keywords(keywords: Iterable[str]) -> pd.DataFrame:
+    """
+    Competencia, volumen estimado, dificultad y oportunidad de cada keyword
+
+    Returns:
+        DataFrame con SCORE_COLUMNS, una fila por keyword en el orden recibido
+    """
+    keywords = list(keywords)
+    if not keywords:
+        return pd.DataFrame(columns=SCORE_COLUMNS)
+
+    lowered = np.array([keyword.lower() for keyword in keywords], dtype=str)
+    keyword_length = np.fromiter((len(keyword) for keyword in keywords), dtype=np.int64, count=len(keywords))
+    word_count = np.fromiter((len(keyword.split()) for keyword in keywords), dtype=np.int64, count=len(keywords))
+    has_geo_terms = GEO_MATCHER.matches(lowered)
+    has_commercial_intent = COMMERCIAL_MATCHER.matches(lowered)
+    has_long_tail = word_count >= 3
+    short = keyword_length < 10
+
+    # Score de competencia (base neutral 3)
+    score = (3.0
+             - 1.0 * has_long_tail
+             + 1.0 * short
+             - 0.5 * has_geo_terms
+             + 2.0 * has_commercial_intent
+             + 3.0 * (word_count == 1))
+
+    # Volumen estimado (muy grosero)
+    volume_multiplier = np.select([short, keyword_length < 20, keyword_length < 30], [5.0, 2.0, 1.0], 0.5)
+    volume_multiplier = np.where(has_commercial_intent, volume_multiplier * 1.5, volume_multiplier)
+    volume_multiplier = np.where(has_geo_terms, volume_multiplier * 0.7, volume_multiplier)
+    estimated_volume = (1000 * volume_multiplier).astype(np.int64)
+
+    # Dificultad basada en el score; oportunidad = inverso, con extra para long-tail
+    difficulty = np.minimum(100, score * 12 + (word_count - 1) * 5)
+    opportunity = np.maximum(0, 100 - difficulty) + 10 * has_long_tail
+
+    return pd.DataFrame({
+        'keyword': keywords,
+        'competition_score': np.round(score, 1),
+        'estimated_volume': estimated_volume,
+        'difficulty': np.round(difficulty, 0),
+        'opportunity_score': np.round(opportunity, 0),
+    }, columns=SCORE_COLUMNS)
@@ -0,0 +1,99 @@
+"""
+Ritmo adaptativo entre keywords (AIMD)
+Mientras la API responde sin problemas el delay baja de forma aditiva y ante
+un 429 o reintentos se multiplica, siempre dentro de los límites configurados
+"""
+
+import time
+import random
+import logging
+import threading
+from typing import Dict
+
+
+class AdaptivePacer:
+    """
+    Controla la espera entre keywords de una ejecución
+
+    Args:
+        min_delay / max_delay: límites del delay adaptativo en segundos
+        adaptive: False mantiene el delay aleatorio clásico entre fixed_range
+        decrease_step: segundos que se restan tras cada keyword sin incidencias
+        increase_factor: multiplicador del delay tras un 429 o reintentos
+        fixed_range: (mínimo, máximo) del delay aleatorio clásico
+    """
+
+    # Delay mínimo tras la primera penalización si min_delay es 0
+    BACKOFF_FLOOR = 1.0
+
+    def __init__(self, min_delay: float = 0.0, max_delay: float = 30.0, adaptive: bool = True,
+                 decrease_step: float = 0.5, increase_factor: float = 2.0, fixed_range=(5, 15)):
+        self.logger = logging.getLogger(__name__)
+        self.min_delay = max(0.0, float(min_delay))
+        self.max_delay = max(self.min_delay, float(max_delay))
+        self.adaptive = adaptive
+        self.decrease_step = decrease_step
+        self.increase_factor = increase_factor
+        self.fixed_range = fixed_range
+        self._lock = threading.Lock()
+        self.reset()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'AdaptivePacer':
+        return cls(
+            min_delay=config.get('PACING_MIN_DELAY', 0),
+            max_delay=config.get('PACING_MAX_DELAY', 30),
+            adaptive=config.get('ADAPTIVE_PACING', True),
+            fixed_range=(config.get('MIN_KEYWORD_DELAY', 5), config.get('MAX_KEYWORD_DELAY', 15)),
+        )
+
+    def reset(self):
+        """Vuelve al delay mínimo y reinicia la medición de ritmo"""
+        with self._lock:
+            self.delay = self.min_delay
+            self.keywords = 0
+            self.throttled = 0
+            self.started = time.monotonic()
+
+    def record(self, throttled: bool = False):
+        """Anota una keyword completada y ajusta el delay (AIMD)"""
+        with self._lock:
+            self.keywords += 1
+            if not self.adaptive:
+                return
+            if throttled:
+                self.throttled += 1
+                self.delay = min(self.max_delay,
+                                 max(self.delay * self.increase_factor, self.min_delay, self.BACKOFF_FLOOR))
+            else:
+                self.delay = max(self.min_delay, self.delay - self.decrease_step)
+
+    def next_delay(self) -> float:
+        """Segundos a esperar antes de la siguiente keyword"""
+        if not self.adaptive:
+            return random.uniform(*self.fixed_range)
+        with self._lock:
+            return self.delay
+
+    def wait(self, stop_callback=None, delay=None) -> bool:
+        """Espera el delay actual (o `delay`). Devuelve False si stop_callback pide parar"""
+        if delay is None:
+            delay = self.next_delay()
+            if delay > 0:
+                self.logger.info(f"⏳ Esperando {delay:.1f}s antes del siguiente keyword...")
+        if delay <= 0:
+            return True
+        deadline = time.monotonic() + delay
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            if stop_callback and stop_callback():
+                return False
+            time.sleep(min(remaining, 0.1))
+
+    def keywords_per_minute(self) -> float:
+        """Ritmo conseguido desde el último reset"""
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            return round(self.keywords * 60 / elapsed, 2) if elapsed > 0 else 0.0
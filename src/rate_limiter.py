@@ -0,0 +1,365 @@
+"""
+Limitador de peticiones compartido por todos los clientes de APIs de Google
+Token bucket global por API (MAX_REQUESTS_PER_SECOND para Custom Search) más
+uno por API key con su cuota por minuto, presupuesto diario por key y un
+registro persistente (ledger) con el número real de consultas de cada día
+"""
+
+import os
+import json
+import time
+import atexit
+import hashlib
+import logging
+import threading
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+# APIs conocidas y clave de configuración de su presupuesto
+API_CUSTOM_SEARCH = 'customsearch'
+API_SUGGEST = 'suggest'
+API_SEARCH_CONSOLE = 'searchconsole'
+
+DEFAULT_LIMITS = {
+    API_CUSTOM_SEARCH: {'per_minute': 100, 'per_day': 10000},
+    API_SUGGEST: {'per_minute': 120, 'per_day': 0},
+    API_SEARCH_CONSOLE: {'per_minute': 1200, 'per_day': 0},
+}
+
+# Precio de Custom Search JSON API: 100 consultas gratis/día por proyecto de
+# Google Cloud (no por key), luego $5 por 1000
+FREE_QUERIES_PER_DAY = 100
+PRICE_PER_1000_QUERIES = 5.0
+
+# Días con detalle por key que conserva el ledger; los anteriores se resumen
+LEDGER_KEEP_DAYS = 7
+# Clave del ledger con el acumulado de los días ya resumidos
+ARCHIVED_KEY = '_archived'
+
+
+def _default_ledger_path() -> str:
+    """Ruta absoluta del ledger (data/ en la raíz del proyecto)"""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(os.path.dirname(current_dir), 'data', 'quota_ledger.json')
+
+
+def key_fingerprint(api_key: Optional[str]) -> str:
+    """Identificador no reversible de una API key para registros y buckets"""
+    if not api_key:
+        return 'default'
+    return hashlib.sha1(api_key.encode('utf-8')).hexdigest()[:10]
+
+
+class QuotaExceededError(Exception):
+    """Se ha agotado el presupuesto diario configurado para una API key"""
+
+
+class TokenBucket:
+    """Token bucket thread-safe: `rate` tokens por segundo hasta `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """Intenta consumir tokens; devuelve 0 si lo consigue o los segundos a esperar"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            self._refill(now)
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            if self.rate <= 0:
+                return 1.0
+            return (tokens - self.tokens) / self.rate
+
+    def acquire(self, tokens: float = 1, stop_callback=None) -> bool:
+        """Bloquea hasta obtener tokens. Devuelve False si stop_callback pide parar"""
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return True
+            if stop_callback and stop_callback():
+                return False
+            time.sleep(min(wait, 0.1))
+
+    def pause(self, seconds: float):
+        """Bloquea el bucket durante `seconds` (p. ej. tras un 429)"""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+            self.updated = time.monotonic()
+
+
+class QuotaLedger:
+    """
+    Registro persistente de consultas por día, API y API key
+
+    Las consultas se cuentan en memoria y se vuelcan a disco como mucho cada
+    `flush_interval` segundos (y al salir del proceso). Solo se conserva el
+    detalle de los últimos LEDGER_KEEP_DAYS días; de los anteriores quedan el
+    total de consultas y su coste.
+
+    La cuota gratuita es por proyecto: el coste descuenta del total diario
+    FREE_QUERIES_PER_DAY por cada uno de los `free_projects` proyectos a los
+    que pertenecen las keys (si el uso entre proyectos está descompensado, el
+    coste real puede ser mayor).
+    """
+
+    def __init__(self, path: Optional[str] = None, flush_interval: float = 2.0):
+        self.path = path or _default_ledger_path()
+        self.flush_interval = flush_interval
+        self.free_projects = 1
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._data = self._load()
+        self._dirty = False
+        self._last_save = 0.0
+        atexit.register(self.flush)
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning(f"Ledger de cuota ilegible, se reinicia: {e}")
+            return {}
+
+    def _days(self) -> Dict:
+        """Días con detalle por key (sin el acumulado archivado)"""
+        return {day: values for day, values in self._data.items() if day != ARCHIVED_KEY}
+
+    def _prune(self, today: str):
+        """Resume en ARCHIVED_KEY los días más antiguos que LEDGER_KEEP_DAYS"""
+        cutoff = (date.fromisoformat(today) - timedelta(days=LEDGER_KEEP_DAYS)).isoformat()
+        for day in [day for day in self._days() if day < cutoff]:
+            archived = self._data.setdefault(ARCHIVED_KEY, {})
+            for api, per_key in self._data.pop(day).items():
+                totals = archived.setdefault(api, {'queries': 0, 'cost': 0.0})
+                totals['queries'] += sum(per_key.values())
+                totals['cost'] += self._cost(per_key)
+
+    def _cost(self, per_key: Dict) -> float:
+        paid = max(0, sum(per_key.values()) - FREE_QUERIES_PER_DAY * self.free_projects)
+        return (paid / 1000) * PRICE_PER_1000_QUERIES
+
+    def _save_if_due(self, force: bool = False):
+        """Escritura atómica y espaciada para no corromper ni reescribir el ledger en cada consulta"""
+        with self._lock:
+            if not self._dirty or (not force and time.monotonic() - self._last_save < self.flush_interval):
+                return
+            payload = json.dumps(self._data)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        with self._write_lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                self.logger.warning(f"No se pudo guardar el ledger de cuota: {e}")
+
+    def flush(self):
+        """Vuelca a disco las consultas pendientes"""
+        self._save_if_due(force=True)
+
+    def record(self, api: str, key_id: str = 'default', count: int = 1, per_day: int = 0) -> bool:
+        """
+        Suma `count` consultas reales al día de hoy
+
+        Con per_day, la comprobación del límite y el incremento se hacen en un
+        solo paso: si la key ya lo alcanzó no se anota nada y se devuelve False.
+        """
+        today = date.today().isoformat()
+        with self._lock:
+            if today not in self._data:
+                self._prune(today)
+            per_api = self._data.setdefault(today, {}).setdefault(api, {})
+            if per_day and per_api.get(key_id, 0) + count > per_day:
+                return False
+            per_api[key_id] = per_api.get(key_id, 0) + count
+            self._dirty = True
+        self._save_if_due()
+        return True
+
+    def get_count(self, api: str, key_id: Optional[str] = None, day: Optional[str] = None) -> int:
+        """Consultas de un día (hoy por defecto) para una API y, opcionalmente, una key"""
+        day = day or date.today().isoformat()
+        with self._lock:
+            per_api = self._data.get(day, {}).get(api, {})
+            if key_id is not None:
+                return per_api.get(key_id, 0)
+            return sum(per_api.values())
+
+    def get_total(self, api: str) -> int:
+        """Consultas históricas totales de una API"""
+        with self._lock:
+            archived = self._data.get(ARCHIVED_KEY, {}).get(api, {}).get('queries', 0)
+            return archived + sum(sum(day.get(api, {}).values()) for day in self._days().values())
+
+    def estimate_cost(self, api: str = API_CUSTOM_SEARCH, day: Optional[str] = None) -> float:
+        """Coste estimado en USD de un día de Custom Search (100 gratis por proyecto)"""
+        day = day or date.today().isoformat()
+        with self._lock:
+            per_key = dict(self._data.get(day, {}).get(api, {}))
+        return self._cost(per_key)
+
+    def estimate_total_cost(self, api: str = API_CUSTOM_SEARCH) -> float:
+        """Coste estimado acumulado de todos los días registrados"""
+        with self._lock:
+            days = list(self._days().keys())
+            archived = self._data.get(ARCHIVED_KEY, {}).get(api, {}).get('cost', 0.0)
+        return archived + sum(self.estimate_cost(api, day) for day in days)
+
+
+class RateLimiter:
+    """
+    Punto único de control de peticiones a APIs de Google
+
+    Cada API tiene un token bucket global (para Custom Search, el límite
+    MAX_REQUESTS_PER_SECOND del proceso, repartido entre todas las keys) y
+    cada combinación (API, API key) otro con su cuota por minuto; el ledger
+    impone el presupuesto diario de cada key.
+    """
+
+    def __init__(self, ledger: Optional[QuotaLedger] = None, limits: Optional[Dict] = None):
+        self.logger = logging.getLogger(__name__)
+        self.ledger = ledger or QuotaLedger()
+        self.limits = {api: dict(values) for api, values in DEFAULT_LIMITS.items()}
+        self.max_requests_per_second = 0.0
+        self._buckets = {}
+        self._lock = threading.Lock()
+        if limits:
+            self.set_limits(limits)
+
+    def configure(self, config: Dict):
+        """Actualiza los presupuestos a partir del diccionario de configuración"""
+        max_rps = float(config.get('MAX_REQUESTS_PER_SECOND', 0) or 0)
+        if max_rps != self.max_requests_per_second:
+            self.max_requests_per_second = max_rps
+            with self._lock:
+                self._buckets.pop((API_CUSTOM_SEARCH, None), None)
+        self.ledger.free_projects = max(1, int(config.get('CUSTOM_SEARCH_FREE_PROJECTS', 1) or 1))
+        self.set_limits({
+            API_CUSTOM_SEARCH: {
+                'per_minute': config.get('CUSTOM_SEARCH_PER_MINUTE', DEFAULT_LIMITS[API_CUSTOM_SEARCH]['per_minute']),
+                'per_day': config.get('CUSTOM_SEARCH_PER_DAY', DEFAULT_LIMITS[API_CUSTOM_SEARCH]['per_day']),
+            },
+            API_SUGGEST: {
+                'per_minute': config.get('SUGGEST_PER_MINUTE', DEFAULT_LIMITS[API_SUGGEST]['per_minute']),
+                'burst': config.get('SUGGEST_BURST', 0),
+            },
+            API_SEARCH_CONSOLE: {
+                'per_minute': config.get('SEARCH_CONSOLE_PER_MINUTE', DEFAULT_LIMITS[API_SEARCH_CONSOLE]['per_minute']),
+            },
+        })
+
+    def set_limits(self, limits: Dict):
+        """Sustituye presupuestos; solo se recrean los buckets de las APIs que cambian"""
+        with self._lock:
+            for api, values in limits.items():
+                current = self.limits.setdefault(api, {'per_minute': 60, 'per_day': 0})
+                if all(current.get(name) == value for name, value in values.items()):
+                    continue
+                current.update(values)
+                for bucket_key in [k for k in self._buckets if k[0] == api]:
+                    del self._buckets[bucket_key]
+
+    def _get_bucket(self, api: str, key_id: str) -> TokenBucket:
+        """Bucket de la cuota por minuto de una key"""
+        with self._lock:
+            bucket = self._buckets.get((api, key_id))
+            if bucket is None:
+                per_minute = float(self.limits.get(api, {}).get('per_minute', 60))
+                rate = per_minute / 60.0
+                # Ráfaga máxima: un segundo de presupuesto (mínimo 1 petición) o la configurada
+                burst = float(self.limits.get(api, {}).get('burst', 0) or 0)
+                bucket = TokenBucket(rate, capacity=max(1.0, rate, burst))
+                self._buckets[(api, key_id)] = bucket
+            return bucket
+
+    def _get_global_bucket(self, api: str) -> Optional[TokenBucket]:
+        """Bucket compartido por todas las keys de una API (None si no hay límite global)"""
+        if api != API_CUSTOM_SEARCH or self.max_requests_per_second <= 0:
+            return None
+        with self._lock:
+            bucket = self._buckets.get((api, None))
+            if bucket is None:
+                rate = self.max_requests_per_second
+                bucket = TokenBucket(rate, capacity=max(1.0, rate))
+                self._buckets[(api, None)] = bucket
+            return bucket
+
+    def acquire(self, api: str, api_key: Optional[str] = None, stop_callback=None) -> bool:
+        """
+        Reserva una petición para (api, api_key) y la anota en el ledger
+
+        Returns:
+            bool: False si stop_callback pidió detenerse mientras se esperaba
+
+        Raises:
+            QuotaExceededError: si la key ya consumió su presupuesto diario
+        """
+        key_id = key_fingerprint(api_key)
+        per_day = int(self.limits.get(api, {}).get('per_day', 0) or 0)
+        if per_day and self.ledger.get_count(api, key_id) >= per_day:
+            raise QuotaExceededError(f"Presupuesto diario de {api} agotado ({per_day} consultas)")
+
+        if not self._get_bucket(api, key_id).acquire(stop_callback=stop_callback):
+            return False
+        global_bucket = self._get_global_bucket(api)
+        if global_bucket and not global_bucket.acquire(stop_callback=stop_callback):
+            return False
+
+        # Comprobación e incremento atómicos: hilos concurrentes no superan el límite
+        if not self.ledger.record(api, key_id, per_day=per_day):
+            raise QuotaExceededError(f"Presupuesto diario de {api} agotado ({per_day} consultas)")
+        return True
+
+    def penalize(self, api: str, api_key: Optional[str] = None, seconds: float = 5.0):
+        """Pausa el bucket de una key tras una respuesta 429"""
+        self.logger.warning(f"⏳ {api}: pausa de {seconds:.1f}s por rate limiting")
+        self._get_bucket(api, key_fingerprint(api_key)).pause(seconds)
+
+    def remaining_today(self, api: str, api_key: Optional[str] = None) -> Optional[int]:
+        """Consultas que le quedan hoy a una key, o None si no hay límite diario"""
+        per_day = int(self.limits.get(api, {}).get('per_day', 0) or 0)
+        if not per_day:
+            return None
+        return max(0, per_day - self.ledger.get_count(api, key_fingerprint(api_key)))
+
+    def today_count(self, api: str = API_CUSTOM_SEARCH) -> int:
+        """Consultas reales de hoy según el ledger"""
+        return self.ledger.get_count(api)
+
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter(config: Optional[Dict] = None) -> RateLimiter:
+    """Devuelve el limitador compartido del proceso (configurándolo si se pasa config)"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+        if config is not None:
+            _shared_limiter.configure(config)
+        return _shared_limiter
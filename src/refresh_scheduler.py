@@ -0,0 +1,192 @@
+"""
+Planificador de refresco de keywords de un proyecto
+Cada keyword recibe un intervalo de comprobación según la volatilidad de su
+posición en ejecuciones anteriores y sus impresiones en Search Console: las
+estables de cola larga se comprueban semanalmente y las volátiles o con
+muchas impresiones a diario
+"""
+
+import os
+import json
+import math
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from project_manager import ProjectManager
+from utils import normalize_keyword, domain_matches
+
+# Posición que se anota cuando el dominio no aparece en los resultados
+NOT_FOUND_POSITION = 101
+
+
+class RefreshScheduler:
+    """
+    Historial de posiciones por keyword y cálculo de las keywords pendientes
+
+    Args:
+        min_interval_hours: intervalo de las keywords más prioritarias
+        max_interval_hours: intervalo de las keywords estables y sin impresiones
+        volatile_delta: variación media de posición a partir de la cual se
+            considera una keyword totalmente volátil
+        high_impressions: impresiones a partir de las cuales la keyword es
+            de máxima prioridad
+        history_size: posiciones recientes que se conservan por keyword
+        grace_hours: margen con el que una keyword ya cuenta como pendiente;
+            evita que una ejecución programada cada 24h encuentre sin vencer
+            las keywords que la anterior comprobó unos minutos más tarde
+    """
+
+    def __init__(self, project_id: str, project_manager: Optional[ProjectManager] = None,
+                 min_interval_hours: float = 24, max_interval_hours: float = 168,
+                 volatile_delta: float = 3.0, high_impressions: int = 1000, history_size: int = 10,
+                 grace_hours: float = 1.0):
+        self.logger = logging.getLogger(__name__)
+        self.project_id = project_id
+        self.project_manager = project_manager or ProjectManager()
+        self.min_interval_hours = float(min_interval_hours)
+        self.max_interval_hours = max(self.min_interval_hours, float(max_interval_hours))
+        self.volatile_delta = volatile_delta
+        self.high_impressions = high_impressions
+        self.history_size = history_size
+        self.grace_hours = max(0.0, float(grace_hours))
+
+        project = self.project_manager.get_project(project_id) or {}
+        self.domain = (project.get('domain') or '').lower()
+        self.impressions = self._impressions_by_keyword(project.get('search_console_data') or {})
+
+        self.path = os.path.join(str(self.project_manager.get_project_directory(project_id)),
+                                 'refresh_schedule.json')
+        self._lock = threading.Lock()
+        self.history = self._load()
+
+    @classmethod
+    def from_config(cls, project_id: str, config: Dict, project_manager=None) -> 'RefreshScheduler':
+        return cls(
+            project_id, project_manager,
+            min_interval_hours=config.get('REFRESH_MIN_INTERVAL_HOURS', 24),
+            max_interval_hours=config.get('REFRESH_MAX_INTERVAL_HOURS', 168),
+            grace_hours=config.get('REFRESH_GRACE_HOURS', 1),
+        )
+
+    @staticmethod
+    def _impressions_by_keyword(sc_data: Dict) -> Dict[str, int]:
+        """Impresiones por keyword normalizada de los datos de Search Console guardados"""
+        impressions = {}
+        for row in sc_data.get('queries') or []:
+            keyword = row.get('keyword') or row.get('query')
+            if keyword:
+                key = normalize_keyword(keyword)
+                impressions[key] = impressions.get(key, 0) + int(row.get('impressions', 0) or 0)
+        for row in sc_data.get('performance_data') or []:
+            keys = row.get('keys') or []
+            if keys:
+                key = normalize_keyword(keys[0])
+                impressions[key] = impressions.get(key, 0) + int(row.get('impressions', 0) or 0)
+        return impressions
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning(f"Historial de refresco ilegible, se reinicia: {e}")
+            return {}
+
+    def save(self):
+        """Escritura atómica del historial"""
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.history, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def record(self, keyword: str, results: Iterable, checked_at: Optional[datetime] = None) -> bool:
+        """
+        Anota la posición del dominio del proyecto tras comprobar una keyword
+
+        Sin resultados la consulta falló (o se canceló): no se anota nada, para
+        no registrar una caída falsa a NOT_FOUND_POSITION, y la keyword sigue
+        pendiente en la próxima ejecución.
+
+        Returns:
+            bool: True si se actualizó el historial
+        """
+        results = list(results)
+        if not results:
+            return False
+        positions = [r['position'] for r in results
+                     if self.domain and domain_matches(r.get('domain'), self.domain) and r.get('position')]
+        position = min(positions) if positions else NOT_FOUND_POSITION
+        with self._lock:
+            entry = self.history.setdefault(normalize_keyword(keyword), {'positions': []})
+            entry['positions'] = (entry['positions'] + [position])[-self.history_size:]
+            entry['last_checked'] = (checked_at or datetime.now()).isoformat()
+        return True
+
+    def volatility(self, keyword: str) -> Optional[float]:
+        """Variación media de posición entre comprobaciones (None sin historial suficiente)"""
+        with self._lock:
+            positions = self.history.get(normalize_keyword(keyword), {}).get('positions', [])
+        if len(positions) < 2:
+            return None
+        return sum(abs(b - a) for a, b in zip(positions, positions[1:])) / (len(positions) - 1)
+
+    def priority(self, keyword: str) -> float:
+        """Prioridad entre 0 (estable, sin impresiones) y 1 (volátil o con muchas impresiones)"""
+        volatility = self.volatility(keyword)
+        volatility_score = 1.0 if volatility is None else min(1.0, volatility / self.volatile_delta)
+
+        impressions = self.impressions.get(normalize_keyword(keyword), 0)
+        impressions_score = min(1.0, math.log10(1 + impressions) / math.log10(1 + self.high_impressions))
+        return max(volatility_score, impressions_score)
+
+    def interval_hours(self, keyword: str) -> float:
+        """Horas entre comprobaciones de una keyword"""
+        span = self.max_interval_hours - self.min_interval_hours
+        return self.max_interval_hours - self.priority(keyword) * span
+
+    def due_keywords(self, keywords: Iterable[str], now: Optional[datetime] = None) -> List[str]:
+        """
+        Keywords cuyo intervalo de refresco ha vencido
+
+        Las nunca comprobadas siempre están pendientes; el resto vence cuando
+        ha pasado su intervalo menos grace_hours y se ordena de más a menos
+        atrasada respecto a su intervalo.
+        """
+        now = now or datetime.now()
+        grace = timedelta(hours=self.grace_hours)
+        due = []
+        for index, keyword in enumerate(keywords):
+            with self._lock:
+                last_checked = self.history.get(normalize_keyword(keyword), {}).get('last_checked')
+            if not last_checked:
+                due.append((float('inf'), index, keyword))
+                continue
+            elapsed = now - datetime.fromisoformat(last_checked)
+            interval = timedelta(hours=self.interval_hours(keyword))
+            if elapsed + grace >= interval:
+                due.append((elapsed / interval, index, keyword))
+
+        due.sort(key=lambda item: (-item[0], item[1]))
+        return [keyword for _, _, keyword in due]
+
+    def schedule(self, keywords: Iterable[str]) -> List[Dict]:
+        """Estado de refresco de cada keyword (para listados)"""
+        schedule = []
+        for keyword in keywords:
+            with self._lock:
+                entry = dict(self.history.get(normalize_keyword(keyword), {}))
+            volatility = self.volatility(keyword)
+            schedule.append({
+                'keyword': keyword,
+                'interval_hours': round(self.interval_hours(keyword), 1),
+                'volatility': round(volatility, 2) if volatility is not None else None,
+                'impressions': self.impressions.get(normalize_keyword(keyword), 0),
+                'last_checked': entry.get('last_checked'),
+            })
+        return schedule
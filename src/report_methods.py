@@ -5,7 +5,6 @@ Métodos de gestión de reportes para la GUI del scraper de keywords
 import customtkinter as ctk
 from tkinter import messagebox
 import os
-from pathlib import Path
 
 
 class ReportMethods:
@@ -337,26 +336,8 @@ class ReportMethods:
                              f"¿Estás seguro de que deseas eliminar el reporte de la sesión {session_id}?\n\n"
                              f"Esta acción no se puede deshacer."):
             try:
-                reports_dir = Path("reports")
-                deleted_files = 0
-                
-                # Eliminar JSON
-                json_files = list((reports_dir / "json").glob(f"session_{session_id}*.json"))
-                for file_path in json_files:
-                    file_path.unlink()
-                    deleted_files += 1
-                
-                # Eliminar HTML
-                html_files = list((reports_dir / "html").glob(f"report_{session_id}*.html"))
-                for file_path in html_files:
-                    file_path.unlink()
-                    deleted_files += 1
-                
-                # Eliminar imágenes
-                image_files = list((reports_dir / "images").glob(f"*_{session_id}*.png"))
-                for file_path in image_files:
-                    file_path.unlink()
-                    deleted_files += 1
+                # Sesión en el almacén + HTML, imágenes y JSON heredados
+                deleted_files = self.report_manager.delete_session(session_id)
                 
                 self.log_message(f"🗑️ Eliminados {deleted_files} archivos de la sesión {session_id}")
                 
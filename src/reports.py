@@ -1,28 +1,42 @@
 #!/usr/bin/env python3
 """
 📊 Sistema de Reportes Avanzado para Keyword Position Scraper
-🚀 Generación de informes detallados con almacenamiento JSON
+🚀 Generación de informes detallados con almacenamiento SQLite
 
 Características:
 • 📈 Análisis de posiciones y tendencias
-• 💾 Almacenamiento automático en JSON
+• 💾 Almacenamiento automático en SQLite indexado
 • 📋 Reportes HTML y PDF
 • 🎯 Métricas de rendimiento SEO
 • 📊 Visualizaciones interactivas
 """
 
+from __future__ import annotations
+
 import json
 import os
-import pandas as pd
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 import uuid
-from collections import defaultdict, Counter
-import numpy as np
+from result_sink import SessionSummary, iter_results_file
+from results_store import ResultsStore
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# pandas, matplotlib y seaborn se importan bajo demanda: guardar y listar
+# sesiones (CLI, scraper) no debe pagar el coste de cargar la pila de gráficos
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    """mtime en nanosegundos de una ruta, o None si no existe"""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
 
 class ReportManager:
     def __init__(self, data_dir: str = "data", reports_dir: str = "reports"):
@@ -37,12 +51,27 @@ class ReportManager:
         (self.reports_dir / "images").mkdir(exist_ok=True)
         
         self.logger = logging.getLogger(__name__)
-        
-        # Configurar matplotlib para mejor visualización
-        plt.style.use('dark_background')
-        sns.set_palette("husl")
 
-    def save_scraping_session(self, results: List[Dict], session_info: Dict, project_id: str = None) -> str:
+        # Sesiones y resultados en SQLite, abierto al primer uso (ver store)
+        self._store = None
+        self._store_lock = threading.RLock()
+        self._sessions_cache = None
+        # Firma (mtimes) de las carpetas de JSON heredados en la última
+        # sincronización y carpetas reports/ de proyectos conocidas
+        self._json_dirs_synced = None
+        self._project_reports_dirs = None
+
+    @property
+    def store(self) -> ResultsStore:
+        """Almacén de sesiones; al abrirlo se importan los JSON de versiones anteriores"""
+        with self._store_lock:
+            if self._store is None:
+                self._store = ResultsStore(self.reports_dir / "sessions.sqlite")
+                self._sync_json_sessions_if_changed()
+        return self._store
+
+    def save_scraping_session(self, results: List[Dict], session_info: Dict, project_id: str = None,
+                              summary: Optional[Dict] = None, results_file: Optional[str] = None) -> str:
         """
         Guarda una sesión completa de scraping con metadatos
 
@@ -50,6 +79,8 @@ class ReportManager:
             results: Lista de resultados del scraping
             session_info: Información de la sesión (keywords, dominio, etc.)
             project_id: ID del proyecto (opcional)
+            summary: Resumen ya calculado (ResultSink); si se pasa, no se recalcula
+            results_file: Fichero JSONL/JSON con los resultados cuando no se incrustan
 
         Returns:
             str: ID único de la sesión guardada
@@ -57,71 +88,210 @@ class ReportManager:
         session_id = str(uuid.uuid4())[:8]
         timestamp = datetime.now().isoformat()
 
+        if summary is None:
+            session_summary = SessionSummary()
+            session_summary.update(results)
+            summary = session_summary.as_dict()
+
         session_data = {
             "session_id": session_id,
             "timestamp": timestamp,
             "project_id": project_id,
             "session_info": session_info,
-            "results": results,
-            "total_keywords": len(set([r.get('keyword', '') for r in results])),
-            "total_results": len(results),
-            "domains_found": list(set([r.get('domain', '') for r in results if r.get('domain')])),
-            "average_position": self._calculate_average_position(results),
-            "top_10_count": len([r for r in results if r.get('position', 999) <= 10]),
-            "top_3_count": len([r for r in results if r.get('position', 999) <= 3])
+            "total_keywords": summary['total_keywords'],
+            "total_results": summary['total_results'],
+            "domains_found": summary['domains_found'],
+            "average_position": summary['average_position'],
+            "top_10_count": summary['top_10_count'],
+            "top_3_count": summary['top_3_count']
         }
+        if results_file:
+            session_data["results_file"] = results_file
 
-        # Determinar carpeta de guardado
-        if project_id:
-            json_dir = self.reports_dir.parent / "projects" / project_id / "reports" / "json"
-            json_dir.mkdir(parents=True, exist_ok=True)
-        else:
-            json_dir = self.reports_dir / "json"
-
-        # Guardar archivo JSON
-        filename = f"session_{session_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        filepath = json_dir / filename
+        # Sin resultados incrustados se releen del fichero en streaming, para
+        # que también queden indexados por keyword y dominio
+        if not results and results_file and os.path.exists(results_file):
+            results = iter_results_file(results_file)
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(session_data, f, indent=2, ensure_ascii=False)
+        stored = self.store.save_session(session_data, results)
+        self._sessions_cache = None
 
-        self.logger.info(f"✅ Sesión guardada: {filename} (proyecto: {project_id or 'general'})")
+        self.logger.info(f"✅ Sesión guardada: {session_id} con {stored} resultados (proyecto: {project_id or 'general'})")
         return session_id
 
     def load_session(self, session_id: str) -> Optional[Dict]:
-        """Carga una sesión específica por ID"""
-        json_files = list((self.reports_dir / "json").glob(f"session_{session_id}*.json"))
-        
-        if not json_files:
+        """Carga una sesión específica por ID (con sus resultados)"""
+        session_data = self.store.get_session(session_id)
+        if session_data is None:
             return None
-            
-        with open(json_files[0], 'r', encoding='utf-8') as f:
-            return json.load(f)
+
+        session_data["results"] = list(self.store.iter_results(session_id))
+        return session_data
+
+    def load_session_results(self, session_data: Dict) -> List[Dict]:
+        """Resultados de una sesión: incrustados o releídos de su results_file"""
+        if session_data.get("results"):
+            return session_data["results"]
+        results_file = session_data.get("results_file")
+        if results_file and os.path.exists(results_file):
+            return list(iter_results_file(results_file))
+        return []
 
     def get_all_sessions(self) -> List[Dict]:
-        """Obtiene información de todas las sesiones guardadas"""
-        sessions = []
-        json_files = list((self.reports_dir / "json").glob("session_*.json"))
-        
-        for file_path in sorted(json_files, key=lambda x: x.stat().st_mtime, reverse=True):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    sessions.append({
-                        "session_id": data.get("session_id"),
-                        "timestamp": data.get("timestamp"),
-                        "filename": file_path.name,
-                        "total_keywords": data.get("total_keywords", 0),
-                        "total_results": data.get("total_results", 0),
-                        "average_position": data.get("average_position", 0),
-                        "top_10_count": data.get("top_10_count", 0),
-                        "domains_found": len(data.get("domains_found", [])),
-                        "target_domain": data.get("session_info", {}).get("target_domain", "N/A")
-                    })
-            except Exception as e:
-                self.logger.error(f"Error cargando sesión {file_path}: {e}")
-                
-        return sessions
+        """
+        Obtiene información de todas las sesiones guardadas sin proyecto
+
+        Se lee el índice de sesiones del almacén (una fila por sesión, sin
+        tocar resultados) y se memoriza mientras no cambie el mtime del
+        fichero SQLite ni el de las carpetas de JSON heredados; sin cambios,
+        refrescar solo hace stat. Las sesiones de proyectos se consultan
+        desde su proyecto.
+        """
+        self._sync_json_sessions_if_changed()
+        signature = self.store.signature()
+        if self._sessions_cache is None or self._sessions_cache[0] != signature:
+            sessions = []
+            for row in self.store.list_sessions(general_only=True):
+                sessions.append({
+                    "session_id": row["session_id"],
+                    "timestamp": row["timestamp"],
+                    "filename": row["filename"],
+                    "project_id": row["project_id"],
+                    "total_keywords": row["total_keywords"],
+                    "total_results": row["total_results"],
+                    "average_position": row["average_position"],
+                    "top_10_count": row["top_10_count"],
+                    "domains_found": row["domains_count"],
+                    "target_domain": row["target_domain"] or "N/A"
+                })
+            self._sessions_cache = (signature, sessions)
+        return [dict(session) for session in self._sessions_cache[1]]
+
+    def get_keyword_history(self, keyword: str, domain: Optional[str] = None) -> List[Dict]:
+        """Evolución de las posiciones de una keyword en todas las sesiones guardadas"""
+        return self.store.keyword_history(keyword, domain)
+
+    def delete_session(self, session_id: str) -> int:
+        """
+        Elimina una sesión del almacén junto con sus reportes HTML, gráficos y
+        JSON heredados
+
+        Returns:
+            int: elementos eliminados (sesión + archivos)
+        """
+        deleted = 1 if self.store.delete_session(session_id) else 0
+        self._sessions_cache = None
+        return deleted + self._delete_session_files(session_id)
+
+    def rebuild_session_index(self) -> Dict:
+        """
+        Reconstruye el índice de sesiones para dejarlo consistente
+
+        Reimporta todos los JSON heredados (aunque su carpeta no haya cambiado)
+        y recalcula las métricas resumen de cada sesión a partir de sus
+        resultados guardados.
+
+        Returns:
+            Dict: sesiones importadas, sesiones recalculadas y total indexado
+        """
+        imported = self._sync_json_sessions(force=True)
+        rebuilt = self.store.rebuild_summaries()
+        self._sessions_cache = None
+        total = len(self.store.list_sessions())
+        self.logger.info(f"🔄 Índice de sesiones reconstruido: {total} sesiones "
+                         f"({imported} importadas, {rebuilt} recalculadas)")
+        return {"imported": imported, "rebuilt": rebuilt, "sessions": total}
+
+    def _delete_session_files(self, session_id: str) -> int:
+        """Borra los archivos asociados a una sesión (JSON heredado, HTML e imágenes)"""
+        patterns = [(directory, f"session_{session_id}*.json") for directory in self._legacy_json_dirs()]
+        patterns += [(self.reports_dir / "html", f"report_{session_id}*.html"),
+                     (self.reports_dir / "images", f"*_{session_id}*.png")]
+        deleted = 0
+        for directory, pattern in patterns:
+            for file_path in directory.glob(pattern):
+                file_path.unlink()
+                deleted += 1
+        return deleted
+
+    def _legacy_json_dirs(self) -> List[Path]:
+        """Carpetas donde versiones anteriores guardaban un JSON por sesión"""
+        dirs = [self.reports_dir / "json"]
+        dirs += sorted((self.reports_dir.parent / "projects").glob("*/reports/json"))
+        return [directory for directory in dirs if directory.is_dir()]
+
+    def _json_dirs_signature(self) -> Tuple:
+        """
+        mtimes de las carpetas de JSON heredados y de las que pueden llegar a
+        contenerlas; solo hace stat salvo cuando cambia la carpeta projects/
+        """
+        projects_dir = self.reports_dir.parent / "projects"
+        projects_mtime = _mtime_ns(projects_dir)
+        if self._project_reports_dirs is None or self._project_reports_dirs[0] != projects_mtime:
+            self._project_reports_dirs = (projects_mtime, sorted(projects_dir.glob("*/reports")))
+        paths = [self.reports_dir / "json"]
+        for reports in self._project_reports_dirs[1]:
+            paths += [reports, reports / "json"]
+        return (projects_mtime,) + tuple(_mtime_ns(path) for path in paths)
+
+    def _sync_json_sessions_if_changed(self) -> int:
+        """Sincroniza los JSON heredados solo si alguna de sus carpetas cambió desde la última vez"""
+        signature = self._json_dirs_signature()
+        if signature == self._json_dirs_synced:
+            return 0
+        imported = self._sync_json_sessions()
+        self._json_dirs_synced = signature
+        return imported
+
+    def _sync_json_sessions(self, force: bool = False) -> int:
+        """
+        Importa al almacén las sesiones session_*.json de las carpetas heredadas
+
+        Solo se recorren las carpetas cuyo mtime cambió desde la última
+        sincronización (se añadió o borró algún fichero); con force se
+        recorren todas y se reemplazan las sesiones ya importadas.
+
+        Returns:
+            int: sesiones importadas
+        """
+        synced = json.loads(self.store.get_meta("json_dirs_mtime") or "{}")
+        imported = 0
+        changed = False
+        for json_dir in self._legacy_json_dirs():
+            mtime = json_dir.stat().st_mtime_ns
+            if not force and synced.get(str(json_dir)) == mtime:
+                continue
+            for file_path in sorted(json_dir.glob("session_*.json")):
+                if self._import_json_session(file_path, replace=force):
+                    imported += 1
+            synced[str(json_dir)] = mtime
+            changed = True
+
+        if changed:
+            self.store.set_meta("json_dirs_mtime", json.dumps(synced))
+        if imported:
+            self._sessions_cache = None
+            self.logger.info(f"📦 Importadas {imported} sesiones JSON a {self.store.path}")
+        return imported
+
+    def _import_json_session(self, file_path: Path, replace: bool = False) -> bool:
+        """Importa un JSON de sesión heredado; False si ya estaba o no es válido"""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if not data.get("session_id") or (not replace and self.store.has_session(data["session_id"])):
+                return False
+            data.setdefault("timestamp", datetime.fromtimestamp(file_path.stat().st_mtime).isoformat())
+            data["filename"] = file_path.name
+            results = data.get("results") or []
+            results_file = data.get("results_file")
+            if not results and results_file and os.path.exists(results_file):
+                results = iter_results_file(results_file)
+            self.store.save_session(data, results)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error importando sesión {file_path}: {e}")
+            return False
 
     def generate_detailed_report(self, session_id: str) -> Dict:
         """
@@ -137,7 +307,9 @@ class ReportManager:
         if not session_data:
             raise ValueError(f"Sesión {session_id} no encontrada")
         
-        results = session_data["results"]
+        import pandas as pd
+
+        results = self.load_session_results(session_data)
         df = pd.DataFrame(results)
         
         if df.empty:
@@ -337,6 +509,13 @@ class ReportManager:
 
     def _generate_charts(self, df: pd.DataFrame, session_id: str) -> Dict:
         """Genera gráficos y visualizaciones"""
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        # Configurar matplotlib para mejor visualización
+        plt.style.use('dark_background')
+        sns.set_palette("husl")
+
         charts_info = {}
         
         try:
@@ -481,6 +660,13 @@ class ReportManager:
     def cleanup_old_reports(self, days_to_keep: int = 30):
         """Limpia reportes antiguos para ahorrar espacio"""
         cutoff_date = datetime.now() - timedelta(days=days_to_keep)
+
+        removed_sessions = self.store.delete_sessions_before(cutoff_date.isoformat(), general_only=True)
+        self._sessions_cache = None
+        for session_id in removed_sessions:
+            self._delete_session_files(session_id)
+        if removed_sessions:
+            self.logger.info(f"🧹 Eliminadas {len(removed_sessions)} sesiones anteriores a {cutoff_date:%Y-%m-%d}")
         
         for directory in [self.reports_dir / "json", self.reports_dir / "html", self.reports_dir / "images"]:
             for file_path in directory.glob("*"):
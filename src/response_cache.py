@@ -0,0 +1,167 @@
+"""
+Caché persistente de respuestas de APIs en disco (SQLite)
+Entradas con TTL y expulsión LRU cuando se supera el tamaño máximo
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+
+def _default_cache_dir() -> str:
+    """Directorio data/cache en la raíz del proyecto"""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(os.path.dirname(current_dir), 'data', 'cache')
+
+
+class ResponseCache:
+    """Caché clave → JSON con TTL y límite de tamaño (LRU por último acceso)"""
+
+    def __init__(self, name: str, ttl_seconds: float = 86400, max_bytes: int = 50 * 1024 * 1024,
+                 cache_dir: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        cache_dir = cache_dir or _default_cache_dir()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, f"{name}.sqlite")
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL,"
+            " accessed REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_created ON entries(created)")
+        self._conn.commit()
+        # Bytes ocupados: se calcula una vez y se ajusta en cada alta, reemplazo y baja
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Clave estable a partir de los componentes de la petición"""
+        raw = json.dumps([str(p) for p in parts], ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Devuelve el valor cacheado o None si no existe o ha caducado"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created, size FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created, size = row
+            if self.ttl_seconds and now - created > self.ttl_seconds:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total_bytes -= size
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+
+    def set(self, key: str, value: Any):
+        """Guarda un valor y expulsa las entradas menos usadas si hace falta"""
+        payload = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._total_bytes -= self._entry_size(key)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created, accessed, size) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, now, now, len(payload))
+            )
+            self._total_bytes += len(payload)
+            self._evict()
+            self._conn.commit()
+
+    def _entry_size(self, key: str) -> int:
+        row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def _evict(self):
+        """Elimina caducadas y, por LRU, las que excedan max_bytes"""
+        if self.ttl_seconds:
+            # Con el índice por created solo se recorren las caducadas
+            cutoff = time.time() - self.ttl_seconds
+            expired = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries WHERE created < ?", (cutoff,)
+            ).fetchone()[0]
+            if expired:
+                self._conn.execute("DELETE FROM entries WHERE created < ?", (cutoff,))
+                self._total_bytes -= expired
+        if not self.max_bytes or self._total_bytes <= self.max_bytes:
+            return
+        excess = self._total_bytes - self.max_bytes
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed ASC"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self._total_bytes -= freed
+        self.logger.debug(f"Caché {os.path.basename(self.path)}: expulsadas {len(victims)} entradas")
+
+    def delete(self, key: str):
+        """Elimina una entrada concreta"""
+        with self._lock:
+            self._total_bytes -= self._entry_size(key)
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        """Vacía la caché"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def close(self):
+        """Cierra la conexión SQLite (la caché deja de poder usarse)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict:
+        """Número de entradas y bytes ocupados"""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            return {'entries': count, 'bytes': self._total_bytes}
+
+
+_shared_caches: Dict[str, ResponseCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_response_cache(name: str, ttl_seconds: float = 86400, max_bytes: int = 50 * 1024 * 1024,
+                       cache_dir: Optional[str] = None) -> ResponseCache:
+    """
+    Caché compartida del proceso para un fichero (una sola conexión SQLite)
+
+    Varios scrapers o motores de Suggest reutilizan la misma instancia; TTL y
+    tamaño máximo se actualizan con los de la última llamada
+    """
+    path = os.path.join(cache_dir or _default_cache_dir(), f"{name}.sqlite")
+    with _shared_lock:
+        cache = _shared_caches.get(path)
+        if cache is None or cache._conn is None:
+            cache = ResponseCache(name, ttl_seconds, max_bytes, cache_dir)
+            _shared_caches[path] = cache
+        else:
+            cache.ttl_seconds = ttl_seconds
+            cache.max_bytes = max_bytes
+        return cache
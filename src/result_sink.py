@@ -0,0 +1,162 @@
+"""
+Escritura incremental de resultados de scraping
+Los resultados se vuelcan a CSV/JSONL/JSON a medida que llegan y el resumen
+de la sesión se calcula al vuelo, sin mantener todos los resultados en memoria
+"""
+
+import os
+import csv
+import json
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from serp_result import json_default
+
+RESULT_FIELDS = ['keyword', 'position', 'title', 'url', 'domain', 'snippet', 'page']
+
+
+class SessionSummary:
+    """Contadores del resumen de sesión calculados de forma incremental"""
+
+    def __init__(self):
+        self.keywords = set()
+        self.domains = set()
+        self.total_results = 0
+        self.position_sum = 0
+        self.position_count = 0
+        self.top_10_count = 0
+        self.top_3_count = 0
+
+    def update(self, results: Iterable[Dict]):
+        for r in results:
+            self.total_results += 1
+            self.keywords.add(r.get('keyword', ''))
+            if r.get('domain'):
+                self.domains.add(r['domain'])
+            position = r.get('position')
+            if position is None:
+                continue
+            self.position_sum += position
+            self.position_count += 1
+            if position <= 10:
+                self.top_10_count += 1
+                if position <= 3:
+                    self.top_3_count += 1
+
+    @property
+    def average_position(self) -> float:
+        return self.position_sum / self.position_count if self.position_count else 0
+
+    def as_dict(self) -> Dict:
+        """Mismos campos que guarda ReportManager.save_scraping_session"""
+        return {
+            'total_keywords': len(self.keywords),
+            'total_results': self.total_results,
+            'domains_found': sorted(self.domains),
+            'average_position': self.average_position,
+            'top_10_count': self.top_10_count,
+            'top_3_count': self.top_3_count,
+        }
+
+
+class ResultSink:
+    """
+    Destino de resultados en streaming
+
+    Formatos: 'csv', 'jsonl' (un resultado por línea) y 'json' (array con el
+    mismo formato indentado que json.dump; solo es válido tras close()).
+    Los ficheros se crean con el primer resultado recibido.
+    """
+
+    def __init__(self, base_path: str, formats=('csv', 'jsonl'), fieldnames: Optional[List[str]] = None):
+        self.base_path = base_path
+        self.formats = tuple(formats)
+        self.paths = {fmt: f"{base_path}.{fmt}" for fmt in self.formats}
+        self.summary = SessionSummary()
+        self.fieldnames = fieldnames
+
+        self._lock = threading.Lock()
+        self._files = {}
+        self._csv_writer = None
+        self._json_empty = True
+        self.closed = False
+
+    @property
+    def results_file(self) -> Optional[str]:
+        """Fichero desde el que se pueden releer los resultados (JSONL o JSON)"""
+        for fmt in ('jsonl', 'json'):
+            if fmt in self.paths and os.path.exists(self.paths[fmt]):
+                return self.paths[fmt]
+        return None
+
+    def _open(self, first_batch: List[Dict]):
+        os.makedirs(os.path.dirname(os.path.abspath(self.base_path)), exist_ok=True)
+        for fmt, path in self.paths.items():
+            newline = '' if fmt == 'csv' else None
+            self._files[fmt] = open(path, 'w', encoding='utf-8', newline=newline)
+
+        if 'csv' in self._files:
+            fieldnames = self.fieldnames or list(dict.fromkeys(key for r in first_batch for key in r))
+            self._csv_writer = csv.DictWriter(self._files['csv'], fieldnames=fieldnames, extrasaction='ignore')
+            self._csv_writer.writeheader()
+        if 'json' in self._files:
+            self._files['json'].write('[')
+
+    def write(self, results: List[Dict]):
+        """Añade un lote de resultados (p. ej. los de una keyword) y lo vuelca a disco"""
+        if not results:
+            return
+        with self._lock:
+            if self.closed:
+                raise ValueError("ResultSink cerrado")
+            if not self._files:
+                self._open(results)
+
+            self.summary.update(results)
+            if self._csv_writer:
+                self._csv_writer.writerows(results)
+            if 'jsonl' in self._files:
+                self._files['jsonl'].write(
+                    ''.join(json.dumps(r, ensure_ascii=False, default=json_default) + '\n' for r in results)
+                )
+            if 'json' in self._files:
+                self._write_json_items(results)
+
+            for f in self._files.values():
+                f.flush()
+
+    def _write_json_items(self, results: List[Dict]):
+        f = self._files['json']
+        for r in results:
+            item = json.dumps(r, indent=2, ensure_ascii=False, default=json_default).replace('\n', '\n  ')
+            f.write(('\n  ' if self._json_empty else ',\n  ') + item)
+            self._json_empty = False
+
+    def close(self):
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            if 'json' in self._files:
+                self._files['json'].write(']' if self._json_empty else '\n]')
+            for f in self._files.values():
+                f.close()
+            self._files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def iter_results_file(path: str):
+    """Relee resultados de un fichero JSONL (línea a línea) o JSON"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
@@ -0,0 +1,215 @@
+"""
+Almacén de sesiones y resultados en SQLite
+Una fila por sesión con sus métricas resumen y una fila por resultado,
+indexados por sesión, keyword y dominio: listar sesiones es una sola consulta
+y el historial de una keyword no obliga a abrir cada sesión
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from serp_result import SerpResult, json_default
+
+SESSION_SUMMARY_COLUMNS = ('session_id', 'timestamp', 'project_id', 'target_domain', 'total_keywords',
+                           'total_results', 'domains_count', 'average_position', 'top_10_count',
+                           'top_3_count', 'filename')
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS sessions ("
+    " session_id TEXT PRIMARY KEY, timestamp TEXT NOT NULL, project_id TEXT, target_domain TEXT,"
+    " session_info TEXT NOT NULL, total_keywords INTEGER NOT NULL DEFAULT 0,"
+    " total_results INTEGER NOT NULL DEFAULT 0, domains_found TEXT NOT NULL DEFAULT '[]',"
+    " domains_count INTEGER NOT NULL DEFAULT 0, average_position REAL NOT NULL DEFAULT 0,"
+    " top_10_count INTEGER NOT NULL DEFAULT 0, top_3_count INTEGER NOT NULL DEFAULT 0,"
+    " results_file TEXT, filename TEXT)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON sessions(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_project ON sessions(project_id)",
+    "CREATE TABLE IF NOT EXISTS results ("
+    " id INTEGER PRIMARY KEY, session_id TEXT NOT NULL, keyword TEXT, position INTEGER,"
+    " title TEXT, url TEXT, domain TEXT, snippet TEXT)",
+    "CREATE INDEX IF NOT EXISTS idx_results_session ON results(session_id)",
+    "CREATE INDEX IF NOT EXISTS idx_results_keyword ON results(keyword)",
+    "CREATE INDEX IF NOT EXISTS idx_results_domain ON results(domain)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+)
+
+
+def _result_row(session_id: str, result) -> tuple:
+    return (session_id, result.get('keyword'), result.get('position'), result.get('title', ''),
+            result.get('url', ''), result.get('domain', ''), result.get('snippet', ''))
+
+
+class ResultsStore:
+    """Sesiones de scraping y sus resultados en un único fichero SQLite"""
+
+    def __init__(self, path: str):
+        self.logger = logging.getLogger(__name__)
+        self.path = str(path)
+        self._lock = threading.Lock()
+        # GUI y scraper abren cada uno su conexión: esperar al otro en vez de fallar
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    def save_session(self, session: Dict, results: Iterable = ()) -> int:
+        """
+        Guarda la sesión y sus resultados en una sola transacción
+
+        `results` puede ser un generador (p. ej. la relectura de un JSONL): se
+        inserta en streaming sin cargarlo entero en memoria.
+
+        Returns:
+            int: resultados insertados
+        """
+        session_id = session['session_id']
+        domains_found = list(session.get('domains_found') or [])
+        session_info = session.get('session_info') or {}
+        rows = (_result_row(session_id, result) for result in results)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, timestamp, project_id, target_domain, session_info,"
+                " total_keywords, total_results, domains_found, domains_count, average_position, top_10_count,"
+                " top_3_count, results_file, filename) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (session_id, session.get('timestamp'), session.get('project_id'),
+                 session_info.get('target_domain'),
+                 json.dumps(session_info, ensure_ascii=False, default=json_default),
+                 session.get('total_keywords', 0), session.get('total_results', 0),
+                 json.dumps(domains_found, ensure_ascii=False), len(domains_found),
+                 session.get('average_position', 0) or 0, session.get('top_10_count', 0),
+                 session.get('top_3_count', 0), session.get('results_file'),
+                 session.get('filename') or session_info.get('filename'))
+            )
+            self._conn.execute("DELETE FROM results WHERE session_id = ?", (session_id,))
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT INTO results (session_id, keyword, position, title, url, domain, snippet)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            return self._conn.total_changes - before
+
+    def has_session(self, session_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return row is not None
+
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        """Metadatos de una sesión (sin resultados) con el formato clásico del JSON de sesión"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT session_id, timestamp, project_id, session_info, total_keywords, total_results,"
+                " domains_found, average_position, top_10_count, top_3_count, results_file"
+                " FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        session = {
+            'session_id': row[0],
+            'timestamp': row[1],
+            'project_id': row[2],
+            'session_info': json.loads(row[3]),
+            'total_keywords': row[4],
+            'total_results': row[5],
+            'domains_found': json.loads(row[6]),
+            'average_position': row[7],
+            'top_10_count': row[8],
+            'top_3_count': row[9],
+        }
+        if row[10]:
+            session['results_file'] = row[10]
+        return session
+
+    def iter_results(self, session_id: str) -> Iterator[Dict]:
+        """Resultados de una sesión en el orden en que se guardaron"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT keyword, position, title, url, domain, snippet FROM results"
+                " WHERE session_id = ? ORDER BY id", (session_id,)
+            ).fetchall()
+        for keyword, position, title, url, domain, snippet in rows:
+            yield SerpResult(keyword or '', position, title or '', url or '', domain or '', snippet or '').to_dict()
+
+    def list_sessions(self, general_only: bool = False) -> List[Dict]:
+        """Resumen de las sesiones (solo las sin proyecto con general_only), de la más reciente a la más antigua"""
+        where = " WHERE project_id IS NULL" if general_only else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(SESSION_SUMMARY_COLUMNS)} FROM sessions{where} ORDER BY timestamp DESC"
+            ).fetchall()
+        return [dict(zip(SESSION_SUMMARY_COLUMNS, row)) for row in rows]
+
+    def signature(self) -> Tuple[int, int]:
+        """(mtime, tamaño) del fichero: cambia con cualquier escritura, también de otros procesos"""
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def rebuild_summaries(self) -> int:
+        """
+        Recalcula las métricas resumen de cada sesión a partir de sus resultados
+
+        Returns:
+            int: sesiones recalculadas (las que tienen resultados guardados)
+        """
+        with self._lock, self._conn:
+            stats = self._conn.execute(
+                "SELECT session_id, COUNT(DISTINCT keyword), COUNT(*), AVG(position),"
+                " SUM(position <= 10), SUM(position <= 3) FROM results GROUP BY session_id"
+            ).fetchall()
+            domains = defaultdict(list)
+            for session_id, domain in self._conn.execute(
+                    "SELECT DISTINCT session_id, domain FROM results WHERE domain != ''"
+                    " ORDER BY session_id, domain"):
+                domains[session_id].append(domain)
+            self._conn.executemany(
+                "UPDATE sessions SET total_keywords = ?, total_results = ?, average_position = ?,"
+                " top_10_count = ?, top_3_count = ?, domains_found = ?, domains_count = ?"
+                " WHERE session_id = ?",
+                [(keywords, total, average or 0, top_10 or 0, top_3 or 0,
+                  json.dumps(domains[session_id], ensure_ascii=False), len(domains[session_id]), session_id)
+                 for session_id, keywords, total, average, top_10, top_3 in stats]
+            )
+        return len(stats)
+
+    def keyword_history(self, keyword: str, domain: Optional[str] = None) -> List[Dict]:
+        """Posiciones de una keyword (opcionalmente de un dominio) a lo largo de las sesiones"""
+        query = ("SELECT s.session_id, s.timestamp, r.position, r.domain, r.url FROM results r"
+                 " JOIN sessions s ON s.session_id = r.session_id WHERE r.keyword = ?")
+        params = [keyword]
+        if domain:
+            query += " AND r.domain = ?"
+            params.append(domain)
+        query += " ORDER BY s.timestamp, r.position"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(zip(('session_id', 'timestamp', 'position', 'domain', 'url'), row)) for row in rows]
+
+    def delete_session(self, session_id: str) -> bool:
+        """Elimina una sesión y sus resultados; False si no existía"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results WHERE session_id = ?", (session_id,))
+            deleted = self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,)).rowcount
+        return deleted > 0
+
+    def delete_sessions_before(self, timestamp: str, general_only: bool = False) -> List[str]:
+        """Elimina las sesiones anteriores a `timestamp` (ISO), solo las sin proyecto con general_only; devuelve sus IDs"""
+        where = " AND project_id IS NULL" if general_only else ""
+        with self._lock, self._conn:
+            session_ids = [row[0] for row in self._conn.execute(
+                f"SELECT session_id FROM sessions WHERE timestamp < ?{where}", (timestamp,))]
+            self._conn.executemany("DELETE FROM results WHERE session_id = ?", [(sid,) for sid in session_ids])
+            self._conn.executemany("DELETE FROM sessions WHERE session_id = ?", [(sid,) for sid in session_ids])
+        return session_ids
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
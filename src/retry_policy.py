@@ -0,0 +1,210 @@
+"""
+Política de reintentos para las peticiones HTTP salientes
+Backoff exponencial con jitter, soporte de la cabecera Retry-After y un
+presupuesto de reintentos por ejecución para no alargar sin fin un lote
+"""
+
+import time
+import random
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+import requests
+
+# Estados HTTP transitorios que merece la pena reintentar
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Excepciones de red transitorias (requests envuelve las de urllib3)
+TRANSIENT_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                        requests.exceptions.ChunkedEncodingError, requests.exceptions.ContentDecodingError,
+                        ConnectionError, TimeoutError)
+
+
+class RetryableError(Exception):
+    """Fallo transitorio (429, 5xx, timeout...) que admite reintento"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """Segundos indicados por Retry-After (número o fecha HTTP), o None"""
+    if value is None or value == '':
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def classify_exception(error: Exception) -> Optional[RetryableError]:
+    """Convierte una excepción transitoria en RetryableError (None si no lo es)"""
+    if isinstance(error, RetryableError):
+        return error
+
+    # Timeouts y errores de red de requests, incluidas sus subclases (SSLError,
+    # ProxyError, ConnectTimeout...); InvalidURL y similares no se reintentan
+    if isinstance(error, TRANSIENT_EXCEPTIONS):
+        return RetryableError(str(error))
+
+    # HttpError de googleapiclient (Search Console): expone resp.status
+    resp = getattr(error, 'resp', None)
+    status = getattr(resp, 'status', None)
+    if status is not None and int(status) in RETRYABLE_STATUS:
+        retry_after = resp.get('retry-after') if hasattr(resp, 'get') else None
+        return RetryableError(str(error), parse_retry_after(retry_after))
+    return None
+
+
+class RetryPolicy:
+    """
+    Decide cuánto esperar antes de cada reintento y lleva la cuenta
+
+    Args:
+        max_attempts: intentos totales por petición (1 = sin reintentos)
+        base_delay: espera del primer reintento, se duplica en cada intento
+        max_delay: tope de cada espera (también para Retry-After)
+        jitter: espera aleatoria entre 0 y el backoff ("full jitter")
+        budget: reintentos permitidos en toda la ejecución (0 = sin límite)
+    """
+
+    def __init__(self, max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 60.0,
+                 jitter: bool = True, budget: int = 0):
+        self.logger = logging.getLogger(__name__)
+        self.jitter = jitter
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._set_limits(max_attempts, base_delay, max_delay, budget)
+        self.reset()
+
+    def _set_limits(self, max_attempts, base_delay, max_delay, budget):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = max(0.0, float(base_delay))
+        self.max_delay = max(self.base_delay, float(max_delay))
+        self.budget = max(0, int(budget))
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'RetryPolicy':
+        return cls(
+            max_attempts=config.get('RETRY_MAX_ATTEMPTS', 5),
+            base_delay=config.get('RETRY_BASE_DELAY', 1.0),
+            max_delay=config.get('RETRY_MAX_DELAY', 60.0),
+            budget=config.get('RETRY_BUDGET', 0),
+        )
+
+    def configure(self, config: Dict):
+        """Aplica los límites de la configuración conservando contadores y presupuesto consumido"""
+        with self._lock:
+            self._set_limits(config.get('RETRY_MAX_ATTEMPTS', 5), config.get('RETRY_BASE_DELAY', 1.0),
+                             config.get('RETRY_MAX_DELAY', 60.0), config.get('RETRY_BUDGET', 0))
+
+    def reset(self):
+        """Reinicia presupuesto y contadores (al empezar una ejecución)"""
+        with self._lock:
+            self.stats = {'retries': 0, 'retry_wait_seconds': 0.0, 'retries_given_up': 0,
+                          'retry_budget_exhausted': 0}
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+        stats['retry_wait_seconds'] = round(stats['retry_wait_seconds'], 2)
+        return stats
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Espera antes del reintento número `attempt` (1 = primer reintento)"""
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def next_delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Reserva un reintento tras el intento fallido número `attempt`
+
+        Returns:
+            float: segundos a esperar, o None si no quedan intentos o presupuesto
+        """
+        with self._lock:
+            if attempt >= self.max_attempts:
+                self.stats['retries_given_up'] += 1
+                return None
+            if self.budget and self.stats['retries'] >= self.budget:
+                self.stats['retry_budget_exhausted'] += 1
+                return None
+            delay = self.backoff(attempt, retry_after)
+            self.stats['retries'] += 1
+            self.stats['retry_wait_seconds'] += delay
+            return delay
+
+    @staticmethod
+    def sleep(seconds: float, stop_callback=None) -> bool:
+        """Espera en intervalos cortos. Devuelve False si stop_callback pide parar"""
+        deadline = time.monotonic() + seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            if stop_callback and stop_callback():
+                return False
+            time.sleep(min(remaining, 0.1))
+
+    def call(self, func: Callable, description: str = 'petición', stop_callback=None):
+        """
+        Ejecuta func() reintentando fallos transitorios
+
+        Si func devuelve una respuesta con status_code reintentable se repite;
+        tras el último intento se devuelve tal cual para que la trate el llamador.
+        Las excepciones no transitorias, o agotados los intentos, se propagan.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            error = result = None
+            try:
+                result = func()
+            except Exception as e:
+                retryable = classify_exception(e)
+                if retryable is None:
+                    raise
+                error, reason, retry_after = e, str(e), retryable.retry_after
+            else:
+                status = getattr(result, 'status_code', None)
+                if status not in RETRYABLE_STATUS:
+                    return result
+                headers = getattr(result, 'headers', None) or {}
+                reason, retry_after = f"HTTP {status}", parse_retry_after(headers.get('Retry-After'))
+
+            delay = self.next_delay(attempt, retry_after)
+            if delay is not None:
+                self.logger.warning(f"🔁 {description}: {reason} - reintento {attempt} en {delay:.1f}s")
+            # Sin reintentos o cancelada durante la espera: se entrega el último fallo
+            if delay is None or not self.sleep(delay, stop_callback):
+                if error is not None:
+                    raise error
+                return result
+
+
+_shared_policy = None
+_shared_lock = threading.Lock()
+
+
+def get_retry_policy(config: Optional[Dict] = None) -> RetryPolicy:
+    """Política compartida para los clientes sin ejecución propia (GUI, Search Console)
+
+    Se crea una sola vez; pasar config solo actualiza sus límites, de modo que
+    quien ya tiene una referencia sigue compartiendo contadores y presupuesto
+    """
+    global _shared_policy
+    with _shared_lock:
+        if _shared_policy is None:
+            _shared_policy = RetryPolicy.from_config(config or {})
+        elif config is not None:
+            _shared_policy.configure(config)
+        return _shared_policy
@@ -0,0 +1,228 @@
+"""
+Diario de ejecución (journal) para sesiones de scraping reanudables
+Cada keyword completada se añade a un fichero JSONL append-only con fsync por
+lote, de modo que un cierre inesperado o el fin de la cuota diaria no pierden
+los resultados ya obtenidos
+"""
+
+import os
+import json
+import uuid
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from serp_result import json_default
+
+
+def _default_runs_dir() -> str:
+    """Directorio data/runs en la raíz del proyecto"""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(os.path.dirname(current_dir), 'data', 'runs')
+
+
+class RunJournal:
+    """
+    Journal append-only de una ejecución identificada por run_id
+
+    Formato (una línea JSON por registro):
+        {"type": "run", ...metadatos de la ejecución}
+        {"type": "keyword", "keyword": "...", "results": [...]}
+        {"type": "end", "finished_at": "..."}
+    """
+
+    def __init__(self, run_id: Optional[str] = None, runs_dir: Optional[str] = None, batch_size: int = 10):
+        self.logger = logging.getLogger(__name__)
+        self.run_id = run_id or f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        self.runs_dir = runs_dir or _default_runs_dir()
+        self.path = os.path.join(self.runs_dir, f"{self.run_id}.jsonl")
+        self.batch_size = max(1, batch_size)
+
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._file = None
+        # Metadatos, keywords completadas y fin: se leen del disco una sola vez
+        self._state = None
+
+    @property
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _open(self):
+        if self._file is None:
+            os.makedirs(self.runs_dir, exist_ok=True)
+            self._repair_tail()
+            self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _repair_tail(self):
+        """Recorta la última línea a medio escribir (cierre inesperado) para no pegarle el siguiente registro"""
+        if not self.exists:
+            return
+        with open(self.path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            if not size:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return
+            # Buscar hacia atrás el último salto de línea completo
+            position = size
+            while position > 0:
+                chunk_start = max(0, position - 4096)
+                f.seek(chunk_start)
+                chunk = f.read(position - chunk_start)
+                newline = chunk.rfind(b'\n')
+                if newline >= 0:
+                    f.truncate(chunk_start + newline + 1)
+                    break
+                position = chunk_start
+            else:
+                f.truncate(0)
+        self.logger.warning(f"Journal {self.run_id}: descartada una línea incompleta al final")
+
+    def _load_state(self) -> Dict:
+        """Estado del journal leído del disco en una sola pasada (después se mantiene en memoria)"""
+        if self._state is None:
+            state = {'metadata': None, 'completed': set(), 'finished': False}
+            for record in self._iter_records():
+                self._apply(state, record)
+            self._state = state
+        return self._state
+
+    @staticmethod
+    def _apply(state: Dict, record: Dict):
+        record_type = record.get('type')
+        if record_type == 'run' and state['metadata'] is None:
+            state['metadata'] = record
+        elif record_type == 'keyword':
+            state['completed'].add(record['keyword'])
+        elif record_type == 'end':
+            state['finished'] = True
+
+    def _append(self, record: Dict, force_flush: bool = False):
+        with self._lock:
+            self._apply(self._load_state(), record)
+            self._buffer.append(json.dumps(record, ensure_ascii=False, default=json_default))
+            if force_flush or len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        self._open()
+        self._file.write('\n'.join(self._buffer) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._buffer = []
+
+    def start(self, keywords: List[str], target_domain: Optional[str] = None, pages: int = 1,
+              project_id: Optional[str] = None, extra: Optional[Dict] = None):
+        """Registra los metadatos de la ejecución (solo si el journal es nuevo)"""
+        if self.exists and self.read_metadata():
+            return
+        metadata = {
+            'type': 'run',
+            'run_id': self.run_id,
+            'created_at': datetime.now().isoformat(),
+            'keywords': list(keywords),
+            'target_domain': target_domain,
+            'pages': pages,
+            'project_id': project_id,
+        }
+        if extra:
+            metadata.update(extra)
+        self._append(metadata, force_flush=True)
+
+    def record_keyword(self, keyword: str, results: List[Dict]):
+        """Añade los resultados de una keyword completada"""
+        self._append({'type': 'keyword', 'keyword': keyword, 'results': results})
+
+    def finish(self):
+        """Marca la ejecución como terminada y cierra el fichero"""
+        self._append({'type': 'end', 'finished_at': datetime.now().isoformat()}, force_flush=True)
+        self.close()
+
+    def flush(self):
+        """Fuerza la escritura (y fsync) del lote pendiente"""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _iter_records(self):
+        """Lee el journal tolerando una última línea truncada"""
+        if not self.exists:
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    self.logger.warning(f"Línea corrupta ignorada en journal {self.run_id}")
+
+    def read_metadata(self) -> Optional[Dict]:
+        with self._lock:
+            return self._load_state()['metadata']
+
+    def completed_keywords(self) -> Set[str]:
+        """Keywords ya completadas en esta ejecución"""
+        with self._lock:
+            return set(self._load_state()['completed'])
+
+    def iter_keyword_results(self):
+        """Genera (keyword, resultados) de cada keyword completada, en orden de finalización"""
+        for record in self._iter_records():
+            if record.get('type') == 'keyword':
+                yield record['keyword'], record.get('results', [])
+
+    def load_results(self) -> List[Dict]:
+        """Todos los resultados guardados, en orden de finalización"""
+        results = []
+        for _, keyword_results in self.iter_keyword_results():
+            results.extend(keyword_results)
+        return results
+
+    def is_finished(self) -> bool:
+        with self._lock:
+            return self._load_state()['finished']
+
+    @classmethod
+    def list_runs(cls, runs_dir: Optional[str] = None) -> List[Dict]:
+        """Resumen de todas las ejecuciones registradas (más recientes primero)"""
+        runs_dir = runs_dir or _default_runs_dir()
+        if not os.path.isdir(runs_dir):
+            return []
+
+        runs = []
+        for filename in os.listdir(runs_dir):
+            if not filename.endswith('.jsonl'):
+                continue
+            journal = cls(filename[:-len('.jsonl')], runs_dir)
+            metadata = journal.read_metadata() or {}
+            runs.append({
+                'run_id': journal.run_id,
+                'created_at': metadata.get('created_at'),
+                'target_domain': metadata.get('target_domain'),
+                'total_keywords': len(metadata.get('keywords', [])),
+                'completed_keywords': len(journal.completed_keywords()),
+                'finished': journal.is_finished(),
+                'mtime': os.path.getmtime(journal.path),
+            })
+        return sorted(runs, key=lambda r: r['mtime'], reverse=True)
+
+    @classmethod
+    def latest_unfinished(cls, runs_dir: Optional[str] = None) -> Optional['RunJournal']:
+        """Journal de la ejecución interrumpida más reciente, si existe"""
+        for run in cls.list_runs(runs_dir):
+            if not run['finished']:
+                return cls(run['run_id'], runs_dir)
+        return None
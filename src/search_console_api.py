@@ -9,6 +9,8 @@ from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import Flow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from rate_limiter import get_rate_limiter, API_SEARCH_CONSOLE
+from retry_policy import get_retry_policy
 
 class SearchConsoleAPI:
     """Cliente para la API de Google Search Console"""
@@ -219,7 +221,11 @@ class SearchConsoleAPI:
                     raise Exception("No autenticado con Search Console")
 
             self.logger.info("Obteniendo lista de sitios...")
-            sites = self.service.sites().list().execute()
+            def list_sites():
+                get_rate_limiter().acquire(API_SEARCH_CONSOLE)
+                return self.service.sites().list().execute()
+
+            sites = get_retry_policy().call(list_sites, 'Search Console sites.list')
             site_list = sites.get('siteEntry', [])
             self.logger.info(f"Obtenidos {len(site_list)} sitios")
             return site_list
@@ -260,10 +266,14 @@ class SearchConsoleAPI:
                 }]
 
             self.logger.info(f"Obteniendo analytics para {site_url} ({start_date} a {end_date})")
-            response = self.service.searchanalytics().query(
-                siteUrl=site_url,
-                body=request_body
-            ).execute()
+            def query_analytics():
+                get_rate_limiter().acquire(API_SEARCH_CONSOLE)
+                return self.service.searchanalytics().query(
+                    siteUrl=site_url,
+                    body=request_body
+                ).execute()
+
+            response = get_retry_policy().call(query_analytics, 'Search Console searchanalytics.query')
 
             rows_count = len(response.get('rows', []))
             self.logger.info(f"Obtenidos {rows_count} registros de analytics")
@@ -25,6 +25,8 @@ from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import Flow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from rate_limiter import get_rate_limiter, API_SEARCH_CONSOLE
+from retry_policy import get_retry_policy
 
 
 class ImprovedSearchConsoleAuth:
@@ -396,7 +398,11 @@ class ImprovedSearchConsoleAuth:
                     raise Exception("No autenticado")
 
             self.logger.info("Obteniendo sitios verificados desde API...")
-            response = self.service.sites().list().execute()
+            def list_sites():
+                get_rate_limiter().acquire(API_SEARCH_CONSOLE, self.current_account_id)
+                return self.service.sites().list().execute()
+
+            response = get_retry_policy().call(list_sites, 'Search Console sites.list')
             sites = response.get('siteEntry', [])
 
             # Guardar en caché
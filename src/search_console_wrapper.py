@@ -10,6 +10,8 @@ from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from search_console_auth_improved import ImprovedSearchConsoleAuth
 from googleapiclient.errors import HttpError
+from rate_limiter import get_rate_limiter, API_SEARCH_CONSOLE
+from retry_policy import get_retry_policy
 
 
 class SearchConsoleAPI:
@@ -123,10 +125,14 @@ class SearchConsoleAPI:
 
             self.logger.info(f"Obteniendo analytics para {site_url} ({start_date} a {end_date})")
 
-            response = service.searchanalytics().query(
-                siteUrl=site_url,
-                body=request_body
-            ).execute()
+            def query_analytics():
+                get_rate_limiter().acquire(API_SEARCH_CONSOLE, self._auth.current_account_id)
+                return service.searchanalytics().query(
+                    siteUrl=site_url,
+                    body=request_body
+                ).execute()
+
+            response = get_retry_policy().call(query_analytics, 'Search Console searchanalytics.query')
 
             rows_count = len(response.get('rows', []))
             self.logger.info(f"✅ Obtenidos {rows_count} registros")
@@ -0,0 +1,69 @@
+"""
+Registro compacto de un resultado SERP
+Sustituye al dict de 7 claves por un objeto con __slots__ y cadenas de keyword
+y dominio internadas; se comporta como un Mapping de solo lectura, así que el
+código que usa r['position'] o r.get('domain') sigue funcionando
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Dict, Optional
+
+SERP_RESULT_FIELDS = ('keyword', 'position', 'title', 'url', 'domain', 'snippet', 'page')
+
+
+class SerpResult(Mapping):
+    """Resultado de una posición en Google (vista dict con to_dict())"""
+
+    __slots__ = ('keyword', 'position', 'title', 'url', 'domain', 'snippet')
+
+    def __init__(self, keyword: str, position: Optional[int], title: str = '', url: str = '',
+                 domain: str = '', snippet: str = ''):
+        # Miles de resultados comparten keyword y dominio: una sola copia de cada cadena
+        self.keyword = sys.intern(keyword)
+        self.position = position
+        self.title = title
+        self.url = url
+        self.domain = sys.intern(domain)
+        self.snippet = snippet
+
+    @property
+    def page(self) -> Optional[int]:
+        """Página de resultados, derivada de la posición"""
+        if self.position is None:
+            return None
+        return ((self.position - 1) // 10) + 1
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SerpResult':
+        return cls(data.get('keyword', ''), data.get('position'), data.get('title', ''),
+                   data.get('url', ''), data.get('domain', ''), data.get('snippet', ''))
+
+    def to_dict(self) -> Dict:
+        """Dict equivalente al formato clásico de resultados"""
+        return {field: getattr(self, field) for field in SERP_RESULT_FIELDS}
+
+    def copy(self) -> Dict:
+        """Como dict.copy(): devuelve un dict modificable"""
+        return self.to_dict()
+
+    def __getitem__(self, key):
+        if key in SERP_RESULT_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(SERP_RESULT_FIELDS)
+
+    def __len__(self):
+        return len(SERP_RESULT_FIELDS)
+
+    def __repr__(self):
+        return f"SerpResult(keyword={self.keyword!r}, position={self.position!r}, domain={self.domain!r})"
+
+
+def json_default(obj):
+    """Hook `default` de json.dump para serializar SerpResult como dict"""
+    if isinstance(obj, SerpResult):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -1,20 +1,77 @@
-import random
 import time
 import json
 import logging
-import requests
-from urllib.parse import quote_plus, urlparse
-import pandas as pd
+from urllib.parse import urlparse
 from tqdm import tqdm
 import os
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed, FIRST_COMPLETED
 from reports import ReportManager
+import threading
+from rate_limiter import get_rate_limiter, QuotaExceededError, API_CUSTOM_SEARCH
+from response_cache import ResponseCache, get_response_cache
+from run_journal import RunJournal
+from result_sink import ResultSink
+from serp_result import SerpResult
+from credential_pool import CredentialPool
+from retry_policy import RetryPolicy, RetryableError, classify_exception, parse_retry_after
+from pacing import AdaptivePacer
+from utils import KeywordManager, domain_matches, normalize_keyword
+from http_client import get_http_session, get_pool_stats
+from suggest_engine import SuggestEngine
+
+CUSTOM_SEARCH_ENDPOINT = 'https://www.googleapis.com/customsearch/v1'
+
+# Respuesta parcial de Custom Search: solo los campos que lee serp_scraper_api
+# (queries.nextPage indica si quedan más páginas)
+CUSTOM_SEARCH_FIELDS = 'items(link,title,snippet),queries(nextPage(startIndex))'
+
+# Claves de configuración que nunca se guardan en los reportes de sesión
+SECRET_CONFIG_MARKERS = ('API_KEY', 'CREDENTIALS', 'SECRET', 'TOKEN', 'PASSWORD')
+
+
+def public_config(config):
+    """Copia de la configuración sin API keys ni otros secretos"""
+    return {name: value for name, value in config.items()
+            if not any(marker in name.upper() for marker in SECRET_CONFIG_MARKERS)}
+
 
 class StealthSerpScraper:
     def __init__(self, config):
         self.config = config
-        self.session = requests.Session()
+        # Pool de conexiones keep-alive compartido por todo el proceso
+        self.session = get_http_session(config)
         self.results = []
 
+        # Limitador compartido por todos los clientes de APIs de Google
+        self.rate_limiter = get_rate_limiter(config)
+
+        # Pool de API keys de Custom Search con failover cuando una agota su cuota
+        self.credential_pool = CredentialPool.from_config(config, self.rate_limiter)
+
+        # Reintentos con backoff exponencial; el presupuesto se reinicia en cada ejecución
+        self.retry_policy = RetryPolicy.from_config(config)
+
+        # Delay entre keywords que se adapta a cómo responde la API
+        self.pacer = AdaptivePacer.from_config(config)
+
+        # Google Suggest: variaciones en paralelo sobre el mismo pool y limitador
+        self.suggest_engine = SuggestEngine.from_config(config, self.session, self.rate_limiter, self.retry_policy)
+
+        # Caché persistente de respuestas SERP (ahorra cuota en re-ejecuciones)
+        self.serp_cache = None
+        if config.get('SERP_CACHE_ENABLED', True):
+            self.serp_cache = get_response_cache(
+                'serp_cache',
+                ttl_seconds=float(config.get('SERP_CACHE_TTL_HOURS', 24)) * 3600,
+                max_bytes=int(float(config.get('SERP_CACHE_MAX_MB', 50)) * 1024 * 1024)
+            )
+
+        # Estadísticas de la sesión (peticiones reales, aciertos de caché...)
+        self.stats = {'api_requests': 0, 'cache_hits': 0, 'find_first_pages_saved': 0, 'rate_limited': 0,
+                      'api_pages_ok': 0, 'response_bytes': 0, 'response_bytes_decoded': 0, 'json_parse_ms': 0.0}
+        self._stats_lock = threading.Lock()
+        self.quota_exhausted = False
+
         # Crear directorios necesarios
         current_dir = os.path.dirname(os.path.abspath(__file__))
         parent_dir = os.path.dirname(current_dir)
@@ -43,22 +100,302 @@ class StealthSerpScraper:
     def get_google_api_headers(self):
         """Headers para llamadas a Google API"""
         return {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            # Google solo comprime si el User-Agent incluye "gzip"
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (gzip)',
             'Accept': 'application/json',
+            'Accept-Encoding': 'gzip',
             'Accept-Language': 'en-US,en;q=0.9',
             'Connection': 'keep-alive',
         }
 
-    def serp_scraper_api(self, keyword, target_domain=None, pages=1):
-        """Scraper de posiciones usando SOLAMENTE Google Custom Search API"""
-        results = []
+    def _count_stat(self, name, amount=1):
+        """Incrementa un contador de estadísticas de sesión (thread-safe)"""
+        with self._stats_lock:
+            self.stats[name] = self.stats.get(name, 0) + amount
+
+    def get_session_stats(self):
+        """Copia de las estadísticas de la sesión actual"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats.update(self.retry_policy.get_stats())
+        stats.update(self.suggest_engine.get_stats())
+        stats['json_parse_ms'] = round(stats['json_parse_ms'], 2)
+        if stats['api_pages_ok']:
+            stats['bytes_per_page'] = round(stats['response_bytes'] / stats['api_pages_ok'])
+            stats['json_parse_ms_per_page'] = round(stats['json_parse_ms'] / stats['api_pages_ok'], 3)
+        stats['http_pool'] = get_pool_stats()
+        return stats
+
+    def _parse_api_response(self, response):
+        """JSON de una respuesta 200 midiendo bytes transferidos y tiempo de parseo"""
+        content = response.content
+        wire_bytes = response.headers.get('Content-Length')
+        started = time.perf_counter()
+        data = json.loads(content)
+        parse_ms = (time.perf_counter() - started) * 1000
+
+        with self._stats_lock:
+            self.stats['api_pages_ok'] += 1
+            self.stats['response_bytes'] += int(wire_bytes) if wire_bytes else len(content)
+            self.stats['response_bytes_decoded'] += len(content)
+            self.stats['json_parse_ms'] += parse_ms
+        return data
+
+    @staticmethod
+    def _serp_cache_key(search_engine_id, params):
+        """Clave de caché de una página: cada credencial puede usar su propio motor (cx)"""
+        return ResponseCache.make_key(search_engine_id, params['q'], params['gl'], params['hl'],
+                                      params['start'], params['num'], params.get('fields', ''))
+
+    def _cached_page(self, params):
+        """Página cacheada por alguno de los motores del pool (en su orden), o None"""
+        for search_engine_id in self.credential_pool.search_engine_ids():
+            cached = self.serp_cache.get(self._serp_cache_key(search_engine_id, params))
+            if cached is not None:
+                return cached
+        return None
+
+    def _throttle_count(self):
+        """429 y reintentos acumulados: si cambian durante una keyword, la API pide frenar"""
+        return self.stats.get('rate_limited', 0) + self.retry_policy.get_stats()['retries']
+
+    def _fetch_serp_page(self, params, force_refresh=False, cancel_check=None):
+        """
+        Obtiene una página de Custom Search, primero de la caché y si no de la API
+
+        La caché se consulta antes de elegir credencial: una página cacheada se
+        sirve aunque todas las keys estén agotadas y no ocupa ninguna.
+
+        Returns:
+            tuple: (data, estado) donde estado es 'ok', 'stop' o 'cancelled'
+            (cancel_check pidió abandonar mientras se esperaba turno)
+
+        Raises:
+            RetryableError: 429 o 5xx; los timeouts de requests se propagan tal cual
+        """
+        if self.serp_cache and not force_refresh:
+            cached = self._cached_page(params)
+            if cached is not None:
+                self._count_stat('cache_hits')
+                return cached, 'ok'
+
+        # Elegir credencial; si una key agota su cuota se pasa a la siguiente
+        while True:
+            credential = self.credential_pool.acquire()
+            if credential is None:
+                self.logger.error("🚫 Todas las API keys han agotado su cuota de hoy")
+                self.quota_exhausted = True
+                return None, 'stop'
+
+            # Reservar hueco en el presupuesto de la API key
+            try:
+                if not self.rate_limiter.acquire(API_CUSTOM_SEARCH, credential.api_key, stop_callback=cancel_check):
+                    return None, 'cancelled'
+            except QuotaExceededError as e:
+                self.logger.warning(f"🚫 {e}")
+                self.credential_pool.mark_exhausted(credential)
+                continue
+
+            # Hacer la petición
+            request_params = dict(params, key=credential.api_key, cx=credential.search_engine_id)
+            headers = self.get_google_api_headers()
+            response = self.session.get(
+                self.config.get('GOOGLE_API_ENDPOINT') or CUSTOM_SEARCH_ENDPOINT,
+                params=request_params,
+                headers=headers,
+                timeout=15
+            )
+            self._count_stat('api_requests')
+
+            if response.status_code == 403:
+                data = response.json()
+                error_msg = data.get('error', {}).get('message', '')
+
+                if "DAILY_LIMIT_EXCEEDED" in error_msg or "quota" in error_msg.lower():
+                    self.logger.warning(f"🚫 Cuota de Google API agotada para la key {credential.key_id}")
+                    self.credential_pool.mark_exhausted(credential)
+                    continue
+
+                self.logger.error(f"🚫 Error de autenticación Google API: {error_msg}")
+                return None, 'stop'
+            break
+
+        if response.status_code == 200:
+            data = self._parse_api_response(response)
+            if self.serp_cache:
+                self.serp_cache.set(self._serp_cache_key(credential.search_engine_id, params), data)
+            return data, 'ok'
+
+        elif response.status_code == 429:
+            self._count_stat('rate_limited')
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            self.rate_limiter.penalize(API_CUSTOM_SEARCH, credential.api_key,
+                                       retry_after if retry_after is not None else 5)
+            raise RetryableError("Rate limiting de Google API (HTTP 429)", retry_after)
+
+        elif response.status_code >= 500:
+            raise RetryableError(f"Error HTTP {response.status_code} en API de Google")
+
+        self.logger.error(f"❌ Error HTTP {response.status_code} en API de Google")
+        return None, 'stop'
+
+    def _fetch_page_with_retry(self, params, force_refresh=False, cancel_check=None):
+        """
+        Descarga una página reintentando fallos transitorios según retry_policy
+
+        Returns:
+            tuple: (data, cancelada). data es None si la página falla o se cancela;
+            cancelada indica que no llegó a hacerse ninguna petición a la API
+        """
+        attempt = 0
+        while True:
+            if cancel_check and cancel_check():
+                return None, attempt == 0
+            attempt += 1
+            try:
+                data, status = self._fetch_serp_page(params, force_refresh, cancel_check)
+            except Exception as e:
+                retryable = classify_exception(e)
+                delay = self.retry_policy.next_delay(attempt, retryable.retry_after) if retryable else None
+                if delay is None:
+                    self.logger.error(f"❌ Error al consultar Google API (start={params['start']}): {e}")
+                    return None, False
+                self.logger.warning(f"🔁 {e} (start={params['start']}) - reintento {attempt} en {delay:.1f}s")
+                if not self.retry_policy.sleep(delay, cancel_check):
+                    return None, False
+                continue
+
+            if status == 'ok':
+                return data, False
+            return None, status == 'cancelled' and attempt == 1
+
+    @staticmethod
+    def _is_last_page(data):
+        """
+        Una página fallida, sin resultados o sin queries.nextPage es la última
+
+        Custom Search devuelve a menudo páginas con menos de `num` resultados
+        que aún tienen siguiente página: el tamaño no sirve como señal de fin.
+        """
+        if data is None or not data.get('items'):
+            return True
+        return not data.get('queries', {}).get('nextPage')
+
+    def _fetch_serp_pages(self, params_list, force_refresh=False, stop_check=None):
+        """
+        Descarga las páginas de una keyword en paralelo (dentro del rate limiter)
+
+        Cuando una página indica el final de los resultados, o stop_check(data)
+        devuelve True (modo find-first), se cancelan las páginas posteriores que
+        aún no han salido (en cola o esperando turno en el rate limiter). Con
+        stop_check la primera página se pide sola y las demás solo salen si no
+        contiene el objetivo: así un acierto en la página 1 cuesta una consulta.
+
+        Returns:
+            tuple: (pages, saved, complete) donde pages son pares (params, data)
+            en orden de posición, cortados en la página final, saved el número
+            de páginas que nunca llegaron a pedirse a la API gracias a stop_check
+            y complete es False si alguna página falló (reintentos agotados,
+            cuota o error de autenticación) y los resultados están incompletos
+        """
+        max_workers = min(len(params_list), max(1, int(self.config.get('MAX_PAGE_CONCURRENCY', 3))))
+        fetched = [None] * len(params_list)
+        skipped = [True] * len(params_list)  # Páginas que no llegaron a pedirse a la API
+        end_index = len(params_list) - 1
+        end_marker = [end_index]  # Compartido con los hilos para cancelar páginas sobrantes
+        stopped_by_check = False
+
+        def is_final(index):
+            nonlocal stopped_by_check
+            if self._is_last_page(fetched[index]):
+                return True
+            if stop_check and stop_check(fetched[index]):
+                stopped_by_check = True
+                return True
+            return False
+
+        # Páginas que se piden una a una antes de abrir el paralelismo
+        sequential = len(params_list) if max_workers <= 1 else (1 if stop_check else 0)
+        finished = False
+        for index in range(sequential):
+            fetched[index], skipped[index] = self._fetch_page_with_retry(params_list[index], force_refresh)
+            if is_final(index):
+                end_index = index
+                finished = True
+                break
 
-        api_key = self.config.get('GOOGLE_API_KEY', '')
-        search_engine_id = self.config.get('GOOGLE_SEARCH_ENGINE_ID', '')
+        if not finished and sequential < len(params_list):
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(self._fetch_page_with_retry, params_list[index], force_refresh,
+                                    lambda i=index: i > end_marker[0]): index
+                    for index in range(sequential, len(params_list))
+                }
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    index = futures[future]
+                    fetched[index], skipped[index] = future.result()
+                    if index < end_index and is_final(index):
+                        end_index = index
+                        end_marker[0] = index
+                        for other, other_index in futures.items():
+                            if other_index > index:
+                                other.cancel()
+                    elif index > end_index:
+                        fetched[index] = None  # Página posterior al final: se descarta
+
+        pages = []
+        complete = True
+        for index in range(end_index + 1):
+            if fetched[index] is None:
+                complete = False
+                break
+            pages.append((params_list[index], fetched[index]))
+
+        saved = sum(skipped[end_index + 1:]) if stopped_by_check else 0
+        return pages, saved, complete
+
+    def serp_scraper_api(self, keyword, target_domain=None, pages=1, force_refresh=None, find_first=None,
+                         compact=False):
+        """
+        Scraper de posiciones usando SOLAMENTE Google Custom Search API
+
+        Con find_first=True (y target_domain) deja de paginar en cuanto aparece
+        el dominio objetivo; las páginas ahorradas se suman a las estadísticas.
+        Con compact=True devuelve SerpResult en lugar de dicts.
+        Con LEAN_RESPONSES (por defecto) solo se piden a la API link, title y snippet.
+        """
+        return self.fetch_keyword(keyword, target_domain, pages, force_refresh, find_first, compact)[0]
+
+    def fetch_keyword(self, keyword, target_domain=None, pages=1, force_refresh=None, find_first=None,
+                      compact=False):
+        """
+        Como serp_scraper_api, indicando además si la keyword se completó
+
+        Returns:
+            tuple: (results, complete). complete es False si alguna página
+            falló (reintentos agotados, cuota o autenticación): los resultados
+            son parciales y la keyword no debe darse por completada en el journal
+        """
+        results = []
 
-        if not api_key or not search_engine_id:
+        if not len(self.credential_pool):
             self.logger.error("Google API Key o Search Engine ID no configurados")
-            return results
+            return results, False
+
+        if force_refresh is None:
+            force_refresh = self.config.get('SERP_CACHE_FORCE_REFRESH', False)
+        if find_first is None:
+            find_first = self.config.get('FIND_FIRST_MODE', False)
+
+        def target_found(data):
+            return any(domain_matches(urlparse(item.get('link', '')).netloc, target_domain)
+                       for item in data.get('items', []))
+
+        stop_check = target_found if find_first and target_domain else None
+
+        lean = self.config.get('LEAN_RESPONSES', True)
 
         self.logger.info(f"🔍 Consultando Google API para keyword: '{keyword}'")
 
@@ -68,101 +405,224 @@ class StealthSerpScraper:
             max_results_per_page = 10
             total_desired_results = pages * 10
 
-            start_index = 1  # Google API inicia desde 1
-
-            while start_index <= total_desired_results and start_index <= 91:  # Máximo 91 para Google
-                # Preparar parámetros para Google Custom Search API
+            # Los offsets de cada página se conocen de antemano (Google API
+            # inicia desde 1 y admite como máximo start=91)
+            params_list = []
+            for start_index in range(1, min(total_desired_results, 91) + 1, max_results_per_page):
+                # key y cx los pone la credencial elegida al hacer cada petición
                 params = {
-                    'key': api_key,
-                    'cx': search_engine_id,
                     'q': keyword,
-                    'num': min(10, total_desired_results - start_index + 1),
+                    'num': min(max_results_per_page, total_desired_results - start_index + 1),
                     'start': start_index,
                     'gl': self.config.get('DEFAULT_COUNTRY', 'US').lower(),  # País
                     'hl': self.config.get('DEFAULT_LANGUAGE', 'en').lower()  # Idioma
                 }
+                if lean:
+                    params['fields'] = CUSTOM_SEARCH_FIELDS
+                params_list.append(params)
 
-                # Hacer la petición
-                headers = self.get_google_api_headers()
-                response = self.session.get(
-                    'https://www.googleapis.com/customsearch/v1',
-                    params=params,
-                    headers=headers,
-                    timeout=15
-                )
+            fetched_pages, pages_saved, complete = self._fetch_serp_pages(params_list, force_refresh, stop_check)
+            if pages_saved:
+                self._count_stat('find_first_pages_saved', pages_saved)
+                self.logger.info(f"⚡ Find-first: {pages_saved} páginas ahorradas para '{keyword}'")
 
-                if response.status_code == 200:
-                    data = response.json()
-
-                    if 'items' in data:
-                        items = data['items']
-
-                        for i, item in enumerate(items):
-                            position = start_index + i - 1  # Posición real
-                            url = item.get('link', '')
-                            title = item.get('title', '')
-                            snippet = item.get('snippet', '')
-
-                            domain = urlparse(url).netloc.lower()
-
-                            result = {
-                                'keyword': keyword,
-                                'position': position,
-                                'title': title,
-                                'url': url,
-                                'domain': domain,
-                                'snippet': snippet,
-                                'page': ((position - 1) // 10) + 1
-                            }
-
-                            results.append(result)
-
-                            # Si estamos buscando un dominio específico y lo encontramos
-                            if target_domain and target_domain.lower() in domain:
-                                self.logger.info(f"🎯 Encontrado {target_domain} en posición {position}")
-
-                        # Preparar para la siguiente página (si hay)
-                        start_index += len(items)
-
-                        # Control de rate limiting: delay entre peticiones
-                        delay = self.config.get('MIN_KEYWORD_DELAY', 1)
-                        time.sleep(delay)
-                    else:
-                        self.logger.info(f"No encontró más resultados para '{keyword}'")
-                        break
-
-                elif response.status_code == 403:
-                    data = response.json()
-                    error_msg = data.get('error', {}).get('message', '')
-
-                    if "DAILY_LIMIT_EXCEEDED" in error_msg:
-                        self.logger.error("🚫 Límite diario de Google API excedido (100 consultas)")
-                        break
-                    elif "quota" in error_msg.lower():
-                        self.logger.error("🚫 Cuota de Google API agotada")
-                        break
-                    else:
-                        self.logger.error(f"🚫 Error de autenticación Google API: {error_msg}")
-                        break
-
-                elif response.status_code == 429:
-                    self.logger.warning("⏳ Rate limiting de Google API - esperando...")
-                    time.sleep(5)  # Esperar y continuar
-                    continue
+            for params, data in fetched_pages:
+                start_index = params['start']
+                items = data.get('items', [])
 
-                else:
-                    self.logger.error(f"❌ Error HTTP {response.status_code} en API de Google")
+                if not items:
+                    self.logger.info(f"No encontró más resultados para '{keyword}'")
                     break
 
+                for i, item in enumerate(items):
+                    position = start_index + i - 1  # Posición real
+                    url = item.get('link', '')
+                    title = item.get('title', '')
+                    snippet = item.get('snippet', '')
+
+                    domain = urlparse(url).netloc.lower()
+
+                    result = SerpResult(keyword, position, title, url, domain, snippet)
+                    results.append(result if compact else result.to_dict())
+
+                    # Si estamos buscando un dominio específico y lo encontramos
+                    if target_domain and domain_matches(domain, target_domain):
+                        self.logger.info(f"🎯 Encontrado {target_domain} en posición {position}")
+
         except Exception as e:
             self.logger.error(f"❌ Error al consultar Google API: {e}")
-            return results
+            return results, False
 
+        if not complete:
+            self.logger.warning(f"⚠️ Resultados incompletos para '{keyword}': alguna página no se pudo obtener")
         self.logger.info(f"✅ Encontrados {len(results)} resultados para '{keyword}'")
+        return results, complete
+
+    def batch_position_check(self, keywords, target_domain, pages=1, stop_callback=None, concurrency=None,
+                             force_refresh=None, journal=None, find_first=None, progress_callback=None,
+                             sink=None, compact=False, normalize=None, scheduler=None):
+        """
+        Verifica posiciones para múltiples keywords usando SOLAMENTE Google API
+
+        Si se pasa un RunJournal, cada keyword completada se guarda en disco y
+        las que ya estaban completadas en ese run_id se saltan (reanudación).
+        Con find_first=True cada keyword deja de paginar al encontrar target_domain.
+        progress_callback(keyword, results) se llama al completar cada keyword.
+        Con un ResultSink los resultados se escriben en él según llegan y no se
+        acumulan en memoria: la lista devuelta queda vacía.
+        Con compact=True los resultados son SerpResult (menos memoria por resultado).
+        Con normalize=True las grafías equivalentes (mayúsculas, espacios, Unicode
+        y, con KEYWORD_FOLD_ACCENTS, acentos) se consultan una sola vez y los
+        resultados se copian a cada grafía original.
+        Con un RefreshScheduler solo se comprueban las keywords cuyo intervalo de
+        refresco ha vencido, y cada resultado se anota en su historial una vez
+        por keyword normalizada (no una por cada grafía agrupada).
+        """
+        if scheduler:
+            due = scheduler.due_keywords(keywords)
+            if len(due) < len(keywords):
+                self.logger.info(f"📅 {len(due)} de {len(keywords)} keywords pendientes de refresco")
+            keywords = due
+            user_callback = progress_callback
+            recorded = set()
+
+            def progress_callback(keyword, results):
+                key = normalize_keyword(keyword)
+                if key not in recorded and scheduler.record(keyword, results):
+                    recorded.add(key)
+                if user_callback:
+                    user_callback(keyword, results)
+
+        if find_first is None:
+            find_first = self.config.get('FIND_FIRST_MODE', False)
+
+        previous_results = []
+        if journal:
+            # Opciones que resume_run necesita para repetir la ejecución tal cual
+            journal.start(keywords, target_domain, pages, extra={
+                'find_first': bool(find_first), 'compact': bool(compact), 'sink': sink is not None,
+            })
+            completed = journal.completed_keywords()
+            if completed:
+                if sink:
+                    for _, keyword_results in journal.iter_keyword_results():
+                        sink.write(keyword_results)
+                elif compact:
+                    previous_results = [SerpResult.from_dict(r) for r in journal.load_results()]
+                else:
+                    previous_results = journal.load_results()
+                keywords = [kw for kw in keywords if kw not in completed]
+                self.logger.info(
+                    f"♻️ Reanudando ejecución {journal.run_id}: {len(completed)} keywords ya completadas, "
+                    f"{len(keywords)} pendientes"
+                )
+
+        if normalize is None:
+            normalize = self.config.get('NORMALIZE_KEYWORDS', True)
+        groups = None
+        if normalize:
+            groups = KeywordManager.group_equivalent_keywords(
+                keywords, fold_accents=self.config.get('KEYWORD_FOLD_ACCENTS', False))
+            if len(groups) < len(keywords):
+                self.logger.info(f"🔗 {len(keywords)} keywords agrupadas en {len(groups)} consultas únicas")
+            keywords = list(groups)
+
+        self.quota_exhausted = False
+        self.retry_policy.reset()
+        self.pacer.reset()
+        saved_before = self.stats.get('find_first_pages_saved', 0)
+        if concurrency is None:
+            concurrency = self.config.get('MAX_CONCURRENT_REQUESTS', 1)
+        if concurrency and int(concurrency) > 1:
+            results = self._concurrent_position_check(keywords, target_domain, pages, stop_callback,
+                                                      int(concurrency), force_refresh, journal, find_first,
+                                                      progress_callback, sink, compact, groups)
+        else:
+            results = self._sequential_position_check(keywords, target_domain, pages, stop_callback,
+                                                      force_refresh, journal, find_first, progress_callback,
+                                                      sink, compact, groups)
+
+        pages_saved = self.stats.get('find_first_pages_saved', 0) - saved_before
+        if pages_saved:
+            self.logger.info(f"⚡ Find-first: {pages_saved} consultas de API ahorradas en esta ejecución")
+
+        keywords_per_minute = self.pacer.keywords_per_minute()
+        with self._stats_lock:
+            self.stats['keywords_per_minute'] = keywords_per_minute
+        self.logger.info(f"⏱️ Ritmo conseguido: {keywords_per_minute} keywords/minuto")
+
+        if scheduler:
+            scheduler.save()
+
+        if journal:
+            journal.flush()
+            pending = [kw for group in groups.values() for kw in group] if groups else keywords
+            if set(pending) <= journal.completed_keywords():
+                journal.finish()
+            else:
+                journal.close()
+                self.logger.info(f"💾 Progreso guardado - reanuda con el run_id {journal.run_id}")
+
+        return previous_results + results
+
+    @staticmethod
+    def relabel_results(results, keyword):
+        """Copia de unos resultados atribuidos a otra grafía de la keyword"""
+        relabeled = []
+        for result in results:
+            if isinstance(result, SerpResult):
+                relabeled.append(SerpResult(keyword, result.position, result.title, result.url,
+                                            result.domain, result.snippet))
+            else:
+                relabeled.append(dict(result, keyword=keyword))
+        return relabeled
+
+    def _fan_out_results(self, query, results, groups=None):
+        """Pares (grafía, resultados) para cada keyword original de una consulta"""
+        spellings = groups.get(query, [query]) if groups else [query]
+        return [(spelling, results if spelling == query else self.relabel_results(results, spelling))
+                for spelling in spellings]
+
+    def resume_run(self, run_id, stop_callback=None, concurrency=None, progress_callback=None, sink=None):
+        """
+        Reanuda una ejecución interrumpida a partir de su journal
+
+        Se restauran find-first, compact y proyecto de la ejecución original;
+        si esta volcaba a un ResultSink y no se pasa uno, se abre otro (con los
+        resultados ya guardados más los nuevos) y se crea su reporte de sesión.
+        """
+        journal = RunJournal(run_id)
+        metadata = journal.read_metadata()
+        if not metadata:
+            self.logger.error(f"❌ No existe el journal de la ejecución {run_id}")
+            return []
+
+        project_id = metadata.get('project_id')
+        own_sink = sink is None and metadata.get('sink', False)
+        if own_sink:
+            sink = self.open_result_sink(project_id=project_id)
+
+        results = self.batch_position_check(
+            metadata.get('keywords', []),
+            metadata.get('target_domain'),
+            metadata.get('pages', 1),
+            stop_callback=stop_callback,
+            concurrency=concurrency,
+            journal=journal,
+            find_first=metadata.get('find_first'),
+            progress_callback=progress_callback,
+            sink=sink,
+            compact=metadata.get('compact', False)
+        )
+
+        if own_sink:
+            self.save_sink(sink, project_id=project_id)
         return results
 
-    def batch_position_check(self, keywords, target_domain, pages=1, stop_callback=None):
-        """Verifica posiciones para múltiples keywords usando SOLAMENTE Google API"""
+    def _sequential_position_check(self, keywords, target_domain, pages, stop_callback, force_refresh=None,
+                                   journal=None, find_first=None, progress_callback=None, sink=None,
+                                   compact=False, groups=None):
+        """Modo secuencial clásico: una keyword cada vez con delay entre ellas"""
         all_results = []
 
         self.logger.info(f"🚀 Iniciando verificación de posiciones para {len(keywords)} keywords")
@@ -175,288 +635,200 @@ class StealthSerpScraper:
                 
             self.logger.info(f"🔄 Procesando keyword {i+1}/{len(keywords)}: '{keyword}'")
 
-            results = self.serp_scraper_api(keyword, target_domain, pages)
-            all_results.extend(results)
+            requests_before = self.stats.get('api_requests', 0)
+            throttle_before = self._throttle_count()
+            results, complete = self.fetch_keyword(keyword, target_domain, pages, force_refresh, find_first,
+                                                   compact)
 
-            # Delay entre keywords (configurado por usuario)
-            if i < len(keywords) - 1:
-                # Verificar nuevamente antes del delay
-                if stop_callback and stop_callback():
+            # Sin cuota la keyword no se da por completada: se reintentará al reanudar
+            if self.quota_exhausted:
+                self.logger.error("🚫 Cuota agotada - ejecución pausada")
+                break
+
+            for spelling, spelling_results in self._fan_out_results(keyword, results, groups):
+                if sink:
+                    sink.write(spelling_results)
+                else:
+                    all_results.extend(spelling_results)
+                # Una keyword con páginas fallidas queda pendiente en el journal
+                if journal and complete:
+                    journal.record_keyword(spelling, spelling_results)
+                if progress_callback:
+                    progress_callback(spelling, spelling_results)
+
+            # Si todo vino de la caché no se ha tocado la API: no hace falta esperar
+            served_from_cache = self.stats.get('api_requests', 0) == requests_before
+            self.pacer.record(throttled=self._throttle_count() > throttle_before)
+
+            # Delay entre keywords (adaptativo o el rango clásico configurado)
+            if i < len(keywords) - 1 and not served_from_cache:
+                if not self.pacer.wait(stop_callback):
                     self.logger.info("⏹️ Proceso detenido por el usuario durante el delay")
-                    break
-                    
-                delay = random.uniform(
-                    self.config.get('MIN_KEYWORD_DELAY', 5),
-                    self.config.get('MAX_KEYWORD_DELAY', 15)
-                )
-                self.logger.info(f"⏳ Esperando {delay:.1f}s antes del siguiente keyword...")
-                
-                # Dividir el delay en pequeños intervalos para verificar stop más frecuentemente
-                delay_intervals = int(delay * 10)  # 10 verificaciones por segundo
-                for _ in range(delay_intervals):
-                    if stop_callback and stop_callback():
-                        self.logger.info("⏹️ Proceso detenido por el usuario durante el delay")
-                        return all_results
-                    time.sleep(0.1)
+                    return all_results
 
         if not (stop_callback and stop_callback()):
-            self.logger.info(f"✅ Proceso completado - Total posiciones encontradas: {len(all_results)}")
+            total_found = sink.summary.total_results if sink else len(all_results)
+            self.logger.info(f"✅ Proceso completado - Total posiciones encontradas: {total_found}")
         return all_results
 
-    def google_suggest_scraper(self, base_keyword, country="US", language="en", max_suggestions=25):
-        """Obtiene sugerencias de Google Suggest API para completar keywords"""
-        suggestions = []
-
-        try:
-            self.logger.info(f"🔍 Obteniendo sugerencias para: '{base_keyword}'")
-
-            # URL de Google Suggest API
-            suggest_url = "https://suggestqueries.google.com/complete/search"
-
-            # Variaciones de búsqueda para obtener más sugerencias
-            variations = [base_keyword]
-
-            # Añadir variaciones con conectores comunes
-            variations.extend([
-                f"{base_keyword} o",
-                f"{base_keyword} y",
-                f"{base_keyword} con",
-                f"{base_keyword} para",
-                f"{base_keyword} en",
-                f"{base_keyword} de",
-                f"{base_keyword} como",
-                f"{base_keyword} precio",
-                f"{base_keyword} más"
-            ])
-
-            for variation in variations:
-                params = {
-                    'client': 'firefox',
-                    'q': variation,
-                    'hl': language.lower(),
-                    'gl': country.upper(),
-                    'ds': 'yt'  # También incluya búsquedas de YouTube
-                }
-
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0',
-                    'Accept': '*/*',
-                    'Accept-Language': f'{language.lower()},{language.lower()};q=0.8,en-US;q=0.5,en;q=0.3',
-                    'Accept-Encoding': 'gzip, deflate, br',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1',
-                    'Cache-Control': 'max-age=0',
-                }
+    def _concurrent_position_check(self, keywords, target_domain, pages, stop_callback, concurrency,
+                                   force_refresh=None, journal=None, find_first=None, progress_callback=None,
+                                   sink=None, compact=False, groups=None):
+        """Versión concurrente de batch_position_check con pool de hilos acotado
+
+        Procesa hasta `concurrency` keywords a la vez; el ritmo global lo impone
+        el rate limiter compartido. Los resultados se devuelven en el mismo
+        orden que en el modo secuencial (con sink, en orden de finalización).
+        """
+        results_by_index = {}
+        stopped = False
+
+        self.logger.info(
+            f"🚀 Iniciando verificación concurrente de {len(keywords)} keywords "
+            f"({concurrency} en paralelo)"
+        )
 
-                try:
-                    response = requests.get(
-                        suggest_url,
-                        params=params,
-                        headers=headers,
-                        timeout=self.config.get('REQUEST_TIMEOUT', 10)
-                    )
-
-                    if response.status_code == 200:
-                        try:
-                            data = response.json()
-                            if len(data) >= 2 and isinstance(data[1], list):
-                                new_suggestions = data[1]
-                                suggestions.extend(new_suggestions)
-                        except json.JSONDecodeError:
-                            self.logger.warning(f"La respuesta de Google Suggest no es JSON válida para '{variation}'")
-                    else:
-                        self.logger.warning(f"Sugerencias HTTP {response.status_code} para '{variation}'")
-
-                except requests.RequestException as e:
-                    self.logger.warning(f"Error conectando con Google Suggest: {e}")
-                    continue
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        progress = tqdm(total=len(keywords), desc="Verificando posiciones")
 
-                # Pequeño delay entre búsquedas
-                time.sleep(0.5)
+        try:
+            pending = {}
+            next_index = 0
+
+            while next_index < len(keywords) or pending:
+                if not stopped and stop_callback and stop_callback():
+                    self.logger.info("⏹️ Proceso detenido por el usuario")
+                    stopped = True
+
+                # Rellenar el pool sin superar el límite de concurrencia
+                while not stopped and next_index < len(keywords) and len(pending) < concurrency:
+                    keyword = keywords[next_index]
+                    self.logger.info(f"🔄 Procesando keyword {next_index+1}/{len(keywords)}: '{keyword}'")
+                    future = executor.submit(self.fetch_keyword, keyword, target_domain, pages,
+                                             force_refresh, find_first, compact)
+                    pending[future] = next_index
+                    next_index += 1
+
+                if not pending:
+                    break
 
-            # Limpiar y filtrar sugerencias
-            clean_suggestions = []
-            base_lower = base_keyword.lower()
+                # Timeout corto para seguir comprobando stop_callback
+                done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        results, complete = future.result()
+                    except Exception as e:
+                        self.logger.error(f"❌ Error procesando '{keywords[index]}': {e}")
+                        results, complete = [], False
+                    progress.update(1)
+                    self.pacer.record()
+
+                    if self.quota_exhausted:
+                        if not stopped:
+                            self.logger.error("🚫 Cuota agotada - ejecución pausada")
+                        stopped = True
+                        continue
+
+                    for spelling, spelling_results in self._fan_out_results(keywords[index], results, groups):
+                        if sink:
+                            sink.write(spelling_results)
+                        else:
+                            results_by_index.setdefault(index, []).extend(spelling_results)
+                        if journal and complete:
+                            journal.record_keyword(spelling, spelling_results)
+                        if progress_callback:
+                            progress_callback(spelling, spelling_results)
+        finally:
+            executor.shutdown(wait=True)
+            progress.close()
 
-            for sug in suggestions:
-                if sug and isinstance(sug, str):
-                    clean_sug = sug.strip()
-                    if (len(clean_sug) > len(base_keyword) + 1 and  # Al menos 2 caracteres adicionales
-                        clean_sug.lower() != base_lower and       # No igual a la palabra base
-                        not clean_sug.lower().startswith(f"{base_lower} {base_lower}")):  # Evitar duplicados
-                        clean_suggestions.append(clean_sug)
+        all_results = []
+        for index in sorted(results_by_index):
+            all_results.extend(results_by_index[index])
 
-            # Eliminar duplicados manteniendo el orden
-            seen = set()
-            unique_suggestions = []
-            for sug in clean_suggestions:
-                if sug.lower() not in seen:
-                    unique_suggestions.append(sug)
-                    seen.add(sug.lower())
+        if not stopped:
+            total_found = sink.summary.total_results if sink else len(all_results)
+            self.logger.info(f"✅ Proceso completado - Total posiciones encontradas: {total_found}")
+        return all_results
 
-            # Limitar cantidad
-            final_suggestions = unique_suggestions[:max_suggestions]
+    def google_suggest_scraper(self, keyword, country="US", language="en", max_suggestions=25, connectors=None):
+        """
+        Obtiene sugerencias de Google Suggest para una keyword y sus variaciones
 
-            self.logger.info(f"✅ Obtenidas {len(final_suggestions)} sugerencias únicas de Google Suggest")
-            return final_suggestions
+        Las variaciones (keyword + conector) se lanzan en paralelo contra los
+        endpoints de SUGGEST_ENDPOINTS y se devuelven fusionadas, sin
+        duplicados y en el orden de las variaciones.
 
+        Args:
+            connectors: sufijos de las variaciones ('' = la keyword sola);
+                por defecto los conectores comunes de SuggestEngine
+        """
+        try:
+            return self.suggest_engine.suggest(keyword, country, language, max_suggestions, connectors)
         except Exception as e:
             self.logger.error(f"❌ Error obteniendo sugerencias: {e}")
             return []
 
-    def keyword_variants_generator(self, keywords, prefix_words=None, suffix_words=None, max_variants_per_keyword=20):
-        """Genera variantes long-tail de keywords base"""
-        variants = []
-        base_keywords = keywords if isinstance(keywords, list) else [keywords]
-
-        # Palabras comunes para prefixes (antes)
-        default_prefixes = [
-            "mejor", "como", "donde", "precio", "comprar", "tutorial", "guía", "ejemplos",
-            "tips", "formulario", "requisitos", "procesos", "sistema", "estándar", "normas",
-            "últimas", "nuevo", "actual", "completo", "fácil", "rápido", "sin", "con",
-            "para", "por", "gratis", "barato", "profesional", "certificado"
-        ]
-
-        # Palabras comunes para suffixes (después)
-        default_suffixes = [
-            "españa", "madrid", "barcelona", "online", "internet", "web", "app", "móvil",
-            "2025", "2024", "actual", "nuevo", "paso a paso", "gratuito", "fácil", "rápido",
-            "barato", "profesional", "certificado", "autorizado", "oficial", "sistema",
-            "completo", "integral", "total", "incluye", "descuento", "oferta", "promoción"
-        ]
-
-        prefix_words = prefix_words or default_prefixes
-        suffix_words = suffix_words or default_suffixes
+    def keyword_variants_generator(self, keywords, prefix_words=None, suffix_words=None, max_variants_per_keyword=20,
+                                   output_path=None):
+        """
+        Genera variantes long-tail de keywords base
 
-        self.logger.info(f"🔄 Generando variantes para {len(base_keywords)} keywords base")
+        Las combinaciones se calculan por bloques con NumPy (VariantGenerator):
+        plantillas de la biblioteca más prefix_words / suffix_words (por defecto
+        las listas habituales). El orden es determinista: keywords base en su
+        orden y, dentro de cada una, el de las plantillas.
+        Con output_path las variantes se escriben en disco según se generan y
+        se devuelve cuántas hay en lugar de la lista.
+        """
+        from variant_generator import VariantGenerator
+
+        base_keywords = keywords if isinstance(keywords, (list, tuple)) else [keywords]
+        generator = VariantGenerator(prefix_words, suffix_words,
+                                     max_variants_per_keyword=max_variants_per_keyword)
 
-        for keyword in base_keywords:
-            keyword_variants = []
-
-            # Mantener la keyword original
-            keyword_variants.append(keyword)
-
-            # Generar variantes con números y cantidades
-            if len(keyword.split()) <= 2:  # Solo keywords cortas
-                keyword_variants.extend([
-                    f"{keyword} 2025",
-                    f"mejor {keyword}",
-                    f"{keyword} paso a paso",
-                    f"como {keyword}",
-                    f"donde {keyword}",
-                    f"precio {keyword}",
-                    f"{keyword} online",
-                    f"{keyword} gratuito",
-                    f"comprar {keyword}",
-                    f"{keyword} barato",
-                    f"{keyword} profesional"
-                ])
-
-            # Variantes más específicas si la keyword es muy corta
-            if len(keyword) < 10 and len(keyword.split()) == 1:
-                keyword_variants.extend([
-                    f"{keyword} en españa",
-                    f"{keyword} madrid",
-                    f"{keyword} barcelona",
-                    f"cursillo {keyword}",
-                    f"curso {keyword}",
-                    f"temario {keyword}",
-                    f"certificación {keyword}"
-                ])
-
-            # Limpiar y añadir las variantes únicas
-            clean_variants = []
-            seen = set()
-            for variant in keyword_variants:
-                clean_variant = variant.strip()
-                if clean_variant and clean_variant.lower() not in seen and len(clean_variant.split()) <= 4:  # Máximo 4 palabras
-                    clean_variants.append(clean_variant)
-                    seen.add(clean_variant.lower())
-
-            # Limitar por keyword
-            variants.extend(clean_variants[:max_variants_per_keyword])
-
-        # Eliminar duplicados globales
-        unique_variants = list(set(variants))
+        self.logger.info(f"🔄 Generando variantes para {len(base_keywords)} keywords base")
+        if output_path:
+            total = generator.write(base_keywords, output_path)
+            self.logger.info(f"✅ Generadas {total} variantes únicas en {output_path}")
+            return total
 
+        unique_variants = generator.generate(base_keywords)
         self.logger.info(f"✅ Generadas {len(unique_variants)} variantes únicas")
         return unique_variants
 
+    def analyze_keywords_competitiveness(self, keywords):
+        """
+        Competitividad de una lista de keywords de una vez (simulando métricas SEO)
+
+        Returns:
+            DataFrame con keyword, competition_score, estimated_volume,
+            difficulty y opportunity_score, en el orden recibido
+        """
+        from keyword_scoring import score_keywords
+        return score_keywords(keywords)
+
     def analyze_keyword_competitiveness(self, keyword):
         """Analiza la competitividad de una keyword simulando métricas SEO"""
         # Esta es una implementación simplificada ya que las APIs reales de KW research son pagas
-        score = 3.0  # Base neutral
-
-        # Análisis basado en características del keyword
-        keyword_length = len(keyword)
-        word_count = len(keyword.split())
-        has_geo_terms = any(term in keyword.lower() for term in ['españa', 'madrid', 'barcelona', 'español', 'castellano'])
-        has_commercial_intent = any(term in keyword.lower() for term in ['comprar', 'precio', 'barato', 'venta', 'oferta', 'promocia'])
-        has_long_tail = word_count >= 3
-
-        # Calcular score basado en complejidad y competitividad
-        if has_long_tail:
-            score -= 1.0  # Long-tail menos competitivo
-        if keyword_length < 10:
-            score += 1.0  # Keywords cortas más competitivas
-        if has_geo_terms:
-            score -= 0.5  # Términos geográficos suelen ser menos competitivos
-        if has_commercial_intent:
-            score += 2.0  # Intent comercial muy competitivo
-        if word_count == 1:
-            score += 3.0  # Keywords de una palabra muy competitivas
-
-        # Volumen estimado (muy grosero)
-        base_volume = 1000
-        if keyword_length < 10:
-            volume_multiplier = 5.0
-        elif keyword_length < 20:
-            volume_multiplier = 2.0
-        elif keyword_length < 30:
-            volume_multiplier = 1.0
-        else:
-            volume_multiplier = 0.5
-
-        if has_commercial_intent:
-            volume_multiplier *= 1.5
-        if has_geo_terms:
-            volume_multiplier *= 0.7
-
-        estimated_volume = int(base_volume * volume_multiplier)
-
-        # Dificultad basada en score de competencia
-        difficulty = min(100, score * 12 + (word_count - 1) * 5)
-
-        # Oportunidad = inverso de dificultad
-        opportunity = max(0, 100 - difficulty)
-        if has_long_tail:
-            opportunity += 10  # Long-tail tiene más oportunidades
-
+        row = self.analyze_keywords_competitiveness([keyword]).iloc[0]
         return {
             'keyword': keyword,
-            'competition_score': round(score, 1),
-            'estimated_volume': estimated_volume,
-            'difficulty': round(difficulty, 0),
-            'opportunity_score': round(opportunity, 0),
+            'competition_score': float(row['competition_score']),
+            'estimated_volume': int(row['estimated_volume']),
+            'difficulty': float(row['difficulty']),
+            'opportunity_score': float(row['opportunity_score']),
         }
 
     def single_keyword_position_check(self, keyword, target_domain=None, pages=1):
         """Analiza una sola keyword y devuelve todos los resultados encontrados"""
         return self.serp_scraper_api(keyword, target_domain, pages)
 
-    def save_results(self, results, filename=None, project_id=None):
-        """Guarda resultados en CSV y JSON y crea reporte de sesión"""
-        if not results:
-            self.logger.warning("No results to save")
-            return
-
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-
+    def _results_base_path(self, filename=None, project_id=None):
+        """Ruta base (sin extensión) de los ficheros de resultados"""
         if not filename:
-            filename = f"keyword_positions_{timestamp}"
-
-        # Guardar como CSV
-        df = pd.DataFrame(results)
+            filename = f"keyword_positions_{time.strftime('%Y%m%d_%H%M%S')}"
 
         # Path absoluto para data (calculado desde src/)
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -465,117 +837,83 @@ class StealthSerpScraper:
         # Si hay project_id, guardar en carpeta del proyecto
         if project_id:
             data_dir_abs = os.path.join(parent_dir, 'data', 'projects', project_id, 'reports')
-            os.makedirs(data_dir_abs, exist_ok=True)
             self.logger.info(f"Guardando resultados en proyecto: {project_id}")
         else:
             data_dir_abs = os.path.join(parent_dir, 'data')
 
-        data_file_path = os.path.join(data_dir_abs, f"{filename}.csv")
-        df.to_csv(data_file_path, index=False, encoding='utf-8')
+        return os.path.join(data_dir_abs, filename)
+
+    def open_result_sink(self, filename=None, project_id=None, formats=('csv', 'jsonl')):
+        """Crea un ResultSink para volcar resultados a disco según se obtienen"""
+        return ResultSink(self._results_base_path(filename, project_id), formats=formats)
+
+    def save_sink(self, sink, project_id=None):
+        """Cierra un ResultSink y crea el reporte de sesión a partir de su resumen"""
+        sink.close()
+        summary = sink.summary.as_dict()
+        if not summary['total_results']:
+            self.logger.warning("No results to save")
+            return None
+
+        return self._save_session_report([], sink, summary, project_id,
+                                         results_file=sink.results_file)
+
+    def save_results(self, results, filename=None, project_id=None):
+        """Guarda resultados en CSV y JSON y crea reporte de sesión"""
+        if not results:
+            self.logger.warning("No results to save")
+            return
+
+        with ResultSink(self._results_base_path(filename, project_id), formats=('csv', 'json')) as sink:
+            sink.write(results)
 
-        # Guardar como JSON
-        json_file_path = os.path.join(data_dir_abs, f"{filename}.json")
-        with open(json_file_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        return self._save_session_report(results, sink, sink.summary.as_dict(), project_id)
 
+    def _save_session_report(self, results, sink, summary, project_id=None, results_file=None):
+        """Reporte de sesión y estadísticas finales de una ejecución ya volcada a disco"""
         # Crear reporte de sesión automáticamente
         session_info = {
-            'timestamp': timestamp,
-            'filename': filename,
-            'total_keywords': len(set([r['keyword'] for r in results])),
-            'total_results': len(results),
-            'config': self.config,
-            'project_id': project_id
+            'timestamp': time.strftime("%Y%m%d_%H%M%S"),
+            'filename': os.path.basename(sink.base_path),
+            'total_keywords': summary['total_keywords'],
+            'total_results': summary['total_results'],
+            'config': public_config(self.config),
+            'project_id': project_id,
+            'stats': self.get_session_stats()
         }
 
+        session_id = None
         try:
-            session_id = self.report_manager.save_scraping_session(results, session_info, project_id=project_id)
+            session_id = self.report_manager.save_scraping_session(
+                results, session_info, project_id=project_id, summary=summary, results_file=results_file
+            )
             self.logger.info(f"Session report saved with ID: {session_id}")
         except Exception as e:
             self.logger.warning(f"Failed to save session report: {str(e)}")
 
-        self.logger.info(f"Results saved to {data_file_path} and {json_file_path}")
+        self.logger.info(f"Results saved to {' and '.join(sink.paths.values())}")
 
         # Estadísticas
-        total_keywords = len(set([r['keyword'] for r in results]))
-        self.logger.info(f"Total keywords processed: {total_keywords}")
-        self.logger.info(f"Total positions found: {len(results)}")
-
-        return session_id if 'session_id' in locals() else None
-
-    def google_suggest_scraper(self, keyword, country="US", language="en"):
-        """Obtiene sugerencias de Google Suggest para una keyword"""
-        suggestions = []
-
-        try:
-            # Google Suggest API URL
-            url = "https://www.google.com/complete/search"
-
-            params = {
-                'q': keyword,
-                'client': 'firefox',
-                'hl': language.lower(),
-                'gl': country.lower()
-            }
-
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': '*/*',
-                'Accept-Language': f'{language.lower()}-{country.lower()},{language.lower()};q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-            }
-
-            response = self.session.get(url, params=params, headers=headers, timeout=10)
-
-            if response.status_code == 200:
-                # Google Suggest devuelve JSONP, pero podemos parsear como JSON
-                try:
-                    # Cuando no hay callback, devuelve JSON directo
-                    data = response.json()
-
-                    # El formato típico de Google Suggest es:
-                    # [query, [suggestion1, suggestion2, ...], ...]
-                    if isinstance(data, list) and len(data) >= 2:
-                        suggestions_list = data[1] if isinstance(data[1], list) else []
-
-                        # Filtrar solo strings válidos
-                        for suggestion in suggestions_list:
-                            if isinstance(suggestion, str) and suggestion.strip():
-                                suggestions.append(suggestion.strip())
-
-                    elif isinstance(data, list) and len(data) > 0:
-                        # A veces solo devuelve la lista de sugerencias
-                        for item in data:
-                            if isinstance(item, str) and item.strip():
-                                suggestions.append(item.strip())
-
-                except json.JSONDecodeError:
-                    # Si no es JSON directo, puede ser JSONP
-                    text = response.text.strip()
-                    if text.startswith('(') and text.endswith(')'):
-                        # Intentar quitar el callback function()
-                        try:
-                            json_text = text[1:-1]  # Quitar paréntesis
-                            data = json.loads(json_text)
-                            if isinstance(data, list) and len(data) >= 2:
-                                suggestions_list = data[1] if isinstance(data[1], list) else []
-                                for suggestion in suggestions_list:
-                                    if isinstance(suggestion, str) and suggestion.strip():
-                                        suggestions.append(suggestion.strip())
-                        except json.JSONDecodeError:
-                            pass
-
-                # Limitar a 10 sugerencias máxima
-                suggestions = suggestions[:10]
-
-                # Log detallado solo si hay sugerencias y para depuración
-                if suggestions:
-                    self.logger.debug(f"Encontradas {len(suggestions)} sugerencias para '{keyword}': {suggestions[:3]}...")
-                else:
-                    self.logger.debug(f"No se encontraron sugerencias adicionales para '{keyword}'")
-
-        except Exception as e:
-            self.logger.warning(f"Error obteniendo sugerencias para '{keyword}': {str(e)}")
-
-        return suggestions
+        self.logger.info(f"Total keywords processed: {summary['total_keywords']}")
+        self.logger.info(f"Total positions found: {summary['total_results']}")
+
+        stats = self.get_session_stats()
+        if stats.get('api_pages_ok'):
+            self.logger.info(
+                f"📦 Respuestas de API: {stats['response_bytes'] / 1024:.1f} KB transferidos "
+                f"({stats['bytes_per_page']} bytes/página, parseo {stats['json_parse_ms_per_page']} ms/página)"
+            )
+        if stats.get('retries'):
+            self.logger.info(
+                f"🔁 Reintentos: {stats['retries']} ({stats['retry_wait_seconds']}s de espera, "
+                f"{stats['retries_given_up']} páginas abandonadas)"
+            )
+        if stats.get('find_first_pages_saved'):
+            self.logger.info(f"⚡ Find-first: {stats['find_first_pages_saved']} consultas de API ahorradas")
+        if stats.get('cache_hits'):
+            self.logger.info(
+                f"💾 Caché SERP: {stats['cache_hits']} páginas servidas desde caché "
+                f"({stats['cache_hits']} consultas de API ahorradas)"
+            )
+
+        return session_id
@@ -0,0 +1,238 @@
+"""
+Motor de Google Suggest
+Lanza en paralelo las variaciones de una keyword (conectores como "o", "y",
+"con", "para"...) contra uno o varios endpoints de autocompletado y devuelve
+las sugerencias fusionadas, sin duplicados y en orden estable
+"""
+
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from http_client import get_http_session
+from rate_limiter import get_rate_limiter, API_SUGGEST
+from response_cache import ResponseCache, get_response_cache
+from retry_policy import get_retry_policy
+
+SUGGEST_ENDPOINTS = {
+    'suggestqueries': 'https://suggestqueries.google.com/complete/search',
+    'complete': 'https://www.google.com/complete/search',
+}
+
+DEFAULT_CONNECTORS = ['o', 'y', 'con', 'para', 'en', 'de', 'como', 'precio', 'más']
+
+
+class RequestBudgetExhausted(Exception):
+    """El presupuesto de peticiones del llamador no admite otra petición"""
+
+
+class FailedSuggestions(list):
+    """
+    Sugerencias de una consulta que falló en algún endpoint
+
+    Se usa como una lista normal (vacía si fallaron todos los endpoints); quien
+    guarde respuestas puede distinguirla de un "sin sugerencias" real y no
+    memorizarla, igual que hace la caché de disco del motor
+    """
+
+
+def parse_suggest_response(text: str) -> Optional[List[str]]:
+    """Sugerencias de una respuesta JSON o JSONP: [consulta, [sugerencias...], ...] (None si no es válida)"""
+    text = (text or '').strip()
+    if text.startswith('(') and text.endswith(')'):
+        text = text[1:-1]
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+
+    if not isinstance(data, list):
+        return None
+    if len(data) >= 2:
+        items = data[1] if isinstance(data[1], list) else []
+    else:
+        # A veces solo devuelve la lista de sugerencias
+        items = data
+    return [item.strip() for item in items if isinstance(item, str) and item.strip()]
+
+
+class SuggestEngine:
+    """
+    Cliente concurrente de Google Suggest
+
+    Todas las peticiones pasan por el rate limiter (API_SUGGEST), la política
+    de reintentos y el pool HTTP compartidos del proceso. Con `cache` las
+    respuestas se guardan en disco por (endpoint, q, hl, gl).
+    """
+
+    def __init__(self, session=None, rate_limiter=None, retry_policy=None, max_workers: int = 8,
+                 endpoints: Sequence[str] = ('suggestqueries',), timeout: float = 10,
+                 cache: Optional[ResponseCache] = None):
+        self.logger = logging.getLogger(__name__)
+        self.session = session or get_http_session()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.retry_policy = retry_policy or get_retry_policy()
+        self.max_workers = max(1, int(max_workers))
+        self.endpoints = [name for name in endpoints if name in SUGGEST_ENDPOINTS] or ['suggestqueries']
+        self.timeout = timeout
+        self.cache = cache
+        self.stats = {'suggest_requests': 0, 'suggest_cache_hits': 0}
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict, session=None, rate_limiter=None, retry_policy=None) -> 'SuggestEngine':
+        endpoints = config.get('SUGGEST_ENDPOINTS', 'suggestqueries')
+        if isinstance(endpoints, str):
+            endpoints = [name.strip() for name in endpoints.split(',') if name.strip()]
+        cache = None
+        if config.get('SUGGEST_CACHE_ENABLED', True):
+            cache = get_response_cache(
+                'suggest_cache',
+                ttl_seconds=float(config.get('SUGGEST_CACHE_TTL_HOURS', 72)) * 3600,
+                max_bytes=int(float(config.get('SUGGEST_CACHE_MAX_MB', 20)) * 1024 * 1024)
+            )
+        return cls(session or get_http_session(config), rate_limiter or get_rate_limiter(config),
+                   retry_policy or get_retry_policy(config),
+                   max_workers=config.get('SUGGEST_CONCURRENCY', 8),
+                   endpoints=endpoints,
+                   timeout=config.get('REQUEST_TIMEOUT', 10),
+                   cache=cache)
+
+    def _count_stat(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def get_stats(self) -> Dict:
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def fetch(self, query: str, country: str = 'US', language: str = 'en',
+              endpoint: str = 'suggestqueries',
+              request_budget: Optional[Callable[[], bool]] = None) -> Optional[List[str]]:
+        """
+        Sugerencias de una consulta (caché o petición); FailedSuggestions vacía si falla
+
+        request_budget() se consulta antes de cada petición real, reintentos
+        incluidos, y debe reservar el hueco de forma atómica. Si lo niega la
+        consulta se abandona y se devuelve None.
+        """
+        cache_key = None
+        if self.cache:
+            cache_key = ResponseCache.make_key(endpoint, query, language.lower(), country.lower())
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._count_stat('suggest_cache_hits')
+                return cached
+
+        params = {
+            'client': 'firefox',
+            'q': query,
+            'hl': language.lower(),
+            'gl': country.upper() if endpoint == 'suggestqueries' else country.lower(),
+        }
+        if endpoint == 'suggestqueries':
+            params['ds'] = 'yt'  # También incluya búsquedas de YouTube
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:91.0) Gecko/20100101 Firefox/91.0',
+            'Accept': '*/*',
+            'Accept-Language': f'{language.lower()}-{country.lower()},{language.lower()};q=0.9',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        }
+
+        def request():
+            if request_budget and not request_budget():
+                raise RequestBudgetExhausted(query)
+            self._count_stat('suggest_requests')
+            self.rate_limiter.acquire(API_SUGGEST)
+            return self.session.get(SUGGEST_ENDPOINTS[endpoint], params=params, headers=headers,
+                                    timeout=self.timeout)
+
+        try:
+            response = self.retry_policy.call(request, 'Google Suggest')
+        except RequestBudgetExhausted:
+            return None
+        except Exception as e:
+            self.logger.warning(f"Error conectando con Google Suggest ({endpoint}) para '{query}': {e}")
+            return FailedSuggestions()
+
+        if response.status_code != 200:
+            self.logger.warning(f"Sugerencias HTTP {response.status_code} para '{query}'")
+            return FailedSuggestions()
+        suggestions = parse_suggest_response(response.text)
+        if suggestions is None:
+            self.logger.warning(f"La respuesta de Google Suggest no es JSON válida para '{query}'")
+            return FailedSuggestions()
+        # Solo respuestas válidas: un fallo no debe quedar cacheado como "sin sugerencias"
+        if cache_key:
+            self.cache.set(cache_key, suggestions)
+        return suggestions
+
+    def fetch_many(self, queries: Iterable[str], country: str = 'US', language: str = 'en',
+                   request_budget: Optional[Callable[[], bool]] = None) -> List[Optional[List[str]]]:
+        """
+        Lanza en paralelo cada consulta contra cada endpoint configurado
+
+        Returns:
+            list: sugerencias de cada consulta (endpoints fusionados), en el
+            mismo orden que `queries`; None en las que request_budget dejó
+            sin completar y FailedSuggestions (con lo que sí llegó) en las
+            que falló algún endpoint
+        """
+        queries = list(queries)
+        jobs = [(query, endpoint) for query in queries for endpoint in self.endpoints]
+        if not jobs:
+            return []
+
+        workers = min(self.max_workers, len(jobs))
+        if workers <= 1:
+            responses = [self.fetch(query, country, language, endpoint, request_budget)
+                         for query, endpoint in jobs]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                responses = list(executor.map(
+                    lambda job: self.fetch(job[0], country, language, job[1], request_budget), jobs))
+
+        merged = [[] for _ in queries]
+        for index, suggestions in enumerate(responses):
+            query_index = index // len(self.endpoints)
+            if suggestions is None or merged[query_index] is None:
+                merged[query_index] = None
+            elif isinstance(suggestions, FailedSuggestions):
+                merged[query_index] = FailedSuggestions(merged[query_index] + suggestions)
+            else:
+                merged[query_index].extend(suggestions)
+        return merged
+
+    def suggest(self, base_keyword: str, country: str = 'US', language: str = 'en',
+                max_suggestions: Optional[int] = 25, connectors: Optional[Sequence[str]] = None) -> List[str]:
+        """
+        Sugerencias para una keyword y sus variaciones con conectores
+
+        Se descartan la propia keyword, las que apenas la amplían y las que la
+        repiten; los duplicados (sin distinguir mayúsculas) se eliminan
+        conservando el orden de las variaciones. max_suggestions=None no limita.
+        """
+        connectors = DEFAULT_CONNECTORS if connectors is None else connectors
+        variations = [base_keyword] + [f"{base_keyword} {connector}" for connector in connectors]
+        self.logger.info(f"🔍 Obteniendo sugerencias para: '{base_keyword}' ({len(variations)} variaciones)")
+
+        base_lower = base_keyword.lower()
+        seen = set()
+        unique_suggestions = []
+        for suggestions in self.fetch_many(variations, country, language):
+            for suggestion in suggestions:
+                lower = suggestion.lower()
+                if (len(suggestion) <= len(base_keyword) + 1 or   # Al menos 2 caracteres adicionales
+                        lower == base_lower or                     # No igual a la palabra base
+                        lower.startswith(f"{base_lower} {base_lower}") or  # Evitar duplicados
+                        lower in seen):
+                    continue
+                seen.add(lower)
+                unique_suggestions.append(suggestion)
+
+        final_suggestions = unique_suggestions[:max_suggestions]
+        self.logger.info(f"✅ Obtenidas {len(final_suggestions)} sugerencias únicas de Google Suggest")
+        return final_suggestions
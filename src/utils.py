@@ -4,13 +4,37 @@ Utilidades para el scraper de keywords y posiciones
 
 import os
 import json
-import pandas as pd
+import unicodedata
 from pathlib import Path
 import time
-from urllib.parse import urlparse
-from collections import Counter
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+
+def normalize_keyword(keyword, fold_accents=False):
+    """
+    Forma canónica de una keyword: dos keywords con la misma forma producen
+    la misma consulta en Google (NFKC, case-folding y espacios colapsados;
+    opcionalmente sin acentos)
+    """
+    normalized = unicodedata.normalize('NFKC', keyword).casefold()
+    if fold_accents:
+        decomposed = unicodedata.normalize('NFD', normalized)
+        normalized = unicodedata.normalize('NFC', ''.join(c for c in decomposed if not unicodedata.combining(c)))
+    return ' '.join(normalized.split())
+
+
+def domain_matches(result_domain, domain):
+    """
+    El dominio de un resultado es `domain` o un subdominio suyo: "blog.midominio.com"
+    cuenta para "midominio.com" (y para "www.midominio.com"), "otromidominio.com" no
+    """
+    result_domain = (result_domain or '').lower().split(':')[0].rstrip('.')
+    domain = (domain or '').strip().lower().rstrip('.')
+    if domain.startswith('www.'):
+        domain = domain[4:]
+    if not domain:
+        return False
+    return result_domain == domain or result_domain.endswith('.' + domain)
+
 
 class KeywordManager:
     """Gestor de keywords"""
@@ -60,6 +84,27 @@ class KeywordManager:
                 unique_keywords.append(keyword)
         return unique_keywords
     
+    @staticmethod
+    def group_equivalent_keywords(keywords, fold_accents=False):
+        """
+        Agrupa las keywords que producen la misma consulta
+
+        Returns:
+            dict: {consulta: [grafías originales]} en orden de primera aparición;
+            la consulta es la primera grafía con los espacios colapsados
+        """
+        groups = {}
+        query_by_form = {}
+        for keyword in keywords:
+            form = normalize_keyword(keyword, fold_accents)
+            if not form:
+                continue
+            query = query_by_form.setdefault(form, ' '.join(keyword.split()))
+            spellings = groups.setdefault(query, [])
+            if keyword not in spellings:
+                spellings.append(keyword)
+        return groups
+
     @staticmethod
     def filter_keywords(keywords, min_length=3, max_length=100, exclude_words=None):
         """Filtra keywords por criterios"""
@@ -89,6 +134,8 @@ class ResultsAnalyzer:
     
     def load_results(self, file_path):
         """Carga resultados desde archivo CSV o JSON"""
+        import pandas as pd
+
         try:
             if file_path.endswith('.csv'):
                 return pd.read_csv(file_path)
@@ -0,0 +1,183 @@
+"""
+Generador de variantes long-tail vectorizado
+Las combinaciones keyword × plantilla se construyen por bloques con NumPy y
+se deduplican con una única estructura global, conservando un orden
+determinista; la salida puede escribirse a disco bloque a bloque
+"""
+
+import os
+import logging
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Palabras comunes para prefixes (antes)
+DEFAULT_PREFIXES = [
+    "mejor", "como", "donde", "precio", "comprar", "tutorial", "guía", "ejemplos",
+    "tips", "formulario", "requisitos", "procesos", "sistema", "estándar", "normas",
+    "últimas", "nuevo", "actual", "completo", "fácil", "rápido", "sin", "con",
+    "para", "por", "gratis", "barato", "profesional", "certificado"
+]
+
+# Palabras comunes para suffixes (después)
+DEFAULT_SUFFIXES = [
+    "españa", "madrid", "barcelona", "online", "internet", "web", "app", "móvil",
+    "2025", "2024", "actual", "nuevo", "paso a paso", "gratuito", "fácil", "rápido",
+    "barato", "profesional", "certificado", "autorizado", "oficial", "sistema",
+    "completo", "integral", "total", "incluye", "descuento", "oferta", "promoción"
+]
+
+# Condiciones de aplicación de una plantilla según la keyword base
+ALWAYS = 'always'
+SHORT = 'short'      # 2 palabras o menos
+SINGLE = 'single'    # una sola palabra de menos de 10 caracteres
+_PERMISSIVENESS = {SINGLE: 0, SHORT: 1, ALWAYS: 2}
+
+# Biblioteca de plantillas por intención: (plantilla, condición)
+TEMPLATE_LIBRARY = {
+    'base': [
+        ("{kw} 2025", SHORT), ("mejor {kw}", SHORT), ("{kw} paso a paso", SHORT), ("como {kw}", SHORT),
+        ("donde {kw}", SHORT), ("precio {kw}", SHORT), ("{kw} online", SHORT), ("{kw} gratuito", SHORT),
+        ("comprar {kw}", SHORT), ("{kw} barato", SHORT), ("{kw} profesional", SHORT),
+    ],
+    'local': [
+        ("{kw} en españa", SINGLE), ("{kw} madrid", SINGLE), ("{kw} barcelona", SINGLE),
+        ("{kw} valencia", SINGLE), ("{kw} sevilla", SINGLE), ("{kw} cerca de mi", SHORT),
+    ],
+    'formacion': [
+        ("cursillo {kw}", SINGLE), ("curso {kw}", SINGLE), ("temario {kw}", SINGLE),
+        ("certificación {kw}", SINGLE), ("{kw} para principiantes", SHORT), ("{kw} pdf", SHORT),
+    ],
+    'informacional': [
+        ("que es {kw}", SHORT), ("para que sirve {kw}", SINGLE), ("tipos de {kw}", SHORT),
+        ("{kw} ejemplos", SHORT), ("{kw} ventajas", SHORT), ("{kw} opiniones", SHORT),
+    ],
+    'transaccional': [
+        ("{kw} oferta", SHORT), ("{kw} descuento", SHORT), ("{kw} precio", SHORT),
+        ("{kw} comparativa", SHORT), ("alternativas a {kw}", SHORT),
+    ],
+}
+
+# Máximo de palabras de una variante
+MAX_WORDS = 4
+
+
+def _split_template(template: str) -> Tuple[str, str]:
+    """'mejor {kw} online' -> ('mejor ', ' online')"""
+    prefix, _, suffix = template.partition('{kw}')
+    return prefix, suffix
+
+
+class VariantGenerator:
+    """
+    Genera variantes de muchas keywords a la vez
+
+    Args:
+        prefix_words / suffix_words: palabras que se anteponen / añaden a cada
+            keyword (None = listas por defecto, [] = ninguna)
+        categories: categorías de TEMPLATE_LIBRARY a aplicar (None = todas)
+        max_variants_per_keyword: variantes por keyword base, incluida ella misma
+        chunk_size: keywords base por bloque vectorizado
+    """
+
+    def __init__(self, prefix_words: Optional[Sequence[str]] = None, suffix_words: Optional[Sequence[str]] = None,
+                 categories: Optional[Iterable[str]] = None, max_variants_per_keyword: int = 20,
+                 chunk_size: int = 2000):
+        self.logger = logging.getLogger(__name__)
+        self.max_variants_per_keyword = max(1, int(max_variants_per_keyword))
+        self.chunk_size = max(1, int(chunk_size))
+
+        templates = []
+        for category in (categories or TEMPLATE_LIBRARY):
+            templates.extend(TEMPLATE_LIBRARY[category])
+        prefix_words = DEFAULT_PREFIXES if prefix_words is None else prefix_words
+        suffix_words = DEFAULT_SUFFIXES if suffix_words is None else suffix_words
+        templates.extend((f"{word.strip()} {{kw}}", ALWAYS) for word in prefix_words if word.strip())
+        templates.extend((f"{{kw}} {word.strip()}", ALWAYS) for word in suffix_words if word.strip())
+
+        # La propia keyword va primero en cada fila; plantillas repetidas (sin
+        # distinguir mayúsculas) solo cuentan una vez para el límite por keyword
+        templates.insert(0, ("{kw}", ALWAYS))
+        unique_templates = {}
+        for template, condition in templates:
+            key = template.lower()
+            if key not in unique_templates:
+                unique_templates[key] = (template, condition)
+            elif _PERMISSIVENESS[condition] > _PERMISSIVENESS[unique_templates[key][1]]:
+                # Se conserva la posición de la primera y la condición más permisiva
+                unique_templates[key] = (unique_templates[key][0], condition)
+        templates = list(unique_templates.values())
+
+        parts = [_split_template(template) for template, _ in templates]
+        self.prefixes = np.array([prefix for prefix, _ in parts], dtype=str)
+        self.suffixes = np.array([suffix for _, suffix in parts], dtype=str)
+        self.lower_prefixes = np.strings.lower(self.prefixes)
+        self.lower_suffixes = np.strings.lower(self.suffixes)
+        self.conditions = np.array([condition for _, condition in templates])
+        self.template_words = np.array([len((prefix + suffix).split()) for prefix, suffix in parts])
+
+    def _chunk_variants(self, keywords: List[str], seen: set) -> List[str]:
+        """Variantes de un bloque de keywords, sin las ya vistas (en este u otros bloques)"""
+        base = np.array(keywords, dtype=str)
+        words = np.array([len(keyword.split()) for keyword in keywords])
+        lengths = np.strings.str_len(base)
+
+        # Máscara keywords × plantillas de las combinaciones aplicables
+        short = (words <= 2)[:, None]
+        single = ((words == 1) & (lengths < 10))[:, None]
+        keep = ((self.conditions == ALWAYS)[None, :]
+                | ((self.conditions == SHORT)[None, :] & short)
+                | ((self.conditions == SINGLE)[None, :] & single))
+        keep &= (words[:, None] + self.template_words[None, :]) <= MAX_WORDS
+        keep[:, 0] = True
+
+        # Límite por keyword según el orden de las plantillas
+        keep &= np.cumsum(keep, axis=1) <= self.max_variants_per_keyword
+
+        # Solo se construyen las combinaciones que se conservan (orden: fila y plantilla)
+        rows, columns = np.nonzero(keep)
+        variants = np.strings.add(np.strings.add(self.prefixes[columns], base[rows]), self.suffixes[columns])
+        lower_base = np.strings.lower(base)
+        keys = np.strings.add(np.strings.add(self.lower_prefixes[columns], lower_base[rows]),
+                              self.lower_suffixes[columns])
+
+        # Deduplicación global sin distinguir mayúsculas: primera aparición
+        unique_variants = []
+        for variant, key in zip(variants.tolist(), keys.tolist()):
+            if key not in seen:
+                seen.add(key)
+                unique_variants.append(variant)
+        return unique_variants
+
+    def iter_variants(self, keywords: Iterable[str]) -> Iterator[List[str]]:
+        """Variantes únicas bloque a bloque, en orden de keywords base y plantillas"""
+        seen = set()
+        chunk = []
+        for keyword in keywords:
+            keyword = ' '.join(str(keyword).split())
+            if not keyword:
+                continue
+            chunk.append(keyword)
+            if len(chunk) >= self.chunk_size:
+                yield self._chunk_variants(chunk, seen)
+                chunk = []
+        if chunk:
+            yield self._chunk_variants(chunk, seen)
+
+    def generate(self, keywords: Iterable[str]) -> List[str]:
+        """Todas las variantes únicas en una lista"""
+        variants = []
+        for chunk in self.iter_variants(keywords):
+            variants.extend(chunk)
+        return variants
+
+    def write(self, keywords: Iterable[str], path: str) -> int:
+        """Escribe las variantes en `path` (una por línea) según se generan; devuelve cuántas"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        total = 0
+        with open(path, 'w', encoding='utf-8') as f:
+            for chunk in self.iter_variants(keywords):
+                if chunk:
+                    f.write('\n'.join(chunk) + '\n')
+                    total += len(chunk)
+        return total
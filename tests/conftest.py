@@ -0,0 +1,71 @@
+"""
+Configuración común de los tests
+Los módulos de src/ se importan por nombre (igual que desde run_cli.py) y
+cada test trabaja en un directorio temporal: ni el ledger de cuota, ni las
+cachés, ni los proyectos o reportes tocan los ficheros reales del proyecto
+"""
+
+import os
+import sys
+import logging
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+sys.path.insert(0, ROOT_DIR)
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Directorio de trabajo temporal (ProjectManager y ReportManager usan rutas relativas)"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def stub():
+    from benchmarks.customsearch_stub import CustomSearchStub
+
+    def start(**options):
+        server = CustomSearchStub(**options).start()
+        started.append(server)
+        return server
+
+    started = []
+    yield start
+    for server in started:
+        server.stop()
+
+
+@pytest.fixture
+def make_scraper(workdir, monkeypatch):
+    """StealthSerpScraper contra el stub, sin cachés, sin esperas y con un ledger temporal"""
+    from config.settings import config
+    from rate_limiter import get_rate_limiter, QuotaLedger
+    from stealth_scraper import StealthSerpScraper
+
+    # Con un handler en el logger raíz basicConfig no abre logs/scraper.log
+    logging.getLogger().addHandler(logging.NullHandler())
+    monkeypatch.setattr(get_rate_limiter(), 'ledger', QuotaLedger(str(workdir / 'quota_ledger.json')))
+
+    def make(endpoint, **overrides):
+        scraper_config = config.copy()
+        scraper_config.update({
+            'GOOGLE_API_KEY': 'test-key',
+            'GOOGLE_SEARCH_ENGINE_ID': 'test-cx',
+            'GOOGLE_API_CREDENTIALS': [],
+            'GOOGLE_API_ENDPOINT': endpoint,
+            'MIN_KEYWORD_DELAY': 0,
+            'MAX_KEYWORD_DELAY': 0,
+            'MAX_REQUESTS_PER_SECOND': 0,
+            'CUSTOM_SEARCH_PER_MINUTE': 10 ** 9,
+            'CUSTOM_SEARCH_PER_DAY': 0,
+            'SERP_CACHE_ENABLED': False,
+            'SUGGEST_CACHE_ENABLED': False,
+            'RETRY_BASE_DELAY': 0,
+        })
+        scraper_config.update(overrides)
+        return StealthSerpScraper(scraper_config)
+
+    return make
@@ -0,0 +1,68 @@
+import json
+import argparse
+
+import pytest
+
+import cli
+from run_journal import RunJournal
+
+
+@pytest.fixture
+def run(make_scraper, tmp_path, capsys, monkeypatch):
+    """Lanza cli.execute_run y devuelve (código de salida, eventos JSON emitidos)"""
+    monkeypatch.setattr(cli.StopSignal, 'install', lambda self: None)
+
+    def execute(endpoint, keywords, **overrides):
+        scraper_config = make_scraper(endpoint, **overrides).config
+        args = argparse.Namespace(log_level='WARNING', no_save=True, concurrency=1, refresh=None, find_first=None)
+        journal = RunJournal(runs_dir=str(tmp_path / 'runs'))
+        journal.start(keywords, 'target.com', 1)
+        code = cli.execute_run(args, journal, keywords, 'target.com', 1, scraper_config=scraper_config)
+        events = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        return code, events
+
+    return execute
+
+
+def test_run_accepts_extra_credentials_without_primary_key(stub, run):
+    server = stub(target_position=4)
+    code, events = run(server.endpoint, ['uno', 'dos'], GOOGLE_API_KEY='', GOOGLE_SEARCH_ENGINE_ID='',
+                       GOOGLE_API_CREDENTIALS=[{'api_key': 'key-1', 'search_engine_id': 'cx-1'}])
+
+    assert code == cli.EXIT_OK
+    done = events[-1]
+    assert done['event'] == 'done' and done['status'] == 'completed' and done['results'] == 20
+    keyword_events = [event for event in events if event['event'] == 'keyword']
+    assert len(keyword_events) == 2
+    assert all(event['target_position'] is not None for event in keyword_events)
+
+
+def test_run_without_any_credential_fails(stub, run):
+    server = stub()
+    code, events = run(server.endpoint, ['uno'], GOOGLE_API_KEY='', GOOGLE_SEARCH_ENGINE_ID='',
+                       GOOGLE_API_CREDENTIALS=[])
+
+    assert code == cli.EXIT_ERROR
+    assert events[-1]['event'] == 'error'
+    assert server.counters['requests'] == 0
+
+
+def test_run_with_failed_pages_is_incomplete(stub, run, monkeypatch):
+    from rate_limiter import get_rate_limiter
+
+    monkeypatch.setattr(get_rate_limiter(), 'penalize', lambda *args, **kwargs: None)
+    server = stub(rate_limit_every=1)
+    code, events = run(server.endpoint, ['uno'], RETRY_MAX_ATTEMPTS=2)
+
+    assert code == cli.EXIT_INCOMPLETE
+    assert events[-1]['event'] == 'done' and events[-1]['status'] == 'incomplete'
+
+
+def test_main_resolves_user_files_and_leaves_no_folders_behind(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'semillas.txt').write_text('seguro\ncoche\n', encoding='utf-8')
+
+    assert cli.main(['variants', '--keywords', 'semillas.txt', '--output', 'variantes.txt']) == cli.EXIT_OK
+    done = json.loads(capsys.readouterr().out.splitlines()[-1])
+    assert done['output'] == str(tmp_path / 'variantes.txt')
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['semillas.txt', 'variantes.txt']
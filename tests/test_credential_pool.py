@@ -0,0 +1,80 @@
+import pytest
+
+from credential_pool import STRATEGY_LEAST_USED, CredentialPool
+from rate_limiter import API_CUSTOM_SEARCH, QuotaLedger, RateLimiter
+
+
+@pytest.fixture
+def limiter(tmp_path):
+    limiter = RateLimiter(QuotaLedger(str(tmp_path / 'quota_ledger.json')))
+    limiter.configure({'CUSTOM_SEARCH_PER_MINUTE': 10 ** 6, 'CUSTOM_SEARCH_PER_DAY': 2})
+    return limiter
+
+
+def make_config(**overrides):
+    config = {
+        'GOOGLE_API_KEY': 'key-a',
+        'GOOGLE_SEARCH_ENGINE_ID': 'cx-default',
+        'GOOGLE_API_CREDENTIALS': [
+            {'api_key': 'key-b', 'search_engine_id': 'cx-b'},
+            {'api_key': 'key-c', 'search_engine_id': ''},
+            {'api_key': 'key-a', 'search_engine_id': 'cx-dup'},
+        ],
+    }
+    config.update(overrides)
+    return config
+
+
+def test_from_config_deduplicates_and_inherits_default_engine():
+    pool = CredentialPool.from_config(make_config())
+    assert [(c.api_key, c.search_engine_id) for c in pool.credentials] == [
+        ('key-a', 'cx-default'), ('key-b', 'cx-b'), ('key-c', 'cx-default')]
+
+
+def test_from_config_accepts_only_extra_credentials():
+    pool = CredentialPool.from_config(make_config(GOOGLE_API_KEY='', GOOGLE_SEARCH_ENGINE_ID='', GOOGLE_API_CREDENTIALS=[
+        {'api_key': 'key-b', 'search_engine_id': 'cx-b'},
+        {'api_key': 'key-c', 'search_engine_id': ''},
+    ]))
+    assert [c.api_key for c in pool.credentials] == ['key-b']
+
+
+def test_round_robin_rotates_credentials():
+    pool = CredentialPool.from_config(make_config())
+    assert [pool.acquire().api_key for _ in range(4)] == ['key-a', 'key-b', 'key-c', 'key-a']
+
+
+def test_failover_when_a_key_spends_its_daily_budget(limiter):
+    pool = CredentialPool.from_config(make_config(GOOGLE_API_CREDENTIALS=[
+        {'api_key': 'key-b', 'search_engine_id': 'cx-b'}]), limiter)
+
+    used = []
+    while True:
+        credential = pool.acquire()
+        if credential is None:
+            break
+        limiter.acquire(API_CUSTOM_SEARCH, credential.api_key)
+        used.append(credential.api_key)
+
+    # 2 consultas por key y después ninguna disponible
+    assert sorted(used) == ['key-a', 'key-a', 'key-b', 'key-b']
+    assert [status['available'] for status in pool.status()] == [False, False]
+
+
+def test_mark_exhausted_removes_key_until_tomorrow():
+    pool = CredentialPool.from_config(make_config(GOOGLE_API_CREDENTIALS=[
+        {'api_key': 'key-b', 'search_engine_id': 'cx-b'}]))
+    first = pool.acquire()
+    pool.mark_exhausted(first)
+    assert {pool.acquire().api_key for _ in range(3)} == {'key-b'}
+
+    pool.mark_exhausted(pool.credentials[1])
+    assert pool.acquire() is None
+
+
+def test_least_used_prefers_key_with_fewer_queries_today(limiter):
+    pool = CredentialPool.from_config(make_config(CREDENTIAL_SELECTION=STRATEGY_LEAST_USED,
+                                                  GOOGLE_API_CREDENTIALS=[
+                                                      {'api_key': 'key-b', 'search_engine_id': 'cx-b'}]), limiter)
+    limiter.acquire(API_CUSTOM_SEARCH, 'key-a')
+    assert pool.acquire().api_key == 'key-b'
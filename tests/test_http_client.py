@@ -0,0 +1,25 @@
+from http_client import create_session, get_http_session, get_pool_stats
+
+
+def test_keep_alive_connections_are_reused(stub):
+    server = stub(target_position=0)
+    session = create_session(pool_maxsize=2)
+    before = get_pool_stats()
+    for start in range(1, 51, 10):
+        response = session.get(server.endpoint, params={'q': 'zapatos', 'start': start, 'num': 10})
+        assert response.status_code == 200
+    after = get_pool_stats()
+
+    assert after['requests'] - before['requests'] == 5
+    assert after['connections_opened'] - before['connections_opened'] == 1
+    assert after['pool_hits'] - before['pool_hits'] == 4
+    assert 0 < after['pool_hit_ratio'] <= 1
+
+
+def test_pool_stats_without_requests():
+    stats = get_pool_stats()
+    assert stats['pool_hits'] == max(0, stats['requests'] - stats['connections_opened'])
+
+
+def test_shared_session_is_created_once():
+    assert get_http_session({'HTTP_POOL_MAXSIZE': 5}) is get_http_session()
@@ -0,0 +1,132 @@
+import threading
+
+from keyword_expander import KeywordExpander
+from suggest_engine import FailedSuggestions
+
+
+class FakeEngine:
+    """
+    Motor de Suggest simulado: cada consulta falla una vez y se reintenta,
+    pidiendo hueco a request_budget antes de cada intento como SuggestEngine
+    """
+
+    def __init__(self, attempts_per_query=2):
+        self.endpoints = ['suggestqueries']
+        self.max_workers = 4
+        self.attempts_per_query = attempts_per_query
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def fetch_many(self, queries, country='US', language='en', request_budget=None):
+        responses = []
+        for query in queries:
+            suggestions = [f"{query} uno", f"{query} dos"]
+            for _ in range(self.attempts_per_query):
+                if request_budget and not request_budget():
+                    suggestions = None
+                    break
+                with self._lock:
+                    self.sent.append(query)
+            responses.append(suggestions)
+        return responses
+
+
+def make_expander(engine, **options):
+    options.setdefault('alphabet', ['a', 'b'])
+    options.setdefault('connectors', ['para'])
+    return KeywordExpander(engine, **options)
+
+
+def test_request_cap_counts_retries_and_is_never_exceeded():
+    for cap in (1, 5, 7, 12):
+        engine = FakeEngine()
+        expander = make_expander(engine, max_depth=3, max_requests=cap)
+        expander.expand(['zapatos'])
+        assert len(engine.sent) <= cap
+        assert expander.stats['requests'] == len(engine.sent)
+
+
+def test_expansion_stops_when_request_cap_is_reached():
+    engine = FakeEngine(attempts_per_query=1)
+    expander = make_expander(engine, max_depth=3, max_requests=4)
+    discovered = expander.expand(['zapatos'])
+
+    assert len(engine.sent) == 4
+    assert len(discovered) == 8
+    # Las consultas que el tope dejó sin hacer no quedan guardadas como respuestas vacías
+    assert len(expander.responses) == 4
+
+
+def test_queries_use_original_text_and_dedupe_by_normalized_form():
+    engine = FakeEngine(attempts_per_query=1)
+    expander = make_expander(engine, max_depth=1, max_requests=100)
+    discovered = expander.expand(['Camión Grúa', '  camión   grúa '])
+
+    assert engine.sent[0] == 'Camión Grúa'
+    assert 'camión grúa' not in engine.sent
+    assert len(engine.sent) == 4  # la semilla, "a", "b" y "para", una sola vez
+    assert discovered[0] == {'keyword': 'Camión Grúa uno', 'depth': 1, 'parent': 'Camión Grúa', 'seed': 'Camión Grúa'}
+
+
+def test_repeated_expansion_reuses_responses():
+    engine = FakeEngine(attempts_per_query=1)
+    expander = make_expander(engine, max_depth=1, max_requests=100)
+    first = expander.expand(['zapatos'])
+    sent = len(engine.sent)
+
+    second = expander.expand(['ZAPATOS'])
+    assert len(engine.sent) == sent
+    assert expander.stats['requests'] == 0
+    assert expander.stats['cached_queries'] == sent
+    assert [r['keyword'] for r in second] == [r['keyword'] for r in first]
+
+
+def test_max_keywords_limits_discoveries():
+    engine = FakeEngine(attempts_per_query=1)
+    seen = []
+    expander = make_expander(engine, max_depth=3, max_requests=100, max_keywords=5)
+    discovered = expander.expand(['zapatos'], on_keyword=seen.append)
+    assert len(discovered) == 5
+    assert seen == discovered
+
+
+class FlakyEngine(FakeEngine):
+    """Motor simulado cuyas consultas de `failing` fallan (como SuggestEngine, con FailedSuggestions)"""
+
+    def __init__(self, failing=()):
+        super().__init__(attempts_per_query=1)
+        self.failing = set(failing)
+        self.locales = []
+
+    def fetch_many(self, queries, country='US', language='en', request_budget=None):
+        self.locales.append((country, language))
+        responses = super().fetch_many(queries, country, language, request_budget)
+        return [FailedSuggestions() if query in self.failing else suggestions
+                for query, suggestions in zip(queries, responses)]
+
+
+def test_responses_are_kept_apart_per_locale():
+    engine = FlakyEngine()
+    expander = make_expander(engine, max_depth=1, max_requests=100)
+    expander.expand(['zapatos'], 'US', 'en')
+    sent = len(engine.sent)
+
+    expander.expand(['zapatos'], 'ES', 'es')
+    assert len(engine.sent) == 2 * sent
+    assert engine.locales[-1] == ('ES', 'es')
+
+    expander.expand(['zapatos'], 'es', 'ES')
+    assert len(engine.sent) == 2 * sent
+
+
+def test_failed_queries_are_not_memoized():
+    engine = FlakyEngine(failing=['zapatos a'])
+    expander = make_expander(engine, max_depth=1, max_requests=100)
+    first = expander.expand(['zapatos'])
+    assert 'zapatos a uno' not in [r['keyword'] for r in first]
+
+    engine.failing.clear()
+    second = expander.expand(['zapatos'])
+    assert engine.sent[-1] == 'zapatos a'
+    assert expander.stats['requests'] == 1
+    assert 'zapatos a uno' in [r['keyword'] for r in second]
@@ -0,0 +1,72 @@
+import pytest
+
+from keyword_scoring import SCORE_COLUMNS, score_keywords
+from variant_generator import VariantGenerator
+
+
+def score_one(keyword):
+    """Heurística por keyword anterior a score_keywords (referencia de paridad)"""
+    score = 3.0
+    keyword_length = len(keyword)
+    word_count = len(keyword.split())
+    has_geo_terms = any(term in keyword.lower() for term in ['españa', 'madrid', 'barcelona', 'español', 'castellano'])
+    has_commercial_intent = any(term in keyword.lower() for term in ['comprar', 'precio', 'barato', 'venta', 'oferta',
+                                                                      'promocia'])
+    has_long_tail = word_count >= 3
+
+    if has_long_tail:
+        score -= 1.0
+    if keyword_length < 10:
+        score += 1.0
+    if has_geo_terms:
+        score -= 0.5
+    if has_commercial_intent:
+        score += 2.0
+    if word_count == 1:
+        score += 3.0
+
+    if keyword_length < 10:
+        volume_multiplier = 5.0
+    elif keyword_length < 20:
+        volume_multiplier = 2.0
+    elif keyword_length < 30:
+        volume_multiplier = 1.0
+    else:
+        volume_multiplier = 0.5
+    if has_commercial_intent:
+        volume_multiplier *= 1.5
+    if has_geo_terms:
+        volume_multiplier *= 0.7
+
+    difficulty = min(100, score * 12 + (word_count - 1) * 5)
+    opportunity = max(0, 100 - difficulty)
+    if has_long_tail:
+        opportunity += 10
+
+    return {
+        'keyword': keyword,
+        'competition_score': round(score, 1),
+        'estimated_volume': int(1000 * volume_multiplier),
+        'difficulty': round(difficulty, 0),
+        'opportunity_score': round(opportunity, 0),
+    }
+
+
+def test_batch_scores_match_the_per_keyword_scorer():
+    keywords = VariantGenerator().generate(['seguro', 'comprar coche', 'abogado laboral madrid', 'Oferta',
+                                            'curso de contabilidad para principiantes en españa'])
+    frame = score_keywords(keywords)
+    assert list(frame.columns) == SCORE_COLUMNS
+    assert frame.to_dict('records') == [score_one(keyword) for keyword in keywords]
+
+
+def test_empty_input_returns_an_empty_frame():
+    frame = score_keywords([])
+    assert frame.empty and list(frame.columns) == SCORE_COLUMNS
+
+
+@pytest.mark.parametrize('keyword', ['seguro', 'precio seguro coche barcelona', 'x' * 40])
+def test_single_keyword_wrapper_returns_the_same_dict(make_scraper, keyword):
+    result = make_scraper('http://127.0.0.1:9/customsearch/v1').analyze_keyword_competitiveness(keyword)
+    assert result == score_one(keyword)
+    assert type(result['estimated_volume']) is int
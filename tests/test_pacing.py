@@ -0,0 +1,52 @@
+import pytest
+
+from pacing import AdaptivePacer
+
+
+def test_delay_decreases_additively_while_the_api_is_healthy():
+    pacer = AdaptivePacer(min_delay=1, max_delay=10, decrease_step=0.5)
+    pacer.delay = 3.0
+    for expected in (2.5, 2.0, 1.5, 1.0, 1.0):
+        pacer.record()
+        assert pacer.next_delay() == pytest.approx(expected)
+
+
+def test_delay_multiplies_on_throttling_up_to_the_maximum():
+    pacer = AdaptivePacer(min_delay=1, max_delay=10, increase_factor=2)
+    delays = []
+    for _ in range(5):
+        pacer.record(throttled=True)
+        delays.append(pacer.next_delay())
+    assert delays == [2, 4, 8, 10, 10]
+    assert pacer.throttled == 5
+
+
+def test_first_penalty_from_zero_uses_the_backoff_floor():
+    pacer = AdaptivePacer(min_delay=0, max_delay=30)
+    assert pacer.next_delay() == 0
+    pacer.record(throttled=True)
+    assert pacer.next_delay() == AdaptivePacer.BACKOFF_FLOOR
+
+
+def test_bounds_are_sanitised():
+    pacer = AdaptivePacer(min_delay=-3, max_delay=-1)
+    assert pacer.min_delay == 0 and pacer.max_delay == 0
+
+
+def test_reset_returns_to_the_minimum():
+    pacer = AdaptivePacer(min_delay=2, max_delay=30)
+    pacer.record(throttled=True)
+    pacer.reset()
+    assert pacer.next_delay() == 2 and pacer.keywords == 0
+
+
+def test_fixed_mode_keeps_the_classic_random_range():
+    pacer = AdaptivePacer.from_config({'ADAPTIVE_PACING': False, 'MIN_KEYWORD_DELAY': 3, 'MAX_KEYWORD_DELAY': 4})
+    pacer.record(throttled=True)
+    assert all(3 <= pacer.next_delay() <= 4 for _ in range(20))
+
+
+def test_wait_stops_when_asked():
+    pacer = AdaptivePacer()
+    assert pacer.wait(delay=0)
+    assert not pacer.wait(stop_callback=lambda: True, delay=5)
@@ -0,0 +1,125 @@
+import json
+import time
+import threading
+from datetime import date, timedelta
+
+import pytest
+
+from rate_limiter import (API_CUSTOM_SEARCH, API_SUGGEST, ARCHIVED_KEY, FREE_QUERIES_PER_DAY, LEDGER_KEEP_DAYS,
+                          QuotaExceededError, QuotaLedger, RateLimiter, TokenBucket, key_fingerprint)
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return QuotaLedger(str(tmp_path / 'quota_ledger.json'))
+
+
+def test_ledger_record_checks_and_increments_atomically(ledger):
+    accepted = []
+
+    def worker():
+        for _ in range(20):
+            if ledger.record(API_CUSTOM_SEARCH, 'key', per_day=50):
+                accepted.append(1)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(accepted) == 50
+    assert ledger.get_count(API_CUSTOM_SEARCH, 'key') == 50
+
+
+def test_ledger_debounces_writes_until_flush(tmp_path):
+    path = tmp_path / 'quota_ledger.json'
+    ledger = QuotaLedger(str(path), flush_interval=60)
+    ledger.record(API_CUSTOM_SEARCH, 'key')  # primera escritura: no hay ninguna reciente
+    ledger.record(API_CUSTOM_SEARCH, 'key')
+    ledger.record(API_CUSTOM_SEARCH, 'key')
+
+    on_disk = json.loads(path.read_text(encoding='utf-8'))
+    assert on_disk[date.today().isoformat()][API_CUSTOM_SEARCH]['key'] == 1
+
+    ledger.flush()
+    on_disk = json.loads(path.read_text(encoding='utf-8'))
+    assert on_disk[date.today().isoformat()][API_CUSTOM_SEARCH]['key'] == 3
+    assert not (tmp_path / 'quota_ledger.json.tmp').exists()
+
+
+def test_ledger_prunes_old_days_into_archived_totals(tmp_path):
+    path = tmp_path / 'quota_ledger.json'
+    old_day = (date.today() - timedelta(days=LEDGER_KEEP_DAYS + 3)).isoformat()
+    recent_day = (date.today() - timedelta(days=1)).isoformat()
+    path.write_text(json.dumps({
+        old_day: {API_CUSTOM_SEARCH: {'a': FREE_QUERIES_PER_DAY + 1000, 'b': 50}},
+        recent_day: {API_CUSTOM_SEARCH: {'a': 10}},
+    }), encoding='utf-8')
+
+    ledger = QuotaLedger(str(path))
+    ledger.record(API_CUSTOM_SEARCH, 'a')
+    ledger.flush()
+
+    data = json.loads(path.read_text(encoding='utf-8'))
+    assert old_day not in data
+    assert recent_day in data
+    assert data[ARCHIVED_KEY][API_CUSTOM_SEARCH]['queries'] == FREE_QUERIES_PER_DAY + 1050
+    # Los totales históricos siguen incluyendo los días archivados
+    assert ledger.get_total(API_CUSTOM_SEARCH) == FREE_QUERIES_PER_DAY + 1050 + 10 + 1
+    assert ledger.estimate_total_cost(API_CUSTOM_SEARCH) == pytest.approx(5.25)
+
+
+def test_free_quota_is_per_project_not_per_key(tmp_path):
+    ledger = QuotaLedger(str(tmp_path / 'quota_ledger.json'))
+    ledger.record(API_CUSTOM_SEARCH, 'a', count=80)
+    ledger.record(API_CUSTOM_SEARCH, 'b', count=80)
+    assert ledger.estimate_cost(API_CUSTOM_SEARCH) == pytest.approx(60 / 1000 * 5)
+
+    RateLimiter(ledger).configure({'CUSTOM_SEARCH_FREE_PROJECTS': 2})
+    assert ledger.estimate_cost(API_CUSTOM_SEARCH) == 0
+
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(rate=10, capacity=1)
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() > 0
+
+
+def test_global_bucket_is_shared_by_all_custom_search_keys(ledger):
+    limiter = RateLimiter(ledger)
+    limiter.configure({'MAX_REQUESTS_PER_SECOND': 10, 'CUSTOM_SEARCH_PER_MINUTE': 10 ** 6,
+                       'CUSTOM_SEARCH_PER_DAY': 0})
+
+    started = time.monotonic()
+    for i in range(30):
+        limiter.acquire(API_CUSTOM_SEARCH, f"key-{i % 4}")
+    elapsed = time.monotonic() - started
+
+    # 10/s entre todas las keys: ráfaga inicial de 10 y las otras 20 a 0,1s cada una
+    assert elapsed == pytest.approx(2.0, abs=0.3)
+
+
+def test_global_limit_does_not_throttle_suggest(ledger):
+    limiter = RateLimiter(ledger)
+    limiter.configure({'MAX_REQUESTS_PER_SECOND': 1, 'SUGGEST_PER_MINUTE': 10 ** 6, 'SUGGEST_BURST': 100})
+
+    started = time.monotonic()
+    for _ in range(20):
+        limiter.acquire(API_SUGGEST)
+    assert time.monotonic() - started < 0.5
+
+
+def test_acquire_raises_when_key_daily_budget_is_spent(ledger):
+    limiter = RateLimiter(ledger)
+    limiter.configure({'CUSTOM_SEARCH_PER_MINUTE': 10 ** 6, 'CUSTOM_SEARCH_PER_DAY': 3})
+
+    for _ in range(3):
+        assert limiter.acquire(API_CUSTOM_SEARCH, 'key-a')
+    with pytest.raises(QuotaExceededError):
+        limiter.acquire(API_CUSTOM_SEARCH, 'key-a')
+
+    # El presupuesto es por key
+    assert limiter.acquire(API_CUSTOM_SEARCH, 'key-b')
+    assert limiter.remaining_today(API_CUSTOM_SEARCH, 'key-a') == 0
+    assert ledger.get_count(API_CUSTOM_SEARCH, key_fingerprint('key-a')) == 3
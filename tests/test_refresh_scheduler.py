@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from project_manager import ProjectManager
+from refresh_scheduler import NOT_FOUND_POSITION, RefreshScheduler
+
+CHECKED_AT = datetime(2026, 1, 1, 10, 5)
+
+
+@pytest.fixture
+def project_id(workdir):
+    return ProjectManager().create_project('Tienda', 'example.com')
+
+
+def make_scheduler(project_id, **options):
+    options.setdefault('min_interval_hours', 24)
+    options.setdefault('max_interval_hours', 24)
+    return RefreshScheduler(project_id, ProjectManager(), **options)
+
+
+def found_at(position, domain='example.com'):
+    return [{'position': position, 'domain': domain}]
+
+
+def test_never_checked_keywords_are_due(project_id):
+    scheduler = make_scheduler(project_id)
+    assert scheduler.due_keywords(['nueva', 'otra']) == ['nueva', 'otra']
+
+
+def test_daily_run_a_few_minutes_early_still_refreshes(project_id):
+    scheduler = make_scheduler(project_id, grace_hours=1)
+    scheduler.record('zapatos', found_at(3), checked_at=CHECKED_AT)
+
+    # La ejecución de hoy arranca a las 10:00; la de ayer comprobó la keyword a las 10:05
+    assert scheduler.due_keywords(['zapatos'], now=CHECKED_AT + timedelta(hours=23, minutes=55)) == ['zapatos']
+    assert scheduler.due_keywords(['zapatos'], now=CHECKED_AT + timedelta(hours=22)) == []
+
+
+def test_without_grace_the_interval_is_strict(project_id):
+    scheduler = make_scheduler(project_id, grace_hours=0)
+    scheduler.record('zapatos', found_at(3), checked_at=CHECKED_AT)
+    assert scheduler.due_keywords(['zapatos'], now=CHECKED_AT + timedelta(hours=23, minutes=55)) == []
+
+
+def test_failed_fetch_does_not_touch_history(project_id):
+    scheduler = make_scheduler(project_id)
+    assert scheduler.record('zapatos', found_at(3), checked_at=CHECKED_AT)
+    assert not scheduler.record('zapatos', [], checked_at=CHECKED_AT + timedelta(days=1))
+
+    entry = scheduler.history['zapatos']
+    assert entry['positions'] == [3]
+    assert entry['last_checked'] == CHECKED_AT.isoformat()
+
+
+def test_volatile_keywords_get_shorter_intervals(project_id):
+    scheduler = make_scheduler(project_id, min_interval_hours=24, max_interval_hours=168)
+    for day, position in enumerate([3, 3, 3]):
+        scheduler.record('estable', found_at(position), checked_at=CHECKED_AT + timedelta(days=day))
+    for day, position in enumerate([2, 15, 6]):
+        scheduler.record('volatil', found_at(position), checked_at=CHECKED_AT + timedelta(days=day))
+
+    assert scheduler.interval_hours('estable') == 168
+    assert scheduler.interval_hours('volatil') == 24
+
+
+def test_history_survives_save_and_reload(project_id):
+    scheduler = make_scheduler(project_id)
+    scheduler.record('Zapatos', found_at(3), checked_at=CHECKED_AT)
+    scheduler.save()
+    assert make_scheduler(project_id).history['zapatos']['positions'] == [3]
+
+
+def test_position_matches_domain_and_subdomains_only(project_id):
+    scheduler = make_scheduler(project_id)
+    scheduler.record('a', found_at(4, 'www.example.com') + found_at(2, 'notexample.com'))
+    scheduler.record('b', found_at(1, 'example.com.evil.net'))
+    assert scheduler.history['a']['positions'] == [4]
+    assert scheduler.history['b']['positions'] == [NOT_FOUND_POSITION]
+
+
+def test_grouped_spellings_are_recorded_once_per_run(project_id, stub, make_scraper):
+    server = stub(target_domain='example.com', target_position=2)
+    scraper = make_scraper(server.endpoint)
+    scheduler = make_scheduler(project_id)
+    scraper.batch_position_check(['Zapatos', 'zapatos ', 'camión'], 'example.com', 1,
+                                 normalize=True, scheduler=scheduler)
+
+    assert server.counters['requests'] == 2
+    assert len(scheduler.history['zapatos']['positions']) == 1
+    assert len(scheduler.history['camión']['positions']) == 1
@@ -0,0 +1,80 @@
+import time
+
+import pytest
+
+from response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache('test_cache', cache_dir=str(tmp_path))
+
+
+def test_make_key_depends_on_every_part():
+    key = ResponseCache.make_key('cx-a', 'zapatos', 'us', 'en', 1, 10)
+    assert key == ResponseCache.make_key('cx-a', 'zapatos', 'us', 'en', 1, 10)
+    assert key != ResponseCache.make_key('cx-b', 'zapatos', 'us', 'en', 1, 10)
+
+
+def test_set_get_and_delete(cache):
+    cache.set('k', {'items': [{'link': 'https://a.com'}]})
+    assert cache.get('k') == {'items': [{'link': 'https://a.com'}]}
+    cache.delete('k')
+    assert cache.get('k') is None
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = ResponseCache('ttl_cache', ttl_seconds=0.05, cache_dir=str(tmp_path))
+    cache.set('k', [1])
+    time.sleep(0.1)
+    assert cache.get('k') is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache('small_cache', max_bytes=250, cache_dir=str(tmp_path))
+    for index in range(5):
+        cache.set(f"k{index}", 'x' * 60)
+        time.sleep(0.01)
+    assert cache.get('k0') is None
+    assert cache.get('k4') == 'x' * 60
+
+
+def stored_bytes(cache):
+    return cache._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+
+def test_byte_total_follows_inserts_replacements_and_evictions(tmp_path):
+    cache = ResponseCache('total_cache', max_bytes=400, cache_dir=str(tmp_path))
+    for index in range(10):
+        cache.set(f"k{index % 4}", 'x' * (20 + index * 10))
+        assert cache.stats()['bytes'] == stored_bytes(cache)
+    assert stored_bytes(cache) <= 400
+    cache.delete('k9')
+    cache.delete('k1')
+    assert cache.stats()['bytes'] == stored_bytes(cache)
+    cache.clear()
+    assert cache.stats() == {'entries': 0, 'bytes': 0}
+
+
+def test_byte_total_survives_reopening_and_expiry(tmp_path):
+    cache = ResponseCache('total_cache', ttl_seconds=0.05, cache_dir=str(tmp_path))
+    cache.set('a', 'x' * 50)
+    cache.close()
+
+    reopened = ResponseCache('total_cache', ttl_seconds=0.05, cache_dir=str(tmp_path))
+    assert reopened.stats()['bytes'] == 52
+    time.sleep(0.1)
+    assert reopened.get('a') is None
+    reopened.set('b', 'y')
+    assert reopened.stats() == {'entries': 1, 'bytes': 3}
+
+
+def test_shared_cache_reuses_one_connection(tmp_path):
+    from response_cache import get_response_cache
+
+    first = get_response_cache('shared_cache', cache_dir=str(tmp_path))
+    second = get_response_cache('shared_cache', ttl_seconds=60, cache_dir=str(tmp_path))
+    assert first is second and second.ttl_seconds == 60
+
+    first.close()
+    assert get_response_cache('shared_cache', cache_dir=str(tmp_path)) is not first
@@ -0,0 +1,58 @@
+import csv
+import json
+
+from result_sink import ResultSink, SessionSummary, iter_results_file
+from serp_result import SerpResult
+
+
+def results_for(keyword, count=3):
+    return [SerpResult(keyword, position, f"Título {position}", f"https://site{position}.com/",
+                       f"site{position}.com", 'snippet') for position in range(1, count + 1)]
+
+
+def test_sink_streams_csv_jsonl_and_json(tmp_path):
+    base_path = str(tmp_path / 'serp_results')
+    with ResultSink(base_path, formats=('csv', 'jsonl', 'json')) as sink:
+        sink.write(results_for('uno'))
+        sink.write([])
+        sink.write([r.to_dict() for r in results_for('dos', 2)])
+
+    with open(sink.paths['csv'], newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['keyword'] for row in rows] == ['uno'] * 3 + ['dos'] * 2
+
+    with open(sink.paths['json'], encoding='utf-8') as f:
+        assert len(json.load(f)) == 5
+    assert [r['position'] for r in iter_results_file(sink.results_file)] == [1, 2, 3, 1, 2]
+    assert sink.results_file == sink.paths['jsonl']
+
+
+def test_sink_summary_matches_batch_summary(tmp_path):
+    results = results_for('uno', 12) + results_for('dos', 2)
+    with ResultSink(str(tmp_path / 'serp_results')) as sink:
+        sink.write(results[:5])
+        sink.write(results[5:])
+
+    summary = SessionSummary()
+    summary.update(results)
+    assert sink.summary.as_dict() == summary.as_dict()
+    assert summary.as_dict()['top_10_count'] == 12 and summary.as_dict()['top_3_count'] == 5
+
+
+def test_sink_without_results_creates_no_files(tmp_path):
+    with ResultSink(str(tmp_path / 'serp_results')) as sink:
+        sink.write([])
+    assert sink.results_file is None
+    assert list(tmp_path.iterdir()) == []
+
+
+
+def test_batch_streams_into_the_sink_instead_of_returning_results(stub, make_scraper, tmp_path):
+    server = stub(target_position=0)
+    scraper = make_scraper(server.endpoint)
+    with ResultSink(str(tmp_path / 'serp_results'), formats=('jsonl',)) as sink:
+        returned = scraper.batch_position_check(['uno', 'dos'], 'target.com', 2, concurrency=2, sink=sink)
+
+    assert returned == []
+    assert sink.summary.total_results == 40
+    assert sum(1 for _ in iter_results_file(sink.results_file)) == 40
@@ -0,0 +1,134 @@
+import json
+
+import pytest
+
+from results_store import ResultsStore
+from serp_result import SerpResult
+
+
+def results_for(keyword, domains):
+    return [{'keyword': keyword, 'position': position, 'title': f"{keyword} {position}",
+             'url': f"https://{domain}/{position}", 'domain': domain, 'snippet': ''}
+            for position, domain in enumerate(domains, 1)]
+
+
+def session(session_id, timestamp, project_id=None, **session_info):
+    return {'session_id': session_id, 'timestamp': timestamp, 'project_id': project_id,
+            'session_info': session_info, 'total_keywords': 1, 'total_results': 2,
+            'domains_found': ['a.com', 'b.com'], 'average_position': 1.5, 'top_10_count': 2, 'top_3_count': 2}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultsStore(str(tmp_path / 'sessions.sqlite'))
+
+
+def test_save_and_reload_session_with_results(store):
+    inserted = store.save_session(session('s1', '2026-01-01T10:00:00', target_domain='a.com'),
+                                  results_for('zapatos', ['a.com', 'b.com']))
+    assert inserted == 2
+
+    loaded = store.get_session('s1')
+    assert loaded['session_info'] == {'target_domain': 'a.com'}
+    assert loaded['domains_found'] == ['a.com', 'b.com']
+    assert [r['domain'] for r in store.iter_results('s1')] == ['a.com', 'b.com']
+    assert store.get_session('no-existe') is None
+
+
+def test_results_can_be_a_generator_of_serp_results(store):
+    results = (SerpResult.from_dict(r) for r in results_for('zapatos', ['a.com']))
+    assert store.save_session(session('s1', '2026-01-01T10:00:00'), results) == 1
+
+
+def test_filename_falls_back_to_session_info(store):
+    store.save_session(session('s1', '2026-01-01T10:00:00', filename='serp_results_1'))
+    store.save_session(dict(session('s2', '2026-01-02T10:00:00', filename='ignorado'), filename='session_s2.json'))
+    filenames = {row['session_id']: row['filename'] for row in store.list_sessions()}
+    assert filenames == {'s1': 'serp_results_1', 's2': 'session_s2.json'}
+
+
+def test_list_sessions_can_exclude_project_sessions(store):
+    store.save_session(session('general', '2026-01-01T10:00:00'))
+    store.save_session(session('proyecto', '2026-01-02T10:00:00', project_id='p1'))
+    assert [row['session_id'] for row in store.list_sessions()] == ['proyecto', 'general']
+    assert [row['session_id'] for row in store.list_sessions(general_only=True)] == ['general']
+
+
+def test_delete_sessions_before_removes_sessions_and_results(store):
+    store.save_session(session('vieja', '2025-01-01T10:00:00'), results_for('a', ['a.com']))
+    store.save_session(session('vieja_proyecto', '2025-01-01T10:00:00', project_id='p1'))
+    store.save_session(session('nueva', '2026-01-01T10:00:00'), results_for('a', ['a.com']))
+
+    assert store.delete_sessions_before('2025-06-01', general_only=True) == ['vieja']
+    assert list(store.iter_results('vieja')) == []
+    assert store.has_session('vieja_proyecto') and store.has_session('nueva')
+
+
+def test_keyword_history_and_rebuilt_summaries(store):
+    store.save_session(session('s1', '2026-01-01T10:00:00'), results_for('zapatos', ['b.com', 'a.com']))
+    store.save_session(session('s2', '2026-01-02T10:00:00'), results_for('zapatos', ['a.com']))
+
+    history = store.keyword_history('zapatos', 'a.com')
+    assert [(h['session_id'], h['position']) for h in history] == [('s1', 2), ('s2', 1)]
+
+    assert store.rebuild_summaries() == 2
+    rebuilt = {row['session_id']: row for row in store.list_sessions()}
+    assert rebuilt['s2']['total_results'] == 1 and rebuilt['s2']['domains_count'] == 1
+
+
+class TestReportManager:
+    @pytest.fixture
+    def manager(self, tmp_path):
+        from reports import ReportManager
+        return ReportManager(data_dir=str(tmp_path / 'data'), reports_dir=str(tmp_path / 'reports'))
+
+    def test_store_is_opened_on_first_use(self, manager, tmp_path):
+        assert not (tmp_path / 'reports' / 'sessions.sqlite').exists()
+        manager.get_all_sessions()
+        assert (tmp_path / 'reports' / 'sessions.sqlite').exists()
+
+    def test_get_all_sessions_lists_only_general_sessions(self, manager):
+        results = results_for('zapatos', ['a.com'])
+        general = manager.save_scraping_session(results, {'filename': 'serp_results_1', 'target_domain': 'a.com'})
+        manager.save_scraping_session(results, {'filename': 'serp_results_2'}, project_id='p1')
+
+        sessions = manager.get_all_sessions()
+        assert [(s['session_id'], s['filename'], s['target_domain']) for s in sessions] == [
+            (general, 'serp_results_1', 'a.com')]
+
+    def test_legacy_json_sessions_are_imported(self, tmp_path):
+        from reports import ReportManager
+
+        json_dir = tmp_path / 'reports' / 'json'
+        json_dir.mkdir(parents=True)
+        legacy = session('legado', '2025-05-01T10:00:00', target_domain='a.com')
+        legacy['results'] = results_for('zapatos', ['a.com'])
+        (json_dir / 'session_legado_20250501.json').write_text(json.dumps(legacy), encoding='utf-8')
+
+        manager = ReportManager(data_dir=str(tmp_path / 'data'), reports_dir=str(tmp_path / 'reports'))
+        sessions = manager.get_all_sessions()
+        assert [(s['session_id'], s['filename']) for s in sessions] == [('legado', 'session_legado_20250501.json')]
+        assert len(manager.load_session('legado')['results']) == 1
+
+        assert manager.delete_session('legado') == 2
+        assert manager.get_all_sessions() == []
+
+    def test_refresh_without_changes_skips_json_sync(self, manager, tmp_path, monkeypatch):
+        manager.get_all_sessions()
+        calls = []
+        sync = manager._sync_json_sessions
+        monkeypatch.setattr(manager, '_sync_json_sessions', lambda *args, **kwargs: calls.append(1) or sync(*args, **kwargs))
+
+        manager.get_all_sessions()
+        assert calls == []
+
+        json_dir = tmp_path / 'projects' / 'p1' / 'reports' / 'json'
+        json_dir.mkdir(parents=True)
+        legacy = session('legado', '2025-05-01T10:00:00')
+        (json_dir / 'session_legado_20250501.json').write_text(json.dumps(legacy), encoding='utf-8')
+        manager.get_all_sessions()
+        assert calls == [1]
+        assert manager.store.has_session('legado')
+
+        manager.get_all_sessions()
+        assert calls == [1]
@@ -0,0 +1,84 @@
+import pytest
+import requests
+
+import retry_policy
+from retry_policy import RetryableError, RetryPolicy, classify_exception, get_retry_policy, parse_retry_after
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+@pytest.mark.parametrize('error', [
+    requests.exceptions.SSLError('handshake'),
+    requests.exceptions.ProxyError('proxy'),
+    requests.exceptions.ConnectTimeout('connect'),
+    requests.exceptions.ReadTimeout('read'),
+    requests.exceptions.ConnectionError('reset'),
+    requests.exceptions.ChunkedEncodingError('chunked'),
+    ConnectionResetError('reset'),
+])
+def test_transient_network_errors_are_retryable(error):
+    assert isinstance(classify_exception(error), RetryableError)
+
+
+@pytest.mark.parametrize('error', [
+    requests.exceptions.InvalidURL('url'),
+    requests.exceptions.MissingSchema('schema'),
+    ValueError('otro'),
+])
+def test_permanent_errors_are_not_retryable(error):
+    assert classify_exception(error) is None
+
+
+def test_http_error_with_retryable_status_keeps_retry_after():
+    class Resp(dict):
+        status = 503
+
+    error = Exception('HttpError 503')
+    error.resp = Resp({'retry-after': '7'})
+    assert classify_exception(error).retry_after == 7
+
+
+def test_parse_retry_after_accepts_seconds_and_rejects_garbage():
+    assert parse_retry_after('12') == 12
+    assert parse_retry_after('') is None
+    assert parse_retry_after('mañana') is None
+
+
+def test_call_retries_retryable_status_then_returns_success():
+    policy = RetryPolicy(max_attempts=4, base_delay=0, jitter=False)
+    responses = iter([FakeResponse(503), FakeResponse(429, {'Retry-After': '0'}), FakeResponse(200)])
+    assert policy.call(lambda: next(responses)).status_code == 200
+    assert policy.get_stats()['retries'] == 2
+
+
+def test_call_respects_run_budget():
+    policy = RetryPolicy(max_attempts=10, base_delay=0, jitter=False, budget=2)
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise requests.exceptions.ReadTimeout('read')
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        policy.call(failing)
+    assert len(calls) == 3
+    assert policy.get_stats()['retry_budget_exhausted'] == 1
+
+    policy.reset()
+    assert policy.get_stats()['retries'] == 0
+
+
+def test_shared_policy_is_created_once_and_reconfigured(monkeypatch):
+    monkeypatch.setattr(retry_policy, '_shared_policy', None)
+    first = get_retry_policy({'RETRY_MAX_ATTEMPTS': 3})
+    first.next_delay(1)
+    second = get_retry_policy({'RETRY_MAX_ATTEMPTS': 7})
+
+    assert second is first
+    assert second.max_attempts == 7
+    assert second.get_stats()['retries'] == 1
+    assert get_retry_policy() is first
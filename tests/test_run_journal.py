@@ -0,0 +1,88 @@
+import json
+
+from run_journal import RunJournal
+
+
+def make_journal(tmp_path, run_id='run_test', batch_size=1):
+    return RunJournal(run_id, runs_dir=str(tmp_path), batch_size=batch_size)
+
+
+def result(keyword, position=1):
+    return {'keyword': keyword, 'position': position, 'title': '', 'url': '', 'domain': 'example.com'}
+
+
+def test_resume_reads_completed_keywords_and_metadata(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.start(['uno', 'dos', 'tres'], 'example.com', pages=2, project_id='p1',
+                  extra={'find_first': True, 'compact': True, 'sink': True})
+    journal.record_keyword('uno', [result('uno')])
+    journal.record_keyword('dos', [result('dos', 3)])
+    journal.close()
+
+    resumed = make_journal(tmp_path)
+    metadata = resumed.read_metadata()
+    assert metadata['keywords'] == ['uno', 'dos', 'tres']
+    assert metadata['project_id'] == 'p1'
+    assert metadata['find_first'] is True and metadata['compact'] is True and metadata['sink'] is True
+    assert resumed.completed_keywords() == {'uno', 'dos'}
+    assert [r['position'] for r in resumed.load_results()] == [1, 3]
+    assert not resumed.is_finished()
+
+    resumed.finish()
+    assert make_journal(tmp_path).is_finished()
+
+
+def test_start_does_not_overwrite_existing_metadata(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.start(['uno'], 'example.com')
+    journal.close()
+
+    resumed = make_journal(tmp_path)
+    resumed.start(['otra'], 'otro.com')
+    assert resumed.read_metadata()['keywords'] == ['uno']
+
+
+def test_completed_keywords_is_cached_and_returns_a_copy(tmp_path):
+    journal = make_journal(tmp_path, batch_size=100)
+    journal.start(['uno', 'dos'])
+    journal.record_keyword('uno', [])
+
+    # Sin vaciar el lote a disco: el estado en memoria ya incluye la keyword
+    completed = journal.completed_keywords()
+    assert completed == {'uno'}
+    completed.add('dos')
+    assert journal.completed_keywords() == {'uno'}
+
+
+def test_torn_tail_is_truncated_before_appending(tmp_path):
+    journal = make_journal(tmp_path)
+    journal.start(['uno', 'dos', 'tres'])
+    journal.record_keyword('uno', [result('uno')])
+    journal.close()
+
+    # Cierre inesperado a mitad de una línea
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "keyword", "keyword": "dos", "resu')
+
+    resumed = make_journal(tmp_path)
+    assert resumed.completed_keywords() == {'uno'}
+    resumed.record_keyword('dos', [result('dos')])
+    resumed.record_keyword('tres', [result('tres')])
+    resumed.close()
+
+    with open(journal.path, 'r', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert [r.get('keyword') for r in records if r['type'] == 'keyword'] == ['uno', 'dos', 'tres']
+    assert make_journal(tmp_path).completed_keywords() == {'uno', 'dos', 'tres'}
+
+
+def test_latest_unfinished_skips_finished_runs(tmp_path):
+    finished = make_journal(tmp_path, 'run_a')
+    finished.start(['uno'])
+    finished.finish()
+    pending = make_journal(tmp_path, 'run_b')
+    pending.start(['uno'])
+    pending.close()
+
+    latest = RunJournal.latest_unfinished(runs_dir=str(tmp_path))
+    assert latest is not None and latest.run_id == 'run_b'
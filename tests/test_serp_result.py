@@ -0,0 +1,47 @@
+import json
+from collections.abc import Mapping
+
+import pytest
+
+from serp_result import SERP_RESULT_FIELDS, SerpResult, json_default
+
+
+def make_result(position=12):
+    return SerpResult('zapatos', position, 'Título', 'https://a.com/', 'a.com', 'snippet')
+
+
+def test_serp_result_is_a_read_only_mapping():
+    result = make_result()
+    assert isinstance(result, Mapping)
+    assert result['page'] == 2 and result.get('domain') == 'a.com'
+    assert list(result) == list(SERP_RESULT_FIELDS) and len(result) == 7
+    assert dict(result) == result.to_dict()
+    with pytest.raises(KeyError):
+        result['otra']
+    with pytest.raises(TypeError):
+        result['position'] = 1
+
+
+def test_serp_result_uses_slots():
+    result = make_result()
+    assert not hasattr(result, '__dict__')
+    with pytest.raises(AttributeError):
+        result.extra = 1
+
+
+def test_page_is_derived_from_position():
+    assert [make_result(position).page for position in (1, 10, 11, 100)] == [1, 1, 2, 10]
+    assert make_result(None).page is None
+
+
+def test_json_round_trip():
+    results = [make_result(1), make_result(2)]
+    payload = json.dumps(results, default=json_default)
+    loaded = [SerpResult.from_dict(data) for data in json.loads(payload)]
+    assert [r.to_dict() for r in loaded] == [r.to_dict() for r in results]
+
+
+def test_copy_returns_a_modifiable_dict():
+    copy = make_result().copy()
+    copy['position'] = 3
+    assert isinstance(copy, dict) and copy['position'] == 3
@@ -0,0 +1,193 @@
+import pytest
+
+from stealth_scraper import CUSTOM_SEARCH_FIELDS, StealthSerpScraper, public_config
+
+TARGET = 'target.com'
+
+
+def test_concurrent_mode_returns_the_same_results_as_sequential(stub, make_scraper):
+    server = stub(target_position=4)
+    keywords = ['uno', 'dos', 'tres', 'cuatro', 'cinco']
+
+    sequential = make_scraper(server.endpoint).batch_position_check(keywords, TARGET, 2, concurrency=1)
+    concurrent = make_scraper(server.endpoint).batch_position_check(keywords, TARGET, 2, concurrency=3)
+
+    assert len(sequential) == 100
+    assert concurrent == sequential
+    assert server.counters['requests'] == 20
+
+
+@pytest.mark.parametrize('concurrency', [1, 3])
+def test_equivalent_spellings_are_queried_once(stub, make_scraper, concurrency):
+    server = stub(target_position=0)
+    scraper = make_scraper(server.endpoint)
+    results = scraper.batch_position_check(['Zapatos', 'zapatos ', 'camión'], TARGET, 1,
+                                           concurrency=concurrency, normalize=True)
+
+    assert server.counters['requests'] == 2
+    assert [r['keyword'] for r in results[::10]] == ['Zapatos', 'zapatos ', 'camión']
+    assert [r['url'] for r in results[:10]] == [r['url'] for r in results[10:20]]
+
+
+def test_batch_resumes_from_journal(stub, make_scraper, tmp_path):
+    from run_journal import RunJournal
+
+    server = stub(target_position=0)
+    scraper = make_scraper(server.endpoint)
+    journal = RunJournal('run_test', runs_dir=str(tmp_path / 'runs'))
+    journal.start(['uno', 'dos', 'tres'], TARGET, 1)
+    journal.record_keyword('uno', [{'keyword': 'uno', 'position': 1, 'title': '', 'url': 'https://a.com/',
+                                    'domain': 'a.com', 'snippet': ''}])
+    journal.flush()
+
+    results = scraper.batch_position_check(['uno', 'dos', 'tres'], TARGET, 1, journal=journal, concurrency=1)
+    assert server.counters['requests'] == 2
+    assert len(results) == 21
+    assert RunJournal('run_test', runs_dir=str(tmp_path / 'runs')).is_finished()
+
+
+@pytest.mark.parametrize('concurrency', [1, 2])
+def test_failed_keywords_stay_pending_in_the_journal(stub, make_scraper, tmp_path, monkeypatch, concurrency):
+    from run_journal import RunJournal
+
+    runs_dir = str(tmp_path / 'runs')
+    failing = stub(target_position=0, rate_limit_every=1)  # 429 en todas las peticiones
+    scraper = make_scraper(failing.endpoint, RETRY_MAX_ATTEMPTS=2)
+    monkeypatch.setattr(scraper.rate_limiter, 'penalize', lambda *args, **kwargs: None)
+    journal = RunJournal('run_test', runs_dir=runs_dir)
+
+    assert scraper.batch_position_check(['uno', 'dos'], TARGET, 2, journal=journal, concurrency=concurrency) == []
+    assert failing.counters['rate_limited'] >= 4
+    resumed = RunJournal.latest_unfinished(runs_dir=runs_dir)
+    assert resumed is not None and resumed.run_id == 'run_test'
+    assert resumed.completed_keywords() == set()
+
+    healthy = stub(target_position=0)
+    results = make_scraper(healthy.endpoint).batch_position_check(['uno', 'dos'], TARGET, 2, journal=resumed,
+                                                                  concurrency=concurrency)
+    assert len(results) == 40
+    assert RunJournal('run_test', runs_dir=runs_dir).is_finished()
+
+
+@pytest.mark.parametrize('data, expected', [
+    (None, True),
+    ({}, True),
+    ({'items': [{'link': 'https://a.com'}]}, True),
+    ({'items': [{'link': 'https://a.com'}], 'queries': {'nextPage': [{'startIndex': 11}]}}, False),
+    ({'items': [], 'queries': {'nextPage': [{'startIndex': 11}]}}, True),
+])
+def test_is_last_page_needs_items_and_next_page(data, expected):
+    assert StealthSerpScraper._is_last_page(data) is expected
+
+
+def test_short_pages_with_next_page_keep_paging(stub, make_scraper):
+    server = stub(max_results=25, target_position=0)
+    scraper = make_scraper(server.endpoint, MAX_PAGE_CONCURRENCY=1)
+    results = scraper.serp_scraper_api('zapatos', TARGET, pages=5)
+    assert len(results) == 25
+    assert server.counters['requests'] == 3
+
+
+def test_parallel_pages_keep_position_order(stub, make_scraper):
+    server = stub(target_position=0)
+    scraper = make_scraper(server.endpoint, MAX_PAGE_CONCURRENCY=4)
+    results = scraper.serp_scraper_api('zapatos', TARGET, pages=5)
+    assert server.counters['requests'] == 5
+    assert [r['url'].rsplit('/', 1)[1] for r in results] == [str(n) for n in range(1, 51)]
+
+
+def test_find_first_fetches_first_page_alone(stub, make_scraper):
+    server = stub(target_position=3)
+    scraper = make_scraper(server.endpoint, MAX_PAGE_CONCURRENCY=4)
+    results = scraper.serp_scraper_api('zapatos', TARGET, pages=10, find_first=True)
+
+    assert server.counters['requests'] == 1
+    assert scraper.stats['find_first_pages_saved'] == 9
+    assert len(results) == 10
+    assert any(r['domain'] == TARGET for r in results)
+
+
+@pytest.mark.parametrize('concurrency', [1, 4])
+def test_find_first_counts_only_unsent_pages_as_saved(stub, make_scraper, concurrency):
+    server = stub(target_position=25)
+    scraper = make_scraper(server.endpoint, MAX_PAGE_CONCURRENCY=concurrency)
+    scraper.serp_scraper_api('zapatos', TARGET, pages=10, find_first=True)
+
+    requests = server.counters['requests']
+    assert requests >= 3
+    assert requests + scraper.stats['find_first_pages_saved'] == 10
+    if concurrency == 1:
+        assert requests == 3
+
+
+def test_responses_are_cached_under_the_serving_engine(stub, make_scraper, tmp_path):
+    from response_cache import ResponseCache
+
+    server = stub(target_position=0)
+    scraper = make_scraper(server.endpoint, GOOGLE_API_CREDENTIALS=[{'api_key': 'key-b', 'search_engine_id': 'cx-b'}])
+    scraper.serp_cache = ResponseCache('serp_test', cache_dir=str(tmp_path))
+
+    for _ in range(2):  # key principal y después key-b
+        scraper.serp_scraper_api('zapatos', TARGET, pages=1, force_refresh=True)
+    assert server.counters['requests'] == 2
+    for cx in ('test-cx', 'cx-b'):
+        key = ResponseCache.make_key(cx, 'zapatos', 'us', 'en', 1, 10, CUSTOM_SEARCH_FIELDS)
+        assert scraper.serp_cache.get(key) is not None
+
+
+def test_quota_errors_fail_over_to_next_key_and_then_stop(stub, make_scraper):
+    server = stub(target_position=0, quota_after=2)
+    scraper = make_scraper(server.endpoint, GOOGLE_API_CREDENTIALS=[{'api_key': 'key-b', 'search_engine_id': 'cx-b'}])
+
+    assert len(scraper.serp_scraper_api('uno', TARGET, pages=2)) == 20
+    assert scraper.serp_scraper_api('dos', TARGET, pages=1) == []
+    assert scraper.quota_exhausted
+    assert [status['available'] for status in scraper.credential_pool.status()] == [False, False]
+    # Un 403 por key: después ya no se envían más peticiones
+    assert server.counters['quota_exceeded'] == 2
+
+
+def test_public_config_drops_keys_and_credentials():
+    config = {'GOOGLE_API_KEY': 'secreta', 'GOOGLE_API_CREDENTIALS': [{'api_key': 'otra'}],
+              'GOOGLE_SEARCH_ENGINE_ID': 'cx', 'CLIENT_SECRET': 'x', 'PAGES_TO_SCRAPE': 3,
+              'KEYWORD_FOLD_ACCENTS': False}
+    assert public_config(config) == {'GOOGLE_SEARCH_ENGINE_ID': 'cx', 'PAGES_TO_SCRAPE': 3,
+                                     'KEYWORD_FOLD_ACCENTS': False}
+
+
+def test_lean_responses_request_only_the_used_fields(stub, make_scraper):
+    server = stub(target_position=4)
+    lean = make_scraper(server.endpoint, LEAN_RESPONSES=True)
+    full = make_scraper(server.endpoint, LEAN_RESPONSES=False)
+
+    lean_results = lean.serp_scraper_api('zapatos', TARGET, pages=2)
+    assert lean_results == full.serp_scraper_api('zapatos', TARGET, pages=2)
+
+    lean_stats, full_stats = lean.get_session_stats(), full.get_session_stats()
+    assert lean_stats['response_bytes_decoded'] < full_stats['response_bytes_decoded'] / 2
+    # gzip: se transfieren menos bytes de los que se parsean
+    assert lean_stats['response_bytes'] < lean_stats['response_bytes_decoded']
+
+
+def test_find_first_ignores_domains_that_only_contain_the_target(stub, make_scraper):
+    server = stub(target_position=2, target_domain='nottarget.com')
+    scraper = make_scraper(server.endpoint, MAX_PAGE_CONCURRENCY=1)
+    scraper.serp_scraper_api('zapatos', TARGET, pages=3, find_first=True)
+    assert server.counters['requests'] == 3
+    assert scraper.stats['find_first_pages_saved'] == 0
+
+
+def test_cached_pages_are_served_without_a_credential(stub, make_scraper, tmp_path):
+    from response_cache import ResponseCache
+
+    server = stub(target_position=0)
+    scraper = make_scraper(server.endpoint, GOOGLE_API_CREDENTIALS=[{'api_key': 'key-b', 'search_engine_id': 'cx-b'}])
+    scraper.serp_cache = ResponseCache('serp_test', cache_dir=str(tmp_path))
+    first = scraper.serp_scraper_api('zapatos', TARGET, pages=2)
+
+    for credential in scraper.credential_pool.credentials:
+        scraper.credential_pool.mark_exhausted(credential)
+    assert scraper.serp_scraper_api('zapatos', TARGET, pages=2) == first
+    assert server.counters['requests'] == 2
+    assert scraper.stats['cache_hits'] == 2
+    assert not scraper.quota_exhausted
@@ -0,0 +1,130 @@
+import json
+
+import pytest
+import requests
+
+from rate_limiter import QuotaLedger, RateLimiter
+from retry_policy import RetryPolicy
+from suggest_engine import FailedSuggestions, SuggestEngine, parse_suggest_response
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, text='', headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+
+class FakeSession:
+    """Sesión HTTP simulada: devuelve las respuestas en orden y anota las consultas"""
+
+    def __init__(self, responses, answers=None):
+        self.responses = list(responses)
+        self.answers = answers or {}
+        self.queries = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.queries.append(params['q'])
+        if self.responses:
+            response = self.responses.pop(0)
+        else:
+            response = FakeResponse(text=json.dumps([params['q'], self.answers.get(params['q'], [])]))
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def make_engine(tmp_path):
+    def make(responses, answers=None, max_workers=1, **options):
+        limiter = RateLimiter(QuotaLedger(str(tmp_path / 'quota_ledger.json')))
+        limiter.configure({'SUGGEST_PER_MINUTE': 10 ** 6})
+        session = FakeSession(responses, answers)
+        engine = SuggestEngine(session, limiter, RetryPolicy(base_delay=0, jitter=False), max_workers=max_workers,
+                               **options)
+        return engine, session
+    return make
+
+
+def test_parse_suggest_response_handles_json_and_jsonp():
+    assert parse_suggest_response('["q", ["uno", " dos ", 3]]') == ['uno', 'dos']
+    assert parse_suggest_response('(["q", ["uno"]])') == ['uno']
+    assert parse_suggest_response('no es json') is None
+
+
+def test_fetch_retries_transient_errors(make_engine):
+    engine, session = make_engine([requests.exceptions.SSLError('tls'), FakeResponse(503),
+                                   FakeResponse(text='["q", ["uno"]]')])
+    assert engine.fetch('zapatos') == ['uno']
+    assert engine.get_stats()['suggest_requests'] == 3
+
+
+def test_suggest_merges_variations_in_order_without_duplicates(make_engine):
+    engine, session = make_engine([], answers={
+        'zapatos': ['zapatos rojos', 'Zapatos Rojos', 'zapatos', 'zapatosx'],
+        'zapatos o': ['zapatos o botas', 'zapatos rojos'],
+        'zapatos y': ['zapatos y bolsos'],
+    }, max_workers=4)
+
+    suggestions = engine.suggest('zapatos', connectors=['o', 'y'], max_suggestions=None)
+    assert suggestions == ['zapatos rojos', 'zapatos o botas', 'zapatos y bolsos']
+    assert sorted(session.queries) == ['zapatos', 'zapatos o', 'zapatos y']
+
+
+def test_suggest_limits_the_number_of_suggestions(make_engine):
+    engine, _ = make_engine([], answers={'zapatos': [f"zapatos {n:02d}" for n in range(30)]})
+    assert len(engine.suggest('zapatos', connectors=[], max_suggestions=25)) == 25
+
+
+def test_request_budget_is_checked_before_every_attempt(make_engine):
+    engine, session = make_engine([FakeResponse(503), FakeResponse(text='["q", ["uno"]]')])
+    granted = []
+
+    def budget():
+        if len(granted) >= 1:
+            return False
+        granted.append(1)
+        return True
+
+    assert engine.fetch('zapatos', request_budget=budget) is None
+    assert len(session.queries) == 1
+
+
+def test_fetch_many_marks_denied_queries_as_none(make_engine):
+    engine, session = make_engine([FakeResponse(text='["q", ["uno"]]')])
+    remaining = {'count': 1}
+
+    def budget():
+        remaining['count'] -= 1
+        return remaining['count'] >= 0
+
+    assert engine.fetch_many(['a', 'b'], request_budget=budget) == [['uno'], None]
+
+def test_failed_response_is_not_cached(make_engine, tmp_path):
+    from response_cache import ResponseCache
+
+    cache = ResponseCache('suggest_test', cache_dir=str(tmp_path))
+    engine, session = make_engine([FakeResponse(text='roto'), FakeResponse(text='["q", ["uno"]]')], cache=cache)
+    assert engine.fetch('zapatos') == []
+    assert engine.fetch('zapatos') == ['uno']
+    assert engine.fetch('zapatos') == ['uno']
+    assert len(session.queries) == 2
+    assert engine.get_stats()['suggest_cache_hits'] == 1
+
+
+def test_cache_is_keyed_by_locale(make_engine, tmp_path):
+    from response_cache import ResponseCache
+
+    cache = ResponseCache('suggest_test', cache_dir=str(tmp_path))
+    engine, session = make_engine([], answers={'zapatos': ['zapatos rojos']}, cache=cache)
+    engine.fetch('zapatos', 'US', 'en')
+    engine.fetch('zapatos', 'ES', 'es')
+    engine.fetch('zapatos', 'US', 'en')
+    assert len(session.queries) == 2
+
+
+def test_failures_are_marked_but_still_behave_as_empty_lists(make_engine):
+    engine, _ = make_engine([FakeResponse(404), FakeResponse(text='["q", ["uno"]]')])
+    failed, ok = engine.fetch_many(['a', 'b'])
+    assert isinstance(failed, FailedSuggestions) and failed == []
+    assert ok == ['uno'] and not isinstance(ok, FailedSuggestions)
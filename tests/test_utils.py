@@ -0,0 +1,34 @@
+import pytest
+
+from utils import KeywordManager, domain_matches, normalize_keyword
+
+
+def test_normalize_keyword_collapses_case_spaces_and_unicode():
+    assert normalize_keyword('  Zapatos   ROJOS ') == 'zapatos rojos'
+    assert normalize_keyword('ｚａｐａｔｏｓ') == 'zapatos'
+    assert normalize_keyword('Camión') == 'camión'
+    assert normalize_keyword('Camión', fold_accents=True) == 'camion'
+
+
+def test_group_equivalent_keywords_keeps_every_spelling():
+    groups = KeywordManager.group_equivalent_keywords(['Zapatos', 'zapatos ', 'camión', 'camion'])
+    assert groups == {'Zapatos': ['Zapatos', 'zapatos '], 'camión': ['camión'], 'camion': ['camion']}
+
+
+def test_group_equivalent_keywords_can_fold_accents():
+    groups = KeywordManager.group_equivalent_keywords(['camión', 'Camion'], fold_accents=True)
+    assert groups == {'camión': ['camión', 'Camion']}
+
+
+@pytest.mark.parametrize('result_domain, target, expected', [
+    ('example.com', 'example.com', True),
+    ('www.example.com', 'example.com', True),
+    ('blog.example.com', 'www.example.com', True),
+    ('EXAMPLE.com:443', 'Example.com', True),
+    ('notexample.com', 'example.com', False),
+    ('example.com.evil.net', 'example.com', False),
+    ('example.com', '', False),
+    (None, 'example.com', False),
+])
+def test_domain_matches_exact_domain_or_subdomain(result_domain, target, expected):
+    assert domain_matches(result_domain, target) is expected
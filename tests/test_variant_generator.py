@@ -0,0 +1,61 @@
+from variant_generator import MAX_WORDS, VariantGenerator
+
+
+def make_generator(**options):
+    options.setdefault('prefix_words', [])
+    options.setdefault('suffix_words', [])
+    return VariantGenerator(**options)
+
+
+def test_keyword_itself_comes_first_and_templates_keep_their_order():
+    variants = make_generator(categories=['base']).generate(['seguro'])
+    assert variants[:4] == ['seguro', 'seguro 2025', 'mejor seguro', 'seguro paso a paso']
+
+
+def test_template_conditions_depend_on_the_base_keyword():
+    generator = make_generator(categories=['local'])
+    assert 'seguro madrid' in generator.generate(['seguro'])
+    # SINGLE: una palabra de menos de 10 caracteres
+    assert generator.generate(['aseguradoras']) == ['aseguradoras', 'aseguradoras cerca de mi']
+    # SHORT: hasta 2 palabras
+    assert generator.generate(['seguro de hogar']) == ['seguro de hogar']
+
+
+def test_variants_never_exceed_the_word_limit():
+    variants = VariantGenerator().generate(['seguro de coche', 'seguro', 'seguro hogar'])
+    assert all(len(variant.split()) <= MAX_WORDS for variant in variants)
+
+
+def test_limit_per_keyword_includes_the_keyword():
+    generator = VariantGenerator(max_variants_per_keyword=5)
+    assert [len(generator.generate([keyword])) for keyword in ('seguro', 'coche')] == [5, 5]
+
+
+def test_duplicates_are_removed_case_insensitively_across_keywords():
+    generator = make_generator(categories=['base'], prefix_words=['Mejor'], suffix_words=['online'])
+    variants = generator.generate(['Seguro', 'seguro', 'coche'])
+    assert len(variants) == len({variant.lower() for variant in variants})
+    assert variants.count('Seguro') == 1 and 'seguro' not in variants
+    assert sum(variant.lower() == 'mejor seguro' for variant in variants) == 1
+
+
+def test_chunked_generation_matches_a_single_block():
+    keywords = [f"keyword {n}" for n in range(25)] + ['seguro', 'Keyword 3']
+    assert VariantGenerator(chunk_size=4).generate(keywords) == VariantGenerator().generate(keywords)
+
+
+def test_generation_covers_the_old_per_keyword_variants():
+    old_short = ['2025', 'mejor', 'paso a paso', 'como', 'donde', 'precio', 'online', 'gratuito', 'comprar',
+                 'barato', 'profesional', 'en españa', 'madrid', 'barcelona', 'cursillo', 'curso', 'temario',
+                 'certificación']
+    variants = {variant.lower() for variant in VariantGenerator(max_variants_per_keyword=1000).generate(['seguro'])}
+    for word in old_short:
+        assert f"seguro {word}" in variants or f"{word} seguro" in variants
+
+
+def test_write_streams_variants_to_disk(tmp_path):
+    path = tmp_path / 'salida' / 'variantes.txt'
+    generator = VariantGenerator(chunk_size=2)
+    total = generator.write(['seguro', 'coche', 'moto'], str(path))
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert total == len(lines) == len(generator.generate(['seguro', 'coche', 'moto']))